@@ -2,8 +2,10 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from . import errors
+from .models.address_index import AddressIndex, AddressTarget
 from .models.bit_field import BitField
 from .models.block import Block
+from .models.connectivity_graph import ConnectivityGraph
 from .models.core import Core
 from .models.dfx_core import DFXCore
 from .models.hierarchy import Hierarchy
@@ -11,15 +13,17 @@ from .models.interrupt_signal import InterruptSignal
 from .models.ip_core import IPCore
 from .models.manager_port import ManagerPort
 from .models.metadata_extension import MetadataExtension
-from .models.metadata_object import MetadataObject
+from .models.metadata_object import MetadataObject, current_generation
 from .models.microblaze_core import MicroblazeCore
 from .models.module import Module
 from .models.parameter import Parameter
+from .models.pass_stats import PassStats
 from .models.port import Port
 from .models.proc_sys_core import ProcSysCore
 from .models.register import Register
 from .models.scalar_port import ScalarPort
 from .models.signal import Signal
+from .models.signal_store import SignalStore
 from .models.stream_port import StreamPort
 from .models.subordinate_port import SubordinatePort
 from .models.ultrascale_proc_sys_core import UltrascaleProcSysCore
@@ -0,0 +1,6 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from .design_generator import DesignSpec, SyntheticDesign, generate_design
+from .memory import MEMORY_STAGES, memory_footprint
+from .suite import STAGES, compare_results, load_results, run_benchmarks
@@ -0,0 +1,71 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import argparse
+import sys
+
+from .design_generator import DesignSpec
+from .suite import STAGES, compare_results, load_results, run_benchmarks
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pynqmetadata.benchmarks",
+        description="Times parsing, refresh, merge, JSON and the runtime views on synthetic designs",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[8, 32, 128],
+        help="number of IP cores in each generated design",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--stages", nargs="+", choices=list(STAGES), default=None
+    )
+    parser.add_argument("--bdcs", type=int, default=2, help="BDCs in each design")
+    parser.add_argument("--output", default=None, help="write the results as JSON")
+    parser.add_argument(
+        "--baseline", default=None, help="results to check for regressions against"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument(
+        "--memory", action="store_true", help="also measure the memory held by models"
+    )
+    args = parser.parse_args()
+
+    def _progress(r):
+        if "retained" in r:
+            print(
+                f"{r['size']:>6} memory:{r['stage']:<21} {r['retained'] / 1e6:>10.2f} MB"
+                f" (peak {r['peak'] / 1e6:.2f} MB)"
+            )
+        else:
+            print(f"{r['size']:>6} {r['stage']:<28} {r['best'] * 1000:>10.2f} ms")
+
+    results = run_benchmarks(
+        sizes=args.sizes,
+        repeat=args.repeat,
+        stages=args.stages,
+        spec=DesignSpec(n_bdcs=args.bdcs),
+        output=args.output,
+        progress=_progress,
+        memory=args.memory,
+    )
+
+    if args.baseline is not None:
+        regressions = compare_results(
+            load_results(args.baseline), results, tolerance=args.tolerance
+        )
+        for r in regressions:
+            print(
+                f"REGRESSION {r['size']} {r['stage']} {r['metric']}: {r['baseline']:.6g} -> {r['current']:.6g}"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
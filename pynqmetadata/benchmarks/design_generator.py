@@ -0,0 +1,631 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..frontends.hwh_frontend import HwhFrontend
+from ..frontends.json_frontend import JsonFrontend
+from ..models.module import Module
+
+# (logical name, driven by the manager, LEFT) for an AXI4-Lite interface
+_AXI_LITE = (
+    ("AWADDR", True, 31),
+    ("AWVALID", True, None),
+    ("AWREADY", False, None),
+    ("WDATA", True, 31),
+    ("WSTRB", True, 3),
+    ("WVALID", True, None),
+    ("WREADY", False, None),
+    ("BRESP", False, 1),
+    ("BVALID", False, None),
+    ("BREADY", True, None),
+    ("ARADDR", True, 31),
+    ("ARVALID", True, None),
+    ("ARREADY", False, None),
+    ("RDATA", False, 31),
+    ("RRESP", False, 1),
+    ("RVALID", False, None),
+    ("RREADY", True, None),
+)
+
+_AXIMM_VLNV = "xilinx.com:interface:aximm:1.0"
+
+# The naming of the processing system ports and parameters for each PS type
+_PS_FLAVOURS = {
+    "zynq_ultra_ps_e": {
+        "vlnv": "xilinx.com:ip:zynq_ultra_ps_e:3.4",
+        "manager": "M_AXI_HPM0_FPD",
+        "clk": "pl_clk0",
+        "resetn": "pl_resetn0",
+        "irq": "pl_ps_irq0",
+        "irq_width": 8,
+        "gpio": "emio_gpio_o",
+        "baseaddr": 0xA0000000,
+        "clk_enable": "PSU__FPGA_PL{i}_ENABLE",
+        "clk_divisor": "PSU__CRL_APB__PL{i}_REF_CTRL__DIVISOR{j}",
+        "clk_select": "PSU__CRL_APB__PL{i}_REF_CTRL__SRCSEL",
+        "arch": "zynquplus",
+    },
+    "processing_system7": {
+        "vlnv": "xilinx.com:ip:processing_system7:5.5",
+        "manager": "M_AXI_GP0",
+        "clk": "FCLK_CLK0",
+        "resetn": "FCLK_RESET0_N",
+        "irq": "IRQ_F2P",
+        "irq_width": 16,
+        "gpio": "GPIO_O",
+        "baseaddr": 0x40000000,
+        "clk_enable": "PCW_FPGA_FCLK{i}_ENABLE",
+        "clk_divisor": "PCW_FCLK{i}_PERIPHERAL_DIVISOR{j}",
+        "clk_select": "PCW_FCLK{i}_PERIPHERAL_CLKSRC",
+        "arch": "zynq",
+    },
+}
+
+
+@dataclass
+class DesignSpec:
+    """
+    Describes the shape of a synthetic design
+        * name : name of the design (the HWH SYSTEMINFO NAME)
+        * ps : the processing system, zynq_ultra_ps_e or processing_system7
+        * n_cores : number of register mapped IP cores, each with an interrupt
+        * fanout : manager ports per AXI interconnect, larger designs use a tree
+        * n_registers, n_bitfields : size of the register map of every IP core
+        * concat_width : inputs per xlconcat in the interrupt concat tree
+        * n_gpio : number of xlslices on the PS GPIO, each driving an external port
+        * n_memories : number of memory mapped BRAM controllers
+        * hierarchy_size : IP cores per hierarchy, 0 keeps the design flat
+        * n_bdcs : number of block design containers, each with its own HWH
+        * bdc_cores : number of IP cores inside each BDC
+        * bdc_depth : how deeply BDCs nest, 1 means BDCs contain no BDCs
+    """
+
+    name: str = "synth"
+    ps: str = "zynq_ultra_ps_e"
+    n_cores: int = 8
+    fanout: int = 16
+    n_registers: int = 4
+    n_bitfields: int = 2
+    concat_width: int = 8
+    n_gpio: int = 2
+    n_memories: int = 1
+    hierarchy_size: int = 4
+    n_bdcs: int = 0
+    bdc_cores: int = 1
+    bdc_depth: int = 1
+
+    def dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class SyntheticDesign:
+    """
+    A generated design
+        * hwh : the HWH of the top level design
+        * bdc_hwhs : the HWH of every BDC, by BD name
+    """
+
+    spec: DesignSpec
+    hwh: str
+    bdc_hwhs: Dict[str, str] = field(default_factory=lambda: ({}))
+
+    def parse(self, merge_bdcs: bool = True, **kwargs) -> HwhFrontend:
+        """Parses the design, merging in the BDCs as the XSA frontend would"""
+        md = HwhFrontend(_hwhfile=self.hwh, **kwargs)
+        if merge_bdcs:
+            self.merge_bdcs(md)
+        return md
+
+    def merge_bdcs(self, md: Module) -> None:
+        """Merges the BDC designs into their BDC blocks of md, recursively"""
+        for b in md.blocks.values():
+            if isinstance(b, Module) and "bdc" in b.ext:
+                bdc_md = HwhFrontend(_hwhfile=self.bdc_hwhs[b.ext["bdc"].bd_name])
+                self.merge_bdcs(bdc_md)
+                mod_bdc_md = JsonFrontend(bdc_md.json().replace(bdc_md.name, b.name))
+                mod_bdc_md.hierarchy_name = b.hierarchy_name
+                b.merge(
+                    mod_bdc_md,
+                    skip_external=True,
+                    inherit_signal_width=True,
+                    inherit_addr_info=True,
+                    skip_identical=True,
+                )
+                b.refresh(full=False)
+
+    def json(self) -> str:
+        """Returns the JSON of the design with its BDCs merged in"""
+        return self.parse().json()
+
+
+class _Module:
+    """A MODULE of the generated HWH, built up as a netlist"""
+
+    def __init__(self, instance: str, vlnv: str, fullname: str, **attrs: str) -> None:
+        self.instance = instance
+        self.attrs = {"FULLNAME": f"/{fullname}", "INSTANCE": instance, **attrs}
+        if vlnv is not None:
+            self.attrs["VLNV"] = vlnv
+            self.attrs.setdefault("MODTYPE", vlnv.split(":")[2])
+        self.parameters: List[Tuple[str, str]] = []
+        self.ports: Dict[str, Dict] = {}
+        self.busifs: List[Tuple[str, str, str, List[Tuple[str, str]]]] = []
+        self.addrblocks: List[str] = []
+        self.memranges: List[str] = []
+
+    def port(
+        self, name: str, output: bool, left: Optional[int] = None, sigis: str = "undef"
+    ) -> None:
+        self.ports[name] = {"output": output, "left": left, "sigis": sigis, "cons": []}
+
+    def axi_lite(self, name: str, manager: bool, prefix: str) -> None:
+        """Adds an AXI4-Lite bus interface along with its physical ports"""
+        portmaps = []
+        for logical, by_manager, left in _AXI_LITE:
+            physical = f"{prefix}_{logical.lower()}"
+            self.port(physical, by_manager == manager, left)
+            portmaps.append((logical, physical))
+        btype = "MASTER" if manager else "SLAVE"
+        self.busifs.append((name, btype, _AXIMM_VLNV, portmaps))
+
+    def render(self) -> str:
+        attrs = " ".join(f'{k}="{v}"' for k, v in sorted(self.attrs.items()))
+        out = [f"    <MODULE {attrs}>"]
+        if self.addrblocks:
+            out.append("      <ADDRESSBLOCKS>")
+            out.extend(self.addrblocks)
+            out.append("      </ADDRESSBLOCKS>")
+        if self.memranges:
+            out.append("      <MEMORYMAP>")
+            out.extend(self.memranges)
+            out.append("      </MEMORYMAP>")
+        out.append("      <PARAMETERS>")
+        out.extend(
+            f'        <PARAMETER NAME="{n}" VALUE="{v}"/>' for n, v in self.parameters
+        )
+        out.append("      </PARAMETERS>")
+        out.append("      <PORTS>")
+        for name, p in self.ports.items():
+            out.append(_render_port(name, p))
+        out.append("      </PORTS>")
+        out.append("      <BUSINTERFACES>")
+        for name, btype, vlnv, portmaps in self.busifs:
+            out.append(
+                f'        <BUSINTERFACE BUSNAME="{self.instance}_{name}" NAME="{name}" TYPE="{btype}" VLNV="{vlnv}">'
+            )
+            out.append('          <PARAMETER NAME="PROTOCOL" VALUE="AXI4LITE"/>')
+            out.append("          <PORTMAPS>")
+            out.extend(
+                f'            <PORTMAP LOGICAL="{logical}" PHYSICAL="{physical}"/>'
+                for logical, physical in portmaps
+            )
+            out.append("          </PORTMAPS>")
+            out.append("        </BUSINTERFACE>")
+        out.append("      </BUSINTERFACES>")
+        out.append("    </MODULE>")
+        return "\n".join(out)
+
+
+def _render_port(name: str, p: Dict) -> str:
+    direction = "O" if p["output"] else "I"
+    width = ""
+    if p["left"] is not None:
+        width = f' LEFT="{p["left"]}" RIGHT="0"'
+    start = f'      <PORT DIR="{direction}"{width} NAME="{name}" SIGIS="{p["sigis"]}"'
+    if not p["cons"]:
+        return start + "/>"
+    out = [start + ">", "        <CONNECTIONS>"]
+    out.extend(
+        f'          <CONNECTION INSTANCE="{i}" PORT="{port}"/>' for i, port in p["cons"]
+    )
+    out.append("        </CONNECTIONS>")
+    out.append("      </PORT>")
+    return "\n".join(out)
+
+
+class _Design:
+    """The modules and external ports of one generated HWH"""
+
+    def __init__(self, name: str, arch: str) -> None:
+        self.name = name
+        self.arch = arch
+        self.modules: Dict[str, _Module] = {}
+        self.ext_ports: Dict[str, Dict] = {}
+        self.ext_busifs: List[Tuple[str, List[Tuple[str, str]]]] = []
+
+    def add(self, module: _Module) -> _Module:
+        self.modules[module.instance] = module
+        return module
+
+    def _port(self, instance: str, port: str) -> Dict:
+        if instance == "External_Ports":
+            return self.ext_ports[port]
+        return self.modules[instance].ports[port]
+
+    def connect(self, a: Tuple[str, str], b: Tuple[str, str]) -> None:
+        """Connects the (instance, port) a to b, in both directions"""
+        self._port(*a)["cons"].append(b)
+        self._port(*b)["cons"].append(a)
+
+    def connect_axi(self, manager: Tuple[str, str], subordinate: Tuple[str, str]) -> None:
+        """Connects the AXI4-Lite ports with prefix manager[1] to those of subordinate"""
+        for logical, _, _ in _AXI_LITE:
+            self.connect(
+                (manager[0], f"{manager[1]}_{logical.lower()}"),
+                (subordinate[0], f"{subordinate[1]}_{logical.lower()}"),
+            )
+
+    def render(self) -> str:
+        out = [
+            '<?xml version="1.0" encoding="UTF-8" standalone="no" ?>',
+            '<EDKSYSTEM EDWVERSION="1.2" TIMESTAMP="Thu Jan  1 00:00:00 1970" VIVADOVERSION="2022.1">',
+            "",
+            f'  <SYSTEMINFO ARCH="{self.arch}" DEVICE="synthetic" NAME="{self.name}" PACKAGE="synthetic" SPEEDGRADE="-1"/>',
+            "",
+            "  <EXTERNALPORTS>",
+        ]
+        for name, p in self.ext_ports.items():
+            out.append(_render_port(name, p))
+        out.append("  </EXTERNALPORTS>")
+        out.append("")
+        out.append("  <EXTERNALINTERFACES>")
+        for name, portmaps in self.ext_busifs:
+            out.append(
+                f'    <BUSINTERFACE BUSNAME="External_Interface_{name}" NAME="{name}" TYPE="SLAVE" VLNV="{_AXIMM_VLNV}">'
+            )
+            out.append('      <PARAMETER NAME="HAS_QOS" VALUE="0"/>')
+            out.append("      <PORTMAPS>")
+            out.extend(
+                f'        <PORTMAP LOGICAL="{logical}" PHYSICAL="{physical}"/>'
+                for logical, physical in portmaps
+            )
+            out.append("      </PORTMAPS>")
+            out.append("    </BUSINTERFACE>")
+        out.append("  </EXTERNALINTERFACES>")
+        out.append("")
+        out.append("  <MODULES>")
+        out.extend(m.render() for m in self.modules.values())
+        out.append("  </MODULES>")
+        out.append("")
+        out.append("</EDKSYSTEM>")
+        return "\n".join(out) + "\n"
+
+
+def _register_map(spec: DesignSpec, interface: str) -> str:
+    """The ADDRESSBLOCK of an IP core with a register map"""
+    out = [
+        f'        <ADDRESSBLOCK ACCESS="read-write" INTERFACE="{interface}" NAME="Reg" RANGE="65536" USAGE="register">',
+        "          <REGISTERS>",
+    ]
+    for r in range(spec.n_registers):
+        out.append(f'            <REGISTER NAME="REG{r}">')
+        for pname, value in (
+            ("DESCRIPTION", f"Synthetic register {r}"),
+            ("ADDRESS_OFFSET", hex(4 * r)),
+            ("SIZE", "32"),
+            ("ACCESS", "read-write"),
+            ("IS_ENABLED", "true"),
+            ("RESET_VALUE", "0x0"),
+        ):
+            out.append(f'              <PROPERTY NAME="{pname}" VALUE="{value}"/>')
+        out.append("              <FIELDS>")
+        width = max(1, 32 // max(1, spec.n_bitfields))
+        for f in range(spec.n_bitfields):
+            out.append(f'                <FIELD NAME="FIELD{f}">')
+            for pname, value in (
+                ("DESCRIPTION", f"Synthetic field {f}"),
+                ("ACCESS", "read-write"),
+                ("BIT_OFFSET", str(f * width)),
+                ("BIT_WIDTH", str(width)),
+            ):
+                out.append(
+                    f'                  <PROPERTY NAME="{pname}" VALUE="{value}"/>'
+                )
+            out.append("                </FIELD>")
+        out.append("              </FIELDS>")
+        out.append("            </REGISTER>")
+    out.append("          </REGISTERS>")
+    out.append("        </ADDRESSBLOCK>")
+    return "\n".join(out)
+
+
+def _memrange(
+    instance: str, busif: str, manager: str, base: int, size: int, memtype: str
+) -> str:
+    block = "Mem0" if memtype == "MEMORY" else "Reg"
+    return (
+        f'        <MEMRANGE ADDRESSBLOCK="{block}" BASENAME="C_BASEADDR" BASEVALUE="0x{base:08X}" '
+        f'HIGHNAME="C_HIGHADDR" HIGHVALUE="0x{base + size - 1:08X}" INSTANCE="{instance}" '
+        f'IS_DATA="TRUE" IS_INSTRUCTION="TRUE" MASTERBUSINTERFACE="{manager}" '
+        f'MEMTYPE="{memtype}" SLAVEBUSINTERFACE="{busif}"/>'
+    )
+
+
+def _interconnect_tree(
+    design: _Design,
+    root: Tuple[str, str],
+    targets: List[Tuple[str, str]],
+    fanout: int,
+    clocks: Tuple[Tuple[str, str], Tuple[str, str]],
+    prefix: str = "",
+) -> None:
+    """
+    Connects the AXI4-Lite manager root to every (instance, interface prefix)
+    of targets through a tree of AXI interconnects with at most fanout managers
+    """
+    if len(targets) == 1:
+        design.connect_axi(root, targets[0])
+        return
+    fanout = max(2, fanout)
+    level = 0
+    while True:
+        groups = [targets[i : i + fanout] for i in range(0, len(targets), fanout)]
+        parents = []
+        for g, group in enumerate(groups):
+            name = f"{prefix}axi_interconnect_{level}_{g}"
+            ic = design.add(
+                _Module(name, "xilinx.com:ip:axi_interconnect:2.1", name)
+            )
+            ic.parameters.append(("NUM_MI", str(len(group))))
+            ic.port("ACLK", False, sigis="clk")
+            ic.port("ARESETN", False, sigis="rst")
+            design.connect(clocks[0], (name, "ACLK"))
+            design.connect(clocks[1], (name, "ARESETN"))
+            ic.axi_lite("S00_AXI", False, "S00_AXI")
+            for m, target in enumerate(group):
+                mname = f"M{m:02d}_AXI"
+                ic.axi_lite(mname, True, mname)
+                design.connect_axi((name, mname), target)
+            parents.append((name, "S00_AXI"))
+        if len(parents) == 1:
+            design.connect_axi(root, parents[0])
+            return
+        targets = parents
+        level = level + 1
+
+
+def _ip_core(
+    design: _Design,
+    spec: DesignSpec,
+    name: str,
+    fullname: str,
+    clocks: Tuple[Tuple[str, str], Tuple[str, str]],
+    interrupt: bool = True,
+) -> _Module:
+    """A register mapped HLS style IP core"""
+    ip = design.add(
+        _Module(name, "xilinx.com:hls:synth_ip:1.0", fullname, IPTYPE="PERIPHERAL")
+    )
+    ip.parameters.append(("C_S_AXI_CONTROL_ADDR_WIDTH", "16"))
+    ip.parameters.append(("C_S_AXI_CONTROL_DATA_WIDTH", "32"))
+    ip.port("ap_clk", False, sigis="clk")
+    ip.port("ap_rst_n", False, sigis="rst")
+    design.connect(clocks[0], (name, "ap_clk"))
+    design.connect(clocks[1], (name, "ap_rst_n"))
+    ip.axi_lite("s_axi_control", False, "s_axi_control")
+    if interrupt:
+        ip.port("interrupt", True, sigis="INTERRUPT")
+    ip.addrblocks.append(_register_map(spec, "s_axi_control"))
+    return ip
+
+
+def _concat_tree(
+    design: _Design, sources: List[Tuple[str, str]], width: int
+) -> Tuple[str, str]:
+    """
+    Gathers the interrupt outputs of sources through a tree of xlconcats of
+    width inputs, returning the dout of the root concat
+    """
+    width = max(2, width)
+    level = 0
+    while True:
+        groups = [sources[i : i + width] for i in range(0, len(sources), width)]
+        outputs = []
+        for g, group in enumerate(groups):
+            name = f"xlconcat_{level}_{g}"
+            concat = design.add(_Module(name, "xilinx.com:ip:xlconcat:2.1", name))
+            concat.parameters.append(("NUM_PORTS", str(width)))
+            for i in range(width):
+                concat.port(f"In{i}", False, 0)
+            concat.port("dout", True, width - 1)
+            for i, src in enumerate(group):
+                design.connect(src, (name, f"In{i}"))
+            outputs.append((name, "dout"))
+        if len(outputs) == 1:
+            return outputs[0]
+        sources = outputs
+        level = level + 1
+
+
+def _bdc_design(
+    spec: DesignSpec, bd_name: str, depth: int, bdc_hwhs: Dict[str, str]
+) -> None:
+    """Generates the HWH of a BDC, and of any BDCs nested within it, into bdc_hwhs"""
+    design = _Design(bd_name, _PS_FLAVOURS[spec.ps]["arch"])
+    portmaps = []
+    for logical, by_manager, left in _AXI_LITE:
+        physical = f"S_AXI_{logical.lower()}"
+        design.ext_ports[physical] = {
+            "output": not by_manager,
+            "left": left,
+            "sigis": "undef",
+            "cons": [],
+        }
+        portmaps.append((logical, physical))
+    design.ext_busifs.append(("S_AXI", portmaps))
+    for name, sigis in (("aclk", "clk"), ("aresetn", "rst")):
+        design.ext_ports[name] = {
+            "output": False,
+            "left": None,
+            "sigis": sigis,
+            "cons": [],
+        }
+    clocks = (("External_Ports", "aclk"), ("External_Ports", "aresetn"))
+
+    targets = []
+    for i in range(spec.bdc_cores):
+        name = f"bdc_ip_{i}"
+        _ip_core(design, spec, name, name, clocks, interrupt=False)
+        targets.append((name, "s_axi_control"))
+    if depth > 1:
+        nested = _bdc_block(design, spec, f"{bd_name}_nested", "nested_bdc", clocks)
+        _bdc_design(spec, nested, depth - 1, bdc_hwhs)
+        targets.append(("nested_bdc", "S_AXI"))
+    _interconnect_tree(
+        design, ("External_Ports", "S_AXI"), targets, spec.fanout, clocks
+    )
+    bdc_hwhs[bd_name] = design.render()
+
+
+def _bdc_block(
+    design: _Design,
+    spec: DesignSpec,
+    bd_name: str,
+    name: str,
+    clocks: Tuple[Tuple[str, str], Tuple[str, str]],
+) -> str:
+    """Adds a BLOCK_CONTAINER MODULE to design, returning its BD name"""
+    bdc = design.add(
+        _Module(
+            name,
+            "xilinx.com:ip:bd_container:1.0",
+            name,
+            BD=bd_name,
+            BDTYPE="BLOCK_CONTAINER",
+        )
+    )
+    bdc.port("aclk", False, sigis="clk")
+    bdc.port("aresetn", False, sigis="rst")
+    design.connect(clocks[0], (name, "aclk"))
+    design.connect(clocks[1], (name, "aresetn"))
+    bdc.axi_lite("S_AXI", False, "S_AXI")
+    return bd_name
+
+
+def generate_design(spec: Optional[DesignSpec] = None, **kwargs) -> SyntheticDesign:
+    """
+    Generates a synthetic design, described by spec or by the
+    DesignSpec fields given as keyword arguments. Every IP core
+    is addressable from the PS and has its interrupt gathered
+    through an xlconcat tree into an AXI interrupt controller.
+    """
+    if spec is None:
+        spec = DesignSpec(**kwargs)
+    if spec.ps not in _PS_FLAVOURS:
+        raise ValueError(
+            f"{spec.ps} is not a supported PS, expected one of {list(_PS_FLAVOURS)}"
+        )
+    flavour = _PS_FLAVOURS[spec.ps]
+    design = _Design(spec.name, flavour["arch"])
+    bdc_hwhs: Dict[str, str] = {}
+
+    ps_name = "ps_0"
+    ps = design.add(
+        _Module(ps_name, flavour["vlnv"], ps_name, IS_PL="FALSE", MODTYPE=spec.ps)
+    )
+    for i in range(4):
+        ps.parameters.append((flavour["clk_enable"].format(i=i), "1" if i == 0 else "0"))
+        for j in range(2):
+            ps.parameters.append((flavour["clk_divisor"].format(i=i, j=j), str(j + 1)))
+        ps.parameters.append((flavour["clk_select"].format(i=i), "IOPLL"))
+    ps.port(flavour["clk"], True, sigis="clk")
+    ps.port(flavour["resetn"], True, sigis="rst")
+    ps.port(flavour["irq"], False, flavour["irq_width"] - 1, sigis="INTERRUPT")
+    ps.port(flavour["gpio"], True, 31)
+    ps.busifs.append(
+        ("GPIO_0", "MASTER", "xilinx.com:interface:gpio:1.0", [("TRI_O", flavour["gpio"])])
+    )
+    manager = flavour["manager"]
+    ps.axi_lite(manager, True, manager.lower())
+    clocks = ((ps_name, flavour["clk"]), (ps_name, flavour["resetn"]))
+
+    baseaddr = flavour["baseaddr"]
+    targets = []
+    irqs = []
+
+    def addressed(
+        name: str, busif: str, prefix: str, size: int, memtype: str = "REGISTER"
+    ) -> None:
+        nonlocal baseaddr
+        ps.memranges.append(_memrange(name, busif, manager, baseaddr, size, memtype))
+        baseaddr = baseaddr + size
+        targets.append((name, prefix))
+
+    for i in range(spec.n_cores):
+        name = f"ip_{i}"
+        fullname = name
+        if spec.hierarchy_size > 0:
+            fullname = f"hier_{i // spec.hierarchy_size}/{name}"
+        _ip_core(design, spec, name, fullname, clocks)
+        addressed(name, "s_axi_control", "s_axi_control", 0x10000)
+        irqs.append((name, "interrupt"))
+
+    for i in range(spec.n_memories):
+        name = f"axi_bram_ctrl_{i}"
+        mem = design.add(
+            _Module(name, "xilinx.com:ip:axi_bram_ctrl:4.1", name, IPTYPE="PERIPHERAL")
+        )
+        mem.port("s_axi_aclk", False, sigis="clk")
+        mem.port("s_axi_aresetn", False, sigis="rst")
+        design.connect(clocks[0], (name, "s_axi_aclk"))
+        design.connect(clocks[1], (name, "s_axi_aresetn"))
+        mem.axi_lite("S_AXI", False, "s_axi")
+        mem.addrblocks.append(
+            '        <ADDRESSBLOCK ACCESS="read-write" INTERFACE="S_AXI" NAME="Mem0" RANGE="8192" USAGE="memory"/>'
+        )
+        addressed(name, "S_AXI", "s_axi", 0x2000, "MEMORY")
+
+    for i in range(spec.n_bdcs):
+        name = f"bdc_{i}"
+        bd_name = _bdc_block(design, spec, f"{spec.name}_bd_{i}_bd", name, clocks)
+        _bdc_design(spec, bd_name, spec.bdc_depth, bdc_hwhs)
+        addressed(name, "S_AXI", "S_AXI", 0x10000)
+
+    # Interrupts: IP cores -> concat tree -> axi_intc -> concat -> PS
+    intc = design.add(
+        _Module("axi_intc_0", "xilinx.com:ip:axi_intc:4.1", "axi_intc_0")
+    )
+    intc.port("s_axi_aclk", False, sigis="clk")
+    intc.port("s_axi_aresetn", False, sigis="rst")
+    design.connect(clocks[0], ("axi_intc_0", "s_axi_aclk"))
+    design.connect(clocks[1], ("axi_intc_0", "s_axi_aresetn"))
+    intc.axi_lite("s_axi", False, "s_axi")
+    intc.port("intr", False, max(2, spec.concat_width) - 1, sigis="INTERRUPT")
+    intc.port("irq", True, sigis="INTERRUPT")
+    addressed("axi_intc_0", "s_axi", "s_axi", 0x10000)
+    if irqs:
+        design.connect(
+            _concat_tree(design, irqs, spec.concat_width), ("axi_intc_0", "intr")
+        )
+
+    ps_concat = design.add(
+        _Module("xlconcat_ps", "xilinx.com:ip:xlconcat:2.1", "xlconcat_ps")
+    )
+    ps_concat.port("In0", False, 0)
+    ps_concat.port("dout", True, flavour["irq_width"] - 1)
+    design.connect(("axi_intc_0", "irq"), ("xlconcat_ps", "In0"))
+    design.connect(("xlconcat_ps", "dout"), (ps_name, flavour["irq"]))
+
+    # GPIO: PS GPIO -> xlslice -> external port
+    for i in range(spec.n_gpio):
+        name = f"xlslice_{i}"
+        slc = design.add(_Module(name, "xilinx.com:ip:xlslice:1.0", name))
+        slc.parameters.append(("DIN_FROM", str(i)))
+        slc.parameters.append(("DIN_TO", str(i)))
+        slc.port("Din", False, 31)
+        slc.port("Dout", True, 0)
+        design.ext_ports[f"gpio_{i}"] = {
+            "output": True,
+            "left": 0,
+            "sigis": "undef",
+            "cons": [],
+        }
+        design.connect((ps_name, flavour["gpio"]), (name, "Din"))
+        design.connect((name, "Dout"), ("External_Ports", f"gpio_{i}"))
+
+    _interconnect_tree(design, (ps_name, manager.lower()), targets, spec.fanout, clocks)
+
+    return SyntheticDesign(spec=spec, hwh=design.render(), bdc_hwhs=bdc_hwhs)
@@ -0,0 +1,56 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import gc
+import tracemalloc
+from typing import Callable, Dict
+
+from ..frontends.hwh_frontend import HwhFrontend
+from ..frontends.json_frontend import JsonFrontend
+from ..models.module import Module
+from .design_generator import SyntheticDesign
+
+
+def memory_footprint(build: Callable[[], object]) -> Dict[str, int]:
+    """
+    Returns the memory, in bytes, allocated by build() and still held by
+    the object it returns (retained), along with the peak memory used
+    while building it (peak)
+    """
+    gc.collect()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        obj = build()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    del obj
+    return {"retained": current - before, "peak": peak - before}
+
+
+def _model(design: SyntheticDesign) -> Callable[[], Module]:
+    # A model built from JSON holds no parser state, only the model itself
+    js = design.json()
+    return lambda: JsonFrontend(js)
+
+
+def _parse_streaming(design: SyntheticDesign) -> Callable[[], Module]:
+    return lambda: HwhFrontend(_hwhfile=design.hwh, _streaming=True)
+
+
+def _parse(design: SyntheticDesign) -> Callable[[], Module]:
+    return lambda: HwhFrontend(_hwhfile=design.hwh)
+
+
+# Each builds the callable that creates the object to measure from a design
+MEMORY_STAGES: Dict[str, Callable[[SyntheticDesign], Callable[[], object]]] = {
+    "model": _model,
+    "parse": _parse,
+    "parse_streaming": _parse_streaming,
+}
@@ -0,0 +1,310 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import platform
+import re
+import time
+from dataclasses import replace
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ..frontends.hwh_frontend import HwhFrontend
+from ..frontends.json_frontend import JsonFrontend
+from ..models.module import Module
+from ..views.runtime import (
+    ClockDictView,
+    GpioDictView,
+    HierarchyDictView,
+    InterruptControllersView,
+    InterruptPinsView,
+    IpDictView,
+    MemDictView,
+    RuntimeMetadataParser,
+)
+from .design_generator import DesignSpec, SyntheticDesign, generate_design
+from .memory import MEMORY_STAGES, memory_footprint
+
+RESULTS_FORMAT = 1
+
+
+def _changed_parameter(hwh: str) -> str:
+    """Returns hwh with the value of a single IP core parameter changed"""
+    return re.sub(
+        r'(<PARAMETER NAME="C_S_AXI_CONTROL_ADDR_WIDTH" VALUE=")16"',
+        r'\g<1>17"',
+        hwh,
+        count=1,
+    )
+
+
+def _stage_generate(design: SyntheticDesign) -> Callable:
+    return lambda: generate_design(design.spec)
+
+
+def _stage_parse(design: SyntheticDesign) -> Callable:
+    return lambda: HwhFrontend(_hwhfile=design.hwh)
+
+
+def _stage_parse_streaming(design: SyntheticDesign) -> Callable:
+    return lambda: HwhFrontend(_hwhfile=design.hwh, _streaming=True)
+
+
+def _stage_refresh(design: SyntheticDesign) -> Callable:
+    md = design.parse()
+    return lambda: md.refresh(full=True)
+
+
+def _stage_refresh_incremental(design: SyntheticDesign) -> Callable:
+    md = design.parse()
+    block = next(b for b in md.blocks.values() if b.ports)
+    block.rename(f"{block.name}_renamed")
+    return lambda: md.refresh(full=False)
+
+
+def _stage_remove_cores(design: SyntheticDesign) -> Callable:
+    md = design.parse()
+    blocks = [b for b in md.blocks.values() if b.ports]
+    return lambda: md.remove_many(blocks[: len(blocks) // 4])
+
+
+def _stage_copy(design: SyntheticDesign) -> Callable:
+    return design.parse().copy
+
+
+def _annotated_variant(md: Module) -> Module:
+    ret = md.copy(copy_on_write=True)
+    for block in ret.blocks.values():
+        block.ext["vis"] = {"hidden": "no"}
+    return ret
+
+
+def _stage_copy_on_write(design: SyntheticDesign) -> Callable:
+    md = design.parse()
+    return lambda: _annotated_variant(md)
+
+
+def _stage_update(design: SyntheticDesign) -> Callable:
+    md = HwhFrontend(_hwhfile=design.hwh)
+    new = _changed_parameter(design.hwh)
+    return lambda: md.update(new)
+
+
+def _stage_merge(design: SyntheticDesign) -> Optional[Callable]:
+    if not design.bdc_hwhs:
+        return None
+    md = design.parse(merge_bdcs=False)
+    return lambda: design.merge_bdcs(md)
+
+
+def _stage_json_export(design: SyntheticDesign) -> Callable:
+    return design.parse().json
+
+
+def _stage_json_import(design: SyntheticDesign) -> Callable:
+    js = design.json()
+    return lambda: JsonFrontend(js)
+
+
+def _view_stage(view: Callable[[Module], Dict]) -> Callable:
+    def _stage(design: SyntheticDesign) -> Callable:
+        md = design.parse()
+        return lambda: view(md)
+
+    return _stage
+
+
+def _interrupt_pins(md: Module) -> Dict:
+    return InterruptPinsView(md, InterruptControllersView(md).view).view
+
+
+def _stage_hierarchy_dict(design: SyntheticDesign) -> Callable:
+    md = design.parse()
+    ip_view = IpDictView(md).view
+    mem_view = MemDictView(md).view
+    return lambda: HierarchyDictView(
+        module=md,
+        ip_view=ip_view,
+        mem_view=mem_view,
+        overlay=None,
+        hierarchy_drivers={},
+        default_hierarchy=None,
+        device=None,
+    ).view
+
+
+# Each stage is built from a design, doing any setup outside of the
+# measurement, and returns the callable to time, or None if the stage
+# does not apply to the design. Stages are rebuilt for every repeat so
+# that each measurement starts from a freshly parsed model.
+STAGES: Dict[str, Callable[[SyntheticDesign], Optional[Callable]]] = {
+    "generate": _stage_generate,
+    "parse": _stage_parse,
+    "parse_streaming": _stage_parse_streaming,
+    "refresh": _stage_refresh,
+    "refresh_incremental": _stage_refresh_incremental,
+    "remove_cores": _stage_remove_cores,
+    "copy": _stage_copy,
+    "copy_on_write": _stage_copy_on_write,
+    "update": _stage_update,
+    "merge": _stage_merge,
+    "json_export": _stage_json_export,
+    "json_import": _stage_json_import,
+    "interrupt_controllers_view": _view_stage(
+        lambda md: InterruptControllersView(md).view
+    ),
+    "interrupt_pins_view": _view_stage(_interrupt_pins),
+    "ip_dict_view": _view_stage(lambda md: IpDictView(md).view),
+    "gpio_dict_view": _view_stage(lambda md: GpioDictView(md).view),
+    "clock_dict_view": _view_stage(lambda md: ClockDictView(md).clock_dict),
+    "mem_dict_view": _view_stage(lambda md: MemDictView(md).view),
+    "hierarchy_dict_view": _stage_hierarchy_dict,
+    "runtime_parser": _view_stage(RuntimeMetadataParser),
+}
+
+
+def design_counts(md: Module) -> Dict[str, int]:
+    """Counts the blocks, ports and signals in md, including those of submodules"""
+    counts = {"blocks": 0, "ports": 0, "signals": 0}
+    for block in md.blocks.values():
+        counts["blocks"] += 1
+        if isinstance(block, Module):
+            for k, v in design_counts(block).items():
+                counts[k] += v
+        counts["ports"] += len(block.ports)
+        for port in block.ports.values():
+            counts["signals"] += len(port.signals)
+    return counts
+
+
+def time_stage(
+    stage: Callable[[SyntheticDesign], Optional[Callable]],
+    design: SyntheticDesign,
+    repeat: int = 3,
+) -> Optional[Dict[str, float]]:
+    """Times repeat runs of stage on design, returning the best and mean in seconds"""
+    times = []
+    for _ in range(repeat):
+        run = stage(design)
+        if run is None:
+            return None
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "mean": sum(times) / len(times)}
+
+
+def run_benchmarks(
+    sizes: Iterable[int] = (8, 32, 128),
+    repeat: int = 3,
+    stages: Optional[Iterable[str]] = None,
+    spec: Optional[DesignSpec] = None,
+    output: Optional[str] = None,
+    progress: Optional[Callable[[Dict], None]] = None,
+    memory: bool = False,
+) -> Dict:
+    """
+    Times every stage (default: all of STAGES) on a synthetic design of
+    each size, where the size is the number of IP cores and the rest of the
+    design follows spec. Returns the results, which are also written as
+    JSON to output when given, for plotting scaling curves or comparing
+    with a baseline using compare_results().
+
+    With memory set, the memory held by the model, and used while parsing,
+    for each of MEMORY_STAGES is also measured, in the "memory" results.
+    """
+    if spec is None:
+        spec = DesignSpec()
+    if stages is None:
+        stages = list(STAGES)
+    stages = list(stages)
+    for name in stages:
+        if name not in STAGES:
+            raise ValueError(
+                f"Unknown benchmark stage {name}, expected one of {list(STAGES)}"
+            )
+
+    results = []
+    memory_results = []
+    for size in sizes:
+        design = generate_design(replace(spec, n_cores=size))
+        counts = design_counts(design.parse())
+        if memory:
+            for name, stage in MEMORY_STAGES.items():
+                result = {
+                    "size": size,
+                    "stage": name,
+                    **memory_footprint(stage(design)),
+                    "hwh_bytes": len(design.hwh),
+                    "counts": counts,
+                }
+                memory_results.append(result)
+                if progress is not None:
+                    progress(result)
+        for name in stages:
+            timing = time_stage(STAGES[name], design, repeat=repeat)
+            if timing is None:
+                continue
+            result = {
+                "size": size,
+                "stage": name,
+                "repeat": repeat,
+                **timing,
+                "hwh_bytes": len(design.hwh),
+                "counts": counts,
+                "spec": design.spec.dict(),
+            }
+            results.append(result)
+            if progress is not None:
+                progress(result)
+
+    ret = {
+        "format": RESULTS_FORMAT,
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if memory:
+        ret["memory"] = memory_results
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(ret, f, indent=2)
+    return ret
+
+
+def load_results(path: str) -> Dict:
+    """Loads benchmark results written by run_benchmarks()"""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare_results(
+    baseline: Dict, current: Dict, tolerance: float = 0.25
+) -> List[Dict]:
+    """
+    Compares the best time of every (size, stage) in current with
+    baseline and returns those that are slower by more than tolerance,
+    as a fraction of the baseline time. Memory results present in both
+    are compared the same way on the memory retained by the model.
+    """
+    regressions = []
+    for kind, metric in (("results", "best"), ("memory", "retained")):
+        base = {(r["size"], r["stage"]): r[metric] for r in baseline.get(kind, [])}
+        for r in current.get(kind, []):
+            key = (r["size"], r["stage"])
+            if key in base and r[metric] > base[key] * (1 + tolerance):
+                regressions.append(
+                    {
+                        "size": r["size"],
+                        "stage": r["stage"],
+                        "metric": metric,
+                        "baseline": base[key],
+                        "current": r[metric],
+                        "ratio": r[metric] / base[key],
+                    }
+                )
+    return regressions
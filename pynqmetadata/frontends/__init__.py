@@ -4,4 +4,5 @@
 from .hwh_frontend import HwhFrontend
 from .json_frontend import JsonFrontend
 from .metadata import Metadata
+from .parse_cache import ParseCache
 from . import visualisations
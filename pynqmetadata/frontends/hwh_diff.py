@@ -0,0 +1,141 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+_MODULE_OPEN = b"<MODULE "
+_MODULE_CLOSE = b"</MODULE>"
+_INSTANCE_RE = re.compile(rb'\sINSTANCE="([^"]*)"')
+
+
+def read_hwh_bytes(hwhfile: str) -> bytes:
+    """Returns the contents of hwhfile, which is either a path or an XML string"""
+    # Checking whether a multi-megabyte XML string is a path is not free
+    if "<" not in hwhfile[:64] and os.path.isfile(hwhfile):
+        with open(hwhfile, "rb") as f:
+            return f.read()
+    return hwhfile.encode()
+
+
+def hwh_stamp(hwhfile: str) -> Optional[Tuple[int, int]]:
+    """Returns the size and modification time of hwhfile, or None if it is an XML string"""
+    if "<" not in hwhfile[:64] and os.path.isfile(hwhfile):
+        st = os.stat(hwhfile)
+        return (st.st_size, st.st_mtime_ns)
+    return None
+
+
+def split_hwh(data: bytes) -> Tuple[bytes, Dict[str, memoryview]]:
+    """
+    Splits the contents of a HWH into the text of each MODULE element,
+    by instance name in document order, and the text outside of them.
+    The EDKSYSTEM start tag is left out of the outside text as it
+    carries a TIMESTAMP that changes every time the HWH is written.
+    """
+    view = memoryview(data)
+    outside: List[memoryview] = []
+    modules: Dict[str, memoryview] = {}
+
+    pos = 0
+    start = data.find(b"<EDKSYSTEM")
+    if start != -1:
+        outside.append(view[:start])
+        pos = data.find(b">", start) + 1
+
+    while True:
+        start = data.find(_MODULE_OPEN, pos)
+        if start == -1:
+            break
+        tag_end = data.find(b">", start)
+        if tag_end == -1:
+            break
+        if data[tag_end - 1 : tag_end] == b"/":
+            end = tag_end + 1
+        else:
+            end = data.find(_MODULE_CLOSE, tag_end)
+            if end == -1:
+                break
+            end = end + len(_MODULE_CLOSE)
+
+        match = _INSTANCE_RE.search(data, start, tag_end)
+        if match is None:
+            break
+        # The layout between two MODULEs is not part of the design
+        if data[pos:start].strip():
+            outside.append(view[pos:start])
+        modules.setdefault(match.group(1).decode(), view[start:end])
+        pos = end
+
+    outside.append(view[pos:])
+    return b"".join(outside), modules
+
+
+def _digest(data: object) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class HwhDigest:
+    """
+    Digests of a HWH file, used to find what changed between two
+    versions of a HWH without parsing the XML of either.
+        * system : digest of everything outside of the MODULE elements
+        * modules : instance name -> digest of its MODULE, in document order
+        * chunks : instance name -> text of its MODULE, only when keep_chunks is set
+    """
+
+    def __init__(self, data: bytes, keep_chunks: bool = False) -> None:
+        outside, chunks = split_hwh(data)
+        self.system = _digest(outside)
+        self.modules: Dict[str, bytes] = {
+            name: _digest(chunk) for name, chunk in chunks.items()
+        }
+        self.chunks: Dict[str, memoryview] = chunks if keep_chunks else {}
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state["chunks"] = {}
+        return state
+
+
+@dataclass
+class HwhChanges:
+    """
+    The differences between two versions of a HWH, by MODULE instance name
+        * added, removed : MODULEs only in the new, or only in the old, HWH
+        * changed : MODULEs in both HWHs whose contents differ
+        * rebuilt : the changed MODULEs whose cores had to be rebuilt as their
+          ports changed, the rest were patched in place
+        * system_changed : something outside of the MODULEs differs
+    """
+
+    added: List[str] = field(default_factory=lambda: ([]))
+    removed: List[str] = field(default_factory=lambda: ([]))
+    changed: List[str] = field(default_factory=lambda: ([]))
+    rebuilt: List[str] = field(default_factory=lambda: ([]))
+    system_changed: bool = False
+
+    @classmethod
+    def between(cls, old: Optional[HwhDigest], new: HwhDigest) -> "HwhChanges":
+        """Returns the changes from the HWH digested in old to the one in new"""
+        if old is None:
+            return cls(added=list(new.modules), system_changed=True)
+        return cls(
+            added=[name for name in new.modules if name not in old.modules],
+            removed=[name for name in old.modules if name not in new.modules],
+            changed=[
+                name
+                for name, digest in new.modules.items()
+                if name in old.modules and old.modules[name] != digest
+            ],
+            system_changed=old.system != new.system,
+        )
+
+    def empty(self) -> bool:
+        """Returns true if the two HWHs describe the same design"""
+        return not (
+            self.added or self.removed or self.changed or self.system_changed
+        )
@@ -2,26 +2,33 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import os
-from dataclasses import dataclass, field
-from typing import Optional
+import time
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from xml.etree import ElementTree
 import warnings
 
 from pydantic import Field
 
-from ..errors import ExpectedSignalType, PortNotFound, UnexpectedPortTypeError
-from ..models.bit_field import BitField
+from ..errors import (
+    ExpectedSignalType,
+    MetadataObjectNotFound,
+    PortNotFound,
+    UnexpectedPortTypeError,
+)
 from ..models.block import Block
 from ..models.core import Core
 from ..models.dfx_core import DFXCore
 from ..models.ip_core import IPCore
 from ..models.manager_port import ManagerPort
 from ..models.metadata_extension import MetadataExtension
+from ..models.metadata_object import MetadataObject
 from ..models.module import Module
 from ..models.parameter import Parameter
+from ..models.pass_stats import timed_pass
 from ..models.port import Port
 from ..models.proc_sys_core import ProcSysCore
-from ..models.register import Register
+from ..models.register import BitFieldDescription, RegisterDescription
 from ..models.scalar_port import ScalarPort
 from ..models.signal import Signal
 from ..models.stream_port import StreamPort
@@ -31,6 +38,9 @@ from ..models.vlnv import Vlnv
 from ..models.zynq_proc_sys_core import ZynqProcSysCore
 from ..models.clk_port import ClkPort
 from ..models.rst_port import RstPort
+from .hwh_diff import HwhChanges, HwhDigest, hwh_stamp, read_hwh_bytes
+from .hwh_index import HwhIndex
+from .xml_backend import EtreeBackend, available_backends, get_backend
 
 
 def string2int(a: str) -> int:
@@ -186,6 +196,68 @@ def external_port_factory(b_itf: ElementTree) -> Port:
     return port
 
 
+# Fields that HwhFrontend.update() patches in place on an existing core or port
+_PATCHED_FIELDS = {
+    "ref",
+    "parameters",
+    "ports",
+    "signals",
+    "registers",
+    "baseaddr",
+    "range",
+    "addrmap",
+}
+
+
+def _structure(obj: MetadataObject) -> Dict:
+    """The public fields of a core or port that cannot be patched in place"""
+    ret = {
+        f.name: getattr(obj, f.name)
+        for f in fields(obj)
+        if not f.name.startswith("_") and f.name not in _PATCHED_FIELDS
+    }
+    ret["class"] = type(obj)
+    return ret
+
+
+def core_structure(core: Block) -> Tuple:
+    """
+    Returns everything about a core that update() would need to
+    rebuild it for, i.e. all but its parameters, registers, addressing
+    and connections
+    """
+    return (
+        _structure(core),
+        [
+            (
+                _structure(port),
+                [(s.name, s.width, s.driver, s.external) for s in port.signals.values()],
+            )
+            for port in core.ports.values()
+        ],
+    )
+
+
+def _count_address_maps(md: Module) -> int:
+    """Returns the number of manager to subordinate address maps in md"""
+    return sum(
+        len(p.addrmap)
+        for b in md.blocks.values()
+        for p in b.ports.values()
+        if isinstance(p, ManagerPort)
+    )
+
+
+def _count_signal_connections(md: Module) -> int:
+    """Returns the number of signal level connections in md"""
+    return sum(
+        len(sig.con_refs)
+        for b in md.blocks.values()
+        for p in b.ports.values()
+        for sig in p.signals.values()
+    )
+
+
 @dataclass
 class HwhFrontend(Module):
     """
@@ -197,12 +269,41 @@ class HwhFrontend(Module):
     _hwhfile: str = ""
     _element_tree: object = None
     _root: object = None
+    _index: Optional[HwhIndex] = None
+
+    _streaming: bool = False
+
+    # Name of the XML backend to parse with, by default lxml if installed
+    _xml_backend: Optional[str] = None
+    _xml: Optional[EtreeBackend] = None
 
     _logical2physical_portmap: dict = field(default_factory=lambda: ({}))
     _physical2logical_portmap: dict = field(default_factory=lambda: ({}))
     _logical2physical_extern_pm: dict = field(default_factory=lambda: ({}))
     _physical2logical_extern_pm: dict = field(default_factory=lambda: ({}))
 
+    # (instance, physical port name) -> Signal, filled in as the cores are populated
+    _signal_handles: dict = field(default_factory=lambda: ({}))
+
+    # Digests of the parsed HWH, used by update() to find what has changed.
+    # Only taken by the first update(), from the HWH if it is unchanged since
+    # the parse, the size and modification time it was parsed at
+    _digest: Optional[HwhDigest] = None
+    _hwh_stamp: Optional[Tuple[int, int]] = None
+
+    # Not part of the model, copy on write copies are made without it. Only
+    # update() uses it after the parse, which parses again without the index
+    _parser_state: ClassVar[Tuple[str, ...]] = (
+        "_element_tree",
+        "_root",
+        "_index",
+        "_logical2physical_portmap",
+        "_physical2logical_portmap",
+        "_logical2physical_extern_pm",
+        "_physical2logical_extern_pm",
+        "_signal_handles",
+    )
+
     def __post_init__(self) -> None:
         """
         Performs the parsing of the hwh into the metadata model
@@ -214,19 +315,27 @@ class HwhFrontend(Module):
                 * adds the signals to each port
 
         * Performs a connectivity pass
+
+        When _streaming is set the HWH is instead consumed in a single
+        iterparse pass, see stream_parse()
+
+        The XML is read with the backend named by _xml_backend, see
+        xml_backend.get_backend(). Every backend produces the same model.
         """
+        self._xml = get_backend(self._xml_backend)
+        self._xml_backend = self._xml.name
         if self._hwhfile != "":
-            self.parse()
+            if self._streaming:
+                self.stream_parse()
+            else:
+                self.parse()
 
+    @timed_pass(objects=lambda md: len(md.blocks))
     def parse(self) -> None:
-        if os.path.isfile(self._hwhfile):
-            self._element_tree = ElementTree.parse(self._hwhfile)
-        else:
-            self._element_tree = ElementTree.ElementTree(
-                ElementTree.fromstring(self._hwhfile)
-            )
-
+        self._hwh_stamp = hwh_stamp(self._hwhfile)
+        self._element_tree = self._xml.parse(self._hwhfile)
         self._root = self._element_tree.getroot()
+        self._index = HwhIndex(self._root, self._xml)
         self.name: str = self.get_name()
         self.ref = self.name
 
@@ -239,6 +348,72 @@ class HwhFrontend(Module):
 
         self.resolve_addressing()
         self.connect_signals()
+        self._signal_handles = {}
+
+        self.refresh()
+
+    @timed_pass(objects=lambda md: len(md.blocks))
+    def stream_parse(self) -> None:
+        """
+        Parses the HWH in a single ElementTree.iterparse pass.
+        Each MODULE is turned into a core (ports, signals, parameters
+        and registers) as soon as its closing tag is seen and the
+        element is then cleared, so the whole DOM is never held
+        alongside the model. Address ranges and signal connections
+        can refer to modules that appear later in the file, so these
+        are recorded and resolved once the end of the file is reached.
+        """
+        self.name = ""
+        self.ref = self.name
+        self._hwh_stamp = hwh_stamp(self._hwhfile)
+        self._index = HwhIndex(backend=self._xml)
+
+        connections = []
+        modules = None
+        depth = 0
+        with self._measure("iterparse"):
+            for event, elem in self._xml.iterparse(self._hwhfile):
+                if event == "start":
+                    depth = depth + 1
+                    if depth == 1:
+                        self._root = elem
+                    elif depth == 2 and elem.tag == "MODULES":
+                        modules = elem
+                    continue
+
+                depth = depth - 1
+                if elem.tag == "SYSTEMINFO" and self.name == "":
+                    self.name = elem.get("NAME")
+                    self.ref = self.name
+                elif elem.tag == "MODULE" and depth == 2:
+                    self._index.add_module(elem)
+                    self._module_logical2physical_portmap(elem)
+                    self._module_physical2logical_portmap(elem)
+                    core = self._populate_core(elem)
+                    self._populate_core_regmap(core, elem)
+                    connections.extend(self._core_signal_connections(core, elem))
+
+                    # The element references are only needed while building the core
+                    del self._logical2physical_portmap[core.name]
+                    self._index.discard_module(core.name)
+                    elem.clear()
+                    if modules is not None:
+                        modules.remove(elem)
+
+        # Only the small external port sections are left in the tree now
+        self._index.add_externals(self._root)
+        self._construct_logical2physical_extern_pm()
+        self._create_external_ports()
+
+        # The memory ranges are retained by the index
+        with self._measure("resolve_addressing"):
+            self._resolve_subordinate_addressing()
+            self._resolve_manager_address_maps()
+
+        with self._measure("connect_signals"):
+            for signal, dst_instance, dst_port in connections:
+                self._connect(signal, dst_instance, dst_port)
+        self._signal_handles = {}
 
         self.refresh()
 
@@ -270,62 +445,56 @@ class HwhFrontend(Module):
         Constructs the physical2logical portmap for the external ports
         [physical_signal:str] -> { busname: str, porttype: str,  logical_name:str, width:int,  }
         """
-        for ext_i in self._root.iter("EXTERNALINTERFACES"):
-            for b_itf in ext_i.iter("BUSINTERFACE"):
-                busname = b_itf.get("NAME")
-                # infer the port type from the parameters
-                porttype = ""
-                for param in b_itf.iter("PARAMETER"):
-                    if param.get("NAME") == "HAS_QOS":
-                        porttype = "aximm"
-                    if param.get("NAME") == "HAS_TLAST":
-                        porttype = "axis"
-                for pm in b_itf.iter("PORTMAP"):
-                    pname = pm.get("PHYSICAL")
-                    lname = pm.get("LOGICAL")
-                    self._physical2logical_extern_pm[pname] = {}
-                    self._physical2logical_extern_pm[pname]["busname"] = busname
-                    self._physical2logical_extern_pm[pname]["porttype"] = porttype
-                    self._physical2logical_extern_pm[pname]["logical_name"] = lname
-                    self._physical2logical_extern_pm[pname]["width"] = 999
-                    self._physical2logical_extern_pm[pname]["driver"] = False
-                    for ext_prts in self._root.iter("EXTERNALPORTS"):
-                        for ext_p in ext_prts.iter("PORT"):
-                            if ext_p.get("NAME") == pname:
-                                driver = ext_p.get("DIR") == "O"
-                                width = 1
-                                if ext_p.get("LEFT") is not None:
-                                    width = (
-                                        int(ext_p.get("LEFT"))
-                                        - int(ext_p.get("RIGHT"))
-                                        + 1
-                                    )
-                                self._physical2logical_extern_pm[pname]["width"] = width
-                                self._physical2logical_extern_pm[pname][
-                                    "driver"
-                                ] = driver
+        for b_itf in self._index.external_busifs:
+            busname = b_itf.get("NAME")
+            # infer the port type from the parameters
+            porttype = ""
+            for param in b_itf.iter("PARAMETER"):
+                if param.get("NAME") == "HAS_QOS":
+                    porttype = "aximm"
+                if param.get("NAME") == "HAS_TLAST":
+                    porttype = "axis"
+            for pm in self._xml.select(b_itf, "PORTMAP"):
+                pname = pm.get("PHYSICAL")
+                lname = pm.get("LOGICAL")
+                self._physical2logical_extern_pm[pname] = {}
+                self._physical2logical_extern_pm[pname]["busname"] = busname
+                self._physical2logical_extern_pm[pname]["porttype"] = porttype
+                self._physical2logical_extern_pm[pname]["logical_name"] = lname
+                self._physical2logical_extern_pm[pname]["width"] = 999
+                self._physical2logical_extern_pm[pname]["driver"] = False
+                ext_p = self._index.external_ports.get(pname)
+                if ext_p is not None:
+                    driver = ext_p.get("DIR") == "O"
+                    width = 1
+                    if ext_p.get("LEFT") is not None:
+                        width = (
+                            int(ext_p.get("LEFT"))
+                            - int(ext_p.get("RIGHT"))
+                            + 1
+                        )
+                    self._physical2logical_extern_pm[pname]["width"] = width
+                    self._physical2logical_extern_pm[pname]["driver"] = driver
 
     def _create_external_ports(self) -> None:
         """Creates the external ports for the metadata object, both bus based and scalar"""
-        for ext_i in self._root.iter("EXTERNALINTERFACES"):
-            for ext_b in ext_i.iter("BUSINTERFACE"):
-                port = external_port_factory(ext_b)
-
-                for pm in ext_b.iter("PORTMAP"):
-                    sigp = self._physical2logical_extern_pm[pm.get("PHYSICAL")]
-                    port.add(
-                        Signal(
-                            name=sigp["logical_name"],
-                            width=sigp["width"],
-                            driver=sigp["driver"],
-                            external=True,
-                        )
+        for ext_b in self._index.external_busifs:
+            port = external_port_factory(ext_b)
+
+            for pm in self._xml.select(ext_b, "PORTMAP"):
+                sigp = self._physical2logical_extern_pm[pm.get("PHYSICAL")]
+                port.add(
+                    Signal(
+                        name=sigp["logical_name"],
+                        width=sigp["width"],
+                        driver=sigp["driver"],
+                        external=True,
                     )
-                self.add(port)
+                )
+            self.add(port)
 
         # For all the scalar external ports
-        ext_prts = self._root.find("EXTERNALPORTS")
-        for ext_p in ext_prts.iter("PORT"):
+        for ext_p in self._index.external_ports.values():
             if ext_p.get("NAME") not in self._physical2logical_extern_pm:
                 driver = ext_p.get("DIR") == "O"
                 width = 1
@@ -356,28 +525,28 @@ class HwhFrontend(Module):
         useful for looking up specific attibutes of a port from it's logical name
         """
         self._logical2physical_portmap = {}
-        for i in self._root.iter("MODULE"):
-            name = i.get("INSTANCE")
-            self._logical2physical_portmap[name] = {}
-            for b_itf in i.iter("BUSINTERFACE"):
-                bname = b_itf.get("NAME")
-                self._logical2physical_portmap[name][bname] = {}
-                for pm in b_itf.iter("PORTMAP"):
-                    logical_portname = pm.get("LOGICAL")
-                    self._logical2physical_portmap[name][bname][logical_portname] = None
-                    phys_portname = pm.get("PHYSICAL")
-                    found = False
-                    for prt in i.iter("PORT"):
-                        if prt.get("NAME") == phys_portname:
-                            self._logical2physical_portmap[name][bname][
-                                logical_portname
-                            ] = prt
-                            found = True
-                            break
-                    if not found:
-                        raise PortNotFound(
-                            f"Could not find physical port {phys_portname} for logical one {logical_portname}"
-                        )
+        for i in self._index.modules.values():
+            self._module_logical2physical_portmap(i)
+
+    def _module_logical2physical_portmap(self, i: ElementTree) -> None:
+        """
+        Adds the logical to physical portmapping for a single MODULE
+        """
+        name = i.get("INSTANCE")
+        ports = self._index.ports[name]
+        self._logical2physical_portmap[name] = {}
+        for bname, b_itf in self._index.busifs[name].items():
+            self._logical2physical_portmap[name][bname] = {}
+            for pm in self._xml.select(b_itf, "PORTMAP"):
+                logical_portname = pm.get("LOGICAL")
+                phys_portname = pm.get("PHYSICAL")
+                if phys_portname not in ports:
+                    raise PortNotFound(
+                        f"Could not find physical port {phys_portname} for logical one {logical_portname}"
+                    )
+                self._logical2physical_portmap[name][bname][
+                    logical_portname
+                ] = ports[phys_portname]
 
     def _construct_physical2logical_portmap(self) -> None:
         """
@@ -385,61 +554,116 @@ class HwhFrontend(Module):
         bus interfaces
         """
         self._physical2logical_portmap = {}
-        for i in self._root.iter("MODULE"):
-            name = i.get("INSTANCE")
-            self._physical2logical_portmap[name] = {}
-            for b_itf in i.iter("BUSINTERFACE"):
-                bname = b_itf.get("NAME")
-                for pm in b_itf.iter("PORTMAP"):
-                    self._physical2logical_portmap[name][pm.get("PHYSICAL")] = [
-                        bname,
-                        pm.get("LOGICAL"),
-                    ]
+        for i in self._index.modules.values():
+            self._module_physical2logical_portmap(i)
 
+    def _module_physical2logical_portmap(self, i: ElementTree) -> None:
+        """
+        Adds the physical to logical portmapping for a single MODULE
+        """
+        name = i.get("INSTANCE")
+        self._physical2logical_portmap[name] = {}
+        for bname, b_itf in self._index.busifs[name].items():
+            for pm in self._xml.select(b_itf, "PORTMAP"):
+                self._physical2logical_portmap[name][pm.get("PHYSICAL")] = [
+                    bname,
+                    pm.get("LOGICAL"),
+                ]
+
+    @timed_pass(objects=lambda md: len(md.blocks))
     def populate_cores(self) -> None:
         """
         Gets all the cores and populates the metadata.
         This pass does not worry about connecting the signals up.
         """
-        for i in self._root.iter("MODULE"):
-            core = core_factory(i)
-            for b in i.iter("BUSINTERFACE"):
-                port = port_factory(b)
-
-                # Add the signals to the port
-                for pm in b.iter("PORTMAP"):
-                    phys_et_port = self._logical2physical_portmap[core.name][port.name][
-                        pm.get("LOGICAL")
-                    ]
-                    driver = phys_et_port.get("DIR") == "O"
-                    width = 1
-                    if pm.get("LEFT") is not None:
-                        width = int(pm.get("LEFT")) - int(pm.get("RIGHT")) + 1
-                    sig = Signal(name=pm.get("LOGICAL"), width=width, driver=driver)
-                    port.add(sig)
+        for i in self._index.modules.values():
+            self._populate_core(i)
 
-                core.add(port)
+    def _populate_core(self, i: ElementTree) -> Block:
+        """
+        Creates the core for a single MODULE along with all of its
+        bus and scalar ports and adds it to the metadata.
+        The portmaps for the MODULE need to have been constructed first.
+        """
+        core = self._build_core(i)
+        self.add(core)
+        self._add_signal_handles(core)
+        return core
 
-            # Add all the scalar ports
-            for p in i.iter("PORT"):
-                if p.get("NAME") not in self._physical2logical_portmap[core.name]:
-                    driver = p.get("DIR") == "O"
-                    width = 1
-                    if p.get("LEFT") is not None:
-                        width = int(p.get("LEFT")) - int(p.get("RIGHT")) + 1
-
-                    # Determine the type of the scalar port
-                    if p.get("SIGIS") == "clk":
-                        scalar_port = ClkPort(name=p.get("NAME"), driver=driver, width=width)
-                    elif p.get("SIGIS") == "rst":
-                        scalar_port = RstPort(name=p.get("NAME"), driver=driver, width=width)
-                    else:
-                        scalar_port = ScalarPort(name=p.get("NAME"), driver=driver, width=width)
+    def _build_core(self, i: ElementTree) -> Block:
+        """
+        Creates the core for a single MODULE along with all of its
+        bus and scalar ports, without adding it to the metadata
+        """
+        core = core_factory(i)
+        for b in self._index.busifs[core.name].values():
+            port = port_factory(b)
+
+            # Add the signals to the port
+            for pm in self._xml.select(b, "PORTMAP"):
+                phys_et_port = self._logical2physical_portmap[core.name][port.name][
+                    pm.get("LOGICAL")
+                ]
+                driver = phys_et_port.get("DIR") == "O"
+                width = 1
+                if pm.get("LEFT") is not None:
+                    width = int(pm.get("LEFT")) - int(pm.get("RIGHT")) + 1
+                sig = Signal(name=pm.get("LOGICAL"), width=width, driver=driver)
+                port.add(sig)
+
+            core.add(port)
+
+        # Add all the scalar ports
+        for p in self._index.ports[core.name].values():
+            if p.get("NAME") not in self._physical2logical_portmap[core.name]:
+                driver = p.get("DIR") == "O"
+                width = 1
+                if p.get("LEFT") is not None:
+                    width = int(p.get("LEFT")) - int(p.get("RIGHT")) + 1
+
+                # Determine the type of the scalar port
+                if p.get("SIGIS") == "clk":
+                    scalar_port = ClkPort(name=p.get("NAME"), driver=driver, width=width)
+                elif p.get("SIGIS") == "rst":
+                    scalar_port = RstPort(name=p.get("NAME"), driver=driver, width=width)
+                else:
+                    scalar_port = ScalarPort(name=p.get("NAME"), driver=driver, width=width)
+
+                scalar_port.add(Signal(name=p.get("NAME"), width=width, driver=driver))
+                core.add(scalar_port)
 
-                    scalar_port.add(Signal(name=p.get("NAME"), width=width, driver=driver))
-                    core.add(scalar_port)
+        return core
 
-            self.add(core)
+    def _add_signal_handles(self, core: Block) -> None:
+        """
+        Records the signal of every physical port of core in the
+        handle table, so that connecting signals needs no lookups
+        """
+        p2l = self._physical2logical_portmap[core.name]
+        for pname in self._index.ports[core.name]:
+            if pname in p2l:
+                portname, signame = p2l[pname]
+            else:
+                portname, signame = pname, pname
+            port = core.ports.get(portname)
+            if port is not None and signame in port.signals:
+                self._signal_handles[(core.name, pname)] = port.signals[signame]
+
+    def _core_signal(self, core: Block, pname: str) -> Signal:
+        """
+        Returns the signal of core for the physical port pname, falling back
+        to a lookup for anything not in the handle table (e.g. a case mismatch)
+        """
+        signal = self._signal_handles.get((core.name, pname))
+        if signal is not None:
+            return signal
+        portname, signame = self._physical2logical_portmap[core.name].get(
+            pname, (pname, pname)
+        )
+        port = core.ports.get(portname)
+        if port is not None and signame in port.signals:
+            return port.signals[signame]
+        return core.lookup(f"{portname}[port]:{signame}[signal]")
 
     def _resolve_subordinate_addressing(self) -> None:
         """
@@ -447,18 +671,26 @@ class HwhFrontend(Module):
         WARNING: This should only be called after all the cores and ports
         have been populated.
         """
-        for i in self._root.iter("MEMRANGE"):
-            if i.get("MEMTYPE") == "REGISTER" or i.get("MEMTYPE") == "MEMORY":
-                
-                if isinstance(self, Module) and (i.get("INSTANCE") in self.ports): 
-                    port = self.ports[i.get("INSTANCE")] 
-                else:
-                    core = self.blocks[i.get("INSTANCE")]
-                    port = core.ports[i.get("SLAVEBUSINTERFACE")]
+        for mems in self._index.memranges_by_slave.values():
+            for i in mems:
+                self._set_subordinate_addressing(i)
+
+    def _set_subordinate_addressing(self, i: ElementTree) -> None:
+        """
+        Sets the base address and range of the subordinate port
+        targeted by a single MEMRANGE
+        """
+        if i.get("MEMTYPE") == "REGISTER" or i.get("MEMTYPE") == "MEMORY":
+
+            if isinstance(self, Module) and (i.get("INSTANCE") in self.ports): 
+                port = self.ports[i.get("INSTANCE")] 
+            else:
+                core = self.blocks[i.get("INSTANCE")]
+                port = core.ports[i.get("SLAVEBUSINTERFACE")]
 
-                if isinstance(port, SubordinatePort):
-                    port.baseaddr = int(i.get("BASEVALUE"), 16)
-                    port.range = (int(i.get("HIGHVALUE"), 16) - port.baseaddr) + 1
+            if isinstance(port, SubordinatePort):
+                port.baseaddr = int(i.get("BASEVALUE"), 16)
+                port.range = (int(i.get("HIGHVALUE"), 16) - port.baseaddr) + 1
 
     def _populate_subordinate_regmap(self) -> None:
         """
@@ -466,127 +698,157 @@ class HwhFrontend(Module):
         WARNING: This should only be called after all the cores and ports
         have been populated.
         """
-        for i in self._root.iter("MODULE"):
-            core = self.lookup(f"{i.get('INSTANCE')}[block]")
-            for addrblock in i.iter("ADDRESSBLOCK"):
-                if (
-                    addrblock.get("USAGE") == "register"
-                    or addrblock.get("USAGE") == "memory"
-                ):
-
-                    _port_available = False
-                    _portname = ""
-                    if addrblock.get("INTERFACE").lower() in core.ports:
-                        _port_available = True
-                        _portname = addrblock.get("INTERFACE").lower()
-                    elif addrblock.get("INTERFACE").upper() in core.ports:
-                        _port_available = True
-                        _portname = addrblock.get("INTERFACE").upper()
-                    elif addrblock.get("INTERFACE") in core.ports:
-                        _port_available = True
-                        _portname = addrblock.get("INTERFACE")
-
-                    if _port_available:
-                        port = core.ports[_portname]
-                        if isinstance(port, SubordinatePort):
-                            for reg in addrblock.iter("REGISTER"):
-                                rname: str = reg.get("NAME")
-                                description: str = ""
-                                offset: int = 0
-                                width: int = 4
-                                access: str = "read-write"
-                                enabled: bool = False
-                                for prop in reg.findall("PROPERTY"):
-                                    if prop.get("NAME") == "DESCRIPTION":
-                                        description = prop.get("VALUE")
-                                    if prop.get("NAME") == "ADDRESS_OFFSET":
-                                        offset = string2int(prop.get("VALUE"))
-                                    if prop.get("NAME") == "SIZE":
-                                        width = int(prop.get("VALUE"))
-                                    if prop.get("NAME") == "IS_ENABLED":
-                                        if addrblock.get("USAGE") == "register":
-                                            enabled = prop.get("VALUE") == "true"
-                                        else:
-                                            enabled = True
-
-                                    if prop.get("NAME") == "ACCESS":
-                                        access = prop.get("VALUE")
-
-                                rego = Register(
-                                    name=rname,
-                                    description=description,
-                                    offset=offset,
-                                    width=width,
-                                    enabled=enabled,
-                                    access=access,
-                                )
-
-                                for field in reg.iter("FIELD"):
-                                    fname: str = field.get("NAME")
-                                    fdisc: str = ""
-                                    LSB: int = 0
-                                    MSB: int = 0
-                                    faccess: str = "read-write"
-                                    for prop in field.iter("PROPERTY"):
-                                        if prop.get("NAME") == "DESCRIPTION":
-                                            fdisc = prop.get("VALUE")
-                                        if prop.get("NAME") == "BIT_OFFSET":
-                                            LSB = int(prop.get("VALUE"))
-                                        if prop.get("NAME") == "BIT_WIDTH":
-                                            MSB = LSB + int(prop.get("VALUE")) - 1
-                                        if prop.get("NAME") == "ACCESS":
-                                            faccess = prop.get("VALUE")
-                                    rego.add(
-                                        BitField(
-                                            name=fname,
-                                            description=fdisc,
-                                            LSB=LSB,
-                                            MSB=MSB,
-                                            access=faccess,
-                                        )
-                                    )
-
-                                port.add(rego)
-                        else:
-                            raise UnexpectedPortTypeError(
-                                f"{port.name} is not a SubordinatePort but we are trying to assign it a regmap"
-                            )
+        for name, i in self._index.modules.items():
+            core = self.lookup(f"{name}[block]")
+            self._populate_core_regmap(core, i)
 
-    def _resolve_manager_address_maps(self) -> None:
+    def _populate_core_regmap(self, core: Block, i: ElementTree) -> None:
         """
-        For all the manager ports resolve their address spaces
+        Populates the register maps for the subordinate ports of
+        a single core from the ADDRESSBLOCKs of its MODULE
         """
-        for i in self._root.iter("MODULE"):
-            core = self.blocks[i.get("INSTANCE")]
-            for mem in i.iter("MEMRANGE"):
-                try:  # Port might not exist if there is a hole into a BDC/RPD
-                    master_port = core.ports[mem.get("MASTERBUSINTERFACE")]
-                    subord_port = self.blocks[mem.get("INSTANCE")].ports[
-                        mem.get("SLAVEBUSINTERFACE")
-                    ]
-                    memtype = mem.get("MEMTYPE").lower()
-                    if isinstance(master_port, ManagerPort) and isinstance(
-                        subord_port, SubordinatePort
-                    ):
-
-                        master_port.addrmap_add(
-                            mem.get("ADDRESSBLOCK"), memtype, subord_port
+        for addrblock in i.iter("ADDRESSBLOCK"):
+            if (
+                addrblock.get("USAGE") == "register"
+                or addrblock.get("USAGE") == "memory"
+            ):
+
+                _port_available = False
+                _portname = ""
+                if addrblock.get("INTERFACE").lower() in core.ports:
+                    _port_available = True
+                    _portname = addrblock.get("INTERFACE").lower()
+                elif addrblock.get("INTERFACE").upper() in core.ports:
+                    _port_available = True
+                    _portname = addrblock.get("INTERFACE").upper()
+                elif addrblock.get("INTERFACE") in core.ports:
+                    _port_available = True
+                    _portname = addrblock.get("INTERFACE")
+
+                if _port_available:
+                    port = core.ports[_portname]
+                    if isinstance(port, SubordinatePort):
+                        port.add_register_descriptions(
+                            self._describe_registers(addrblock)
                         )
-                        # addrmap = AddressMap(
-                        #    name=f"{master_port.ref}_{subord_port.ref}",
-                        #    block=mem.get("ADDRESSBLOCK"),
-                        #    subord_port_obj=subord_port,
-                        #    subord_port=subord_port.ref,
-                        #    memtype=memtype,
-                        # )
-                        # master_port.addrmap_add(addrmap)
                     else:
-                        raise RuntimeError(
-                            f"Expected {master_port.ref} to be a manger and {subord_port.ref} to be a subordinate port"
+                        raise UnexpectedPortTypeError(
+                            f"{port.name} is not a SubordinatePort but we are trying to assign it a regmap"
                         )
-                except:
-                    pass
 
+    def _describe_registers(
+        self, addrblock: ElementTree
+    ) -> Tuple[RegisterDescription, ...]:
+        """
+        Returns the compact descriptions of the registers in an ADDRESSBLOCK,
+        the Register objects are only created when the registers are used
+        """
+        regs = []
+        for reg in addrblock.iter("REGISTER"):
+            rname: str = reg.get("NAME")
+            description: str = ""
+            offset: int = 0
+            width: int = 4
+            access: str = "read-write"
+            enabled: bool = False
+            for prop in reg.findall("PROPERTY"):
+                if prop.get("NAME") == "DESCRIPTION":
+                    description = prop.get("VALUE")
+                if prop.get("NAME") == "ADDRESS_OFFSET":
+                    offset = string2int(prop.get("VALUE"))
+                if prop.get("NAME") == "SIZE":
+                    width = int(prop.get("VALUE"))
+                if prop.get("NAME") == "IS_ENABLED":
+                    if addrblock.get("USAGE") == "register":
+                        enabled = prop.get("VALUE") == "true"
+                    else:
+                        enabled = True
+
+                if prop.get("NAME") == "ACCESS":
+                    access = prop.get("VALUE")
+
+            bitfields = []
+            for bfield in reg.iter("FIELD"):
+                fname: str = bfield.get("NAME")
+                fdisc: str = ""
+                LSB: int = 0
+                MSB: int = 0
+                faccess: str = "read-write"
+                for prop in bfield.iter("PROPERTY"):
+                    if prop.get("NAME") == "DESCRIPTION":
+                        fdisc = prop.get("VALUE")
+                    if prop.get("NAME") == "BIT_OFFSET":
+                        LSB = int(prop.get("VALUE"))
+                    if prop.get("NAME") == "BIT_WIDTH":
+                        MSB = LSB + int(prop.get("VALUE")) - 1
+                    if prop.get("NAME") == "ACCESS":
+                        faccess = prop.get("VALUE")
+                bitfields.append(
+                    BitFieldDescription(
+                        name=fname,
+                        description=fdisc,
+                        LSB=LSB,
+                        MSB=MSB,
+                        access=faccess,
+                    )
+                )
+
+            regs.append(
+                RegisterDescription(
+                    name=rname,
+                    description=description,
+                    offset=offset,
+                    width=width,
+                    access=access,
+                    enabled=enabled,
+                    bitfields=tuple(bitfields),
+                )
+            )
+        return tuple(regs)
+
+    def _resolve_manager_address_maps(self) -> None:
+        """
+        For all the manager ports resolve their address spaces
+        """
+        for name, by_master in self._index.memranges_by_master.items():
+            core = self.blocks[name]
+            for mems in by_master.values():
+                for mem in mems:
+                    self._add_manager_address_map(core, mem)
+
+    def _add_manager_address_map(self, core: Block, mem: ElementTree) -> None:
+        """
+        Adds the address mapping described by a single MEMRANGE of core
+        """
+        try:  # Port might not exist if there is a hole into a BDC/RPD
+            master_port = core.ports[mem.get("MASTERBUSINTERFACE")]
+            subord_port = self.blocks[mem.get("INSTANCE")].ports[
+                mem.get("SLAVEBUSINTERFACE")
+            ]
+            memtype = mem.get("MEMTYPE").lower()
+            if isinstance(master_port, ManagerPort) and isinstance(
+                subord_port, SubordinatePort
+            ):
+
+                master_port.addrmap_add(
+                    mem.get("ADDRESSBLOCK"), memtype, subord_port
+                )
+                # addrmap = AddressMap(
+                #    name=f"{master_port.ref}_{subord_port.ref}",
+                #    block=mem.get("ADDRESSBLOCK"),
+                #    subord_port_obj=subord_port,
+                #    subord_port=subord_port.ref,
+                #    memtype=memtype,
+                # )
+                # master_port.addrmap_add(addrmap)
+            else:
+                raise RuntimeError(
+                    f"Expected {master_port.ref} to be a manger and {subord_port.ref} to be a subordinate port"
+                )
+        except:
+            pass
+
+    @timed_pass(objects=lambda md: _count_address_maps(md))
     def resolve_addressing(self) -> None:
         """
         For all the subordinate ports in the design and manager ports
@@ -598,6 +860,7 @@ class HwhFrontend(Module):
         self._populate_subordinate_regmap()
         self._resolve_manager_address_maps()
 
+    @timed_pass(objects=lambda md: _count_signal_connections(md))
     def connect_signals(self) -> None:
         """
         Walk over the HWH and connect all the signals together
@@ -605,63 +868,426 @@ class HwhFrontend(Module):
         have been populated
         """
 
-        for i in self._root.iter("MODULE"):
-            core = self.lookup(f"{i.get('INSTANCE')}[block]")
-            for p in i.iter("PORT"):
-                if p.get("NAME") in self._physical2logical_portmap[core.name]:
-                    portname = self._physical2logical_portmap[core.name][p.get("NAME")][
-                        0
-                    ]
-                    signame = self._physical2logical_portmap[core.name][p.get("NAME")][
-                        1
-                    ]
-                    signal = core.lookup(f"{portname}[port]:{signame}[signal]")
-                else:
-                    signal = core.lookup(
-                        f"{p.get('NAME')}[port]:{p.get('NAME')}[signal]"
-                    )
+        for name, i in self._index.modules.items():
+            core = self.blocks[name]
+            for signal, dst_instance, dst_port in self._core_signal_connections(
+                core, i
+            ):
+                self._connect(signal, dst_instance, dst_port)
 
-                for con in p.iter("CONNECTION"):
-                    if (con.get("INSTANCE") == f"{self.name}_imp") or (
-                        con.get("INSTANCE") == "External_Ports"
-                    ):
-                        c_dst = con.get("PORT")
-                        if c_dst in self._physical2logical_extern_pm:
-                            dst_portname = self._physical2logical_extern_pm[c_dst][
-                                "busname"
-                            ]
-                            dst_signame = self._physical2logical_extern_pm[c_dst][
-                                "logical_name"
-                            ]
-                            dst_signal = self.ports[dst_portname].signals[dst_signame]
-                        else:
-                            dst_signal = self.ports[c_dst].signals[c_dst]
-
-                        # Infect the external ports VLNV with the internal ports VLNV
-                        if signal._parent.vlnv is not None:
-                            dst_signal._parent.vlnv = signal._parent.vlnv.copy()
+    def _core_signal_connections(
+        self, core: Block, i: ElementTree
+    ) -> Iterator[Tuple[Signal, str, str]]:
+        """
+        For the MODULE of core yields a (signal, instance, port) tuple
+        for every CONNECTION, where instance and port name the
+        physical destination of the connection
+        """
+        for p in self._index.ports[core.name].values():
+            signal = self._core_signal(core, p.get("NAME"))
+            for con in p.iter("CONNECTION"):
+                yield signal, con.get("INSTANCE"), con.get("PORT")
 
-                    else:
-                        dst_core = self.lookup(f"{con.get('INSTANCE')}[block]")
-                        c_dst = con.get("PORT")
-                        if c_dst in self._physical2logical_portmap[dst_core.name]:
-                            dst_portname = self._physical2logical_portmap[
-                                dst_core.name
-                            ][c_dst][0]
-                            dst_signame = self._physical2logical_portmap[dst_core.name][
-                                c_dst
-                            ][1]
-                            dst_signal = dst_core.lookup(
-                                f"{dst_portname}[port]:{dst_signame}[signal]"
-                            )
-                        else:
-                            dst_signal = dst_core.lookup(
-                                f"{c_dst}[port]:{c_dst}[signal]"
-                            )
-
-                    if isinstance(signal, Signal) and isinstance(dst_signal, Signal):
-                        signal.connect(dst_signal)
-                    else:
-                        raise ExpectedSignalType(
-                            f"{signal} and {dst_signal} were both expected to be of type Signal so that they could be connected"
-                        )
+    def _connect(self, signal: Signal, dst_instance: str, c_dst: str) -> None:
+        """
+        Connects signal to the signal of the physical port c_dst
+        on instance dst_instance
+        """
+        if (dst_instance == f"{self.name}_imp") or (
+            dst_instance == "External_Ports"
+        ):
+            if c_dst in self._physical2logical_extern_pm:
+                dst_portname = self._physical2logical_extern_pm[c_dst][
+                    "busname"
+                ]
+                dst_signame = self._physical2logical_extern_pm[c_dst][
+                    "logical_name"
+                ]
+                dst_signal = self.ports[dst_portname].signals[dst_signame]
+            else:
+                dst_signal = self.ports[c_dst].signals[c_dst]
+
+            # Infect the external ports VLNV with the internal ports VLNV
+            if signal._parent.vlnv is not None:
+                dst_signal._parent.vlnv = signal._parent.vlnv.copy()
+
+        else:
+            dst_signal = self._signal_handles.get((dst_instance, c_dst))
+            if dst_signal is None:
+                dst_core = self.blocks.get(dst_instance)
+                if dst_core is None:
+                    dst_core = self.lookup(f"{dst_instance}[block]")
+                dst_signal = self._core_signal(dst_core, c_dst)
+
+        if isinstance(signal, Signal) and isinstance(dst_signal, Signal):
+            signal.connect(dst_signal)
+        else:
+            raise ExpectedSignalType(
+                f"{signal} and {dst_signal} were both expected to be of type Signal so that they could be connected"
+            )
+
+    @timed_pass()
+    def update(self, hwhfile: str) -> HwhChanges:
+        """
+        Brings this model up to date with hwhfile, a new version of the
+        HWH (path or XML string) that the model was parsed from.
+
+        The two HWHs are compared MODULE by MODULE without parsing either
+        of them, and only the MODULEs that were added or changed are parsed.
+        A changed core whose ports and signals are the same is patched in
+        place (parameters, registers and address maps), otherwise it is
+        rebuilt. The connections of the changed cores are remade, those
+        into rebuilt cores are relinked, and only the affected bus
+        connections and address ranges are refreshed. The hierarchies are
+        reallocated only if cores were added, removed or rebuilt.
+
+        The result is the same model that parsing hwhfile would give. If
+        anything outside of the MODULEs changed, e.g. the external ports,
+        the HWH is simply parsed again. Only models built from a single
+        HWH are supported, anything merged into the model (such as the
+        BDCs of an XSA) is lost from cores that are rebuilt. The HWH the
+        model was parsed from is digested by the first update(), if that
+        file has been rewritten since the parse the model is parsed again.
+
+        Returns the changes that were found, see HwhChanges.
+        """
+        digest = HwhDigest(read_hwh_bytes(hwhfile), keep_chunks=True)
+        changes = HwhChanges.between(self._parsed_digest(), digest)
+        if changes.system_changed or self._index is None:
+            self._reparse(hwhfile)
+        elif not changes.empty():
+            self._apply_changes(changes, digest)
+            digest.chunks = {}
+            self._digest = digest
+        self._hwhfile = hwhfile
+        return changes
+
+    def _parsed_digest(self) -> Optional[HwhDigest]:
+        """
+        Returns the digests of the HWH this model was parsed from, taken
+        when first needed so that parsing does not pay for them. None if
+        the HWH file has been rewritten since, as what it held when it was
+        parsed is then unknown, and the model is parsed again by update().
+        """
+        if self._digest is None and self._hwhfile != "":
+            if hwh_stamp(self._hwhfile) == self._hwh_stamp:
+                self._digest = HwhDigest(read_hwh_bytes(self._hwhfile))
+        return self._digest
+
+    def _reparse(self, hwhfile: str) -> None:
+        """Replaces the contents of this model with a fresh parse of hwhfile"""
+        fresh = HwhFrontend(
+            _hwhfile=hwhfile,
+            _streaming=self._streaming,
+            _xml_backend=self._xml_backend,
+            _stats=self._stats,
+        )
+        ext = self._ext
+        # The base MetadataObject fields are held in slots rather than the __dict__
+        for f in fields(fresh):
+            setattr(self, f.name, getattr(fresh, f.name))
+        self.__dict__.update(fresh.__dict__)
+        self._ext = ext
+        for item in (
+            list(self.blocks.values())
+            + list(self.ports.values())
+            + list(self.parameters.values())
+        ):
+            item._parent = self
+        self.touch()
+
+    def _apply_changes(self, changes: HwhChanges, digest: HwhDigest) -> None:
+        """Applies the changed, added and removed MODULEs of digest to the model"""
+        index = self._index
+        updated = changes.changed + changes.added
+
+        # Old cores that are replaced or removed, by identity
+        stale: Dict[int, Block] = {}
+        # (instance, slave bus interface) whose address range may have changed
+        slave_keys: Set[Tuple[str, str]] = set()
+        # External ports connected to by the changed cores before the update
+        old_externals: Dict[str, Set[str]] = {}
+
+        # The MODULE elements being replaced, to patch the element tree with
+        old_elements = {
+            name: index.modules[name]
+            for name in changes.changed + changes.removed
+            if name in index.modules
+        }
+
+        for name in changes.changed + changes.removed:
+            for mems in index.memranges_by_master.get(name, {}).values():
+                slave_keys.update(
+                    (m.get("INSTANCE"), m.get("SLAVEBUSINTERFACE")) for m in mems
+                )
+            old_externals[name] = self._external_destinations(self.blocks[name])
+
+        for name in changes.removed:
+            core = self.blocks.pop(name)
+            self._remove_child(f"{name}[{core.generic_type}]")
+            stale[id(core)] = core
+            index.remove_module(name)
+            self._logical2physical_portmap.pop(name, None)
+            self._physical2logical_portmap.pop(name, None)
+
+        elements = {}
+        for name in updated:
+            elem = self._xml.fromstring(bytes(digest.chunks[name]))
+            elements[name] = elem
+            index.replace_module(elem)
+            self._module_logical2physical_portmap(elem)
+            self._module_physical2logical_portmap(elem)
+
+            candidate = self._build_core(elem)
+            self._populate_core_regmap(candidate, elem)
+            core = self.blocks.get(name)
+            if core is not None and core_structure(core) == core_structure(
+                candidate
+            ):
+                self._patch_core(core, candidate)
+            else:
+                if core is not None:
+                    changes.rebuilt.append(name)
+                    stale[id(core)] = core
+                    del self.blocks[name]
+                    self._remove_child(f"{name}[{core.generic_type}]")
+                self.add(candidate)
+        replaced = set(changes.added + changes.rebuilt + changes.removed)
+
+        index.reorder(list(digest.modules))
+        index.reindex_memranges()
+        blocks = {name: self.blocks[name] for name in digest.modules}
+        blocks.update(self.blocks)
+        self.blocks = blocks
+
+        # Address ranges of subordinate ports, then the managers' address maps
+        slave_keys.update(key for key in index.memranges_by_slave if key[0] in replaced)
+        for name in updated:
+            for mems in index.memranges_by_master[name].values():
+                slave_keys.update(
+                    (m.get("INSTANCE"), m.get("SLAVEBUSINTERFACE")) for m in mems
+                )
+        self._update_subordinate_addressing(slave_keys)
+
+        for name, by_master in index.memranges_by_master.items():
+            if name in elements or any(
+                m.get("INSTANCE") in replaced for mems in by_master.values() for m in mems
+            ):
+                self._update_manager_address_map(self.blocks[name], by_master)
+
+        # Connections made by the updated cores. Connecting overwrites the VLNV
+        # of external ports, so those are restored afterwards unless the set
+        # of cores connecting to them changed, in which case it is inferred again.
+        external_vlnvs = {name: port.vlnv for name, port in self.ports.items()}
+        externals = set()
+        for name in changes.removed + changes.rebuilt:
+            externals.update(old_externals[name])
+        for name in updated:
+            core = self.blocks[name]
+            for port in core.ports.values():
+                for signal in port.signals.values():
+                    signal._connections = None
+                    signal.con_refs = None
+                    signal.touch()
+            for signal, dst_instance, dst_port in self._core_signal_connections(
+                core, elements[name]
+            ):
+                self._connect(signal, dst_instance, dst_port)
+            new_externals = self._external_destinations(core)
+            if name in changes.added or name in changes.rebuilt:
+                externals.update(new_externals)
+            else:
+                externals.update(new_externals ^ old_externals[name])
+
+            if self._streaming:
+                del self._logical2physical_portmap[name]
+                index.discard_module(name)
+
+        for name, vlnv in external_vlnvs.items():
+            if name not in externals:
+                self.ports[name].vlnv = vlnv
+            else:
+                self.ports[name].touch()
+        relinked = {}
+        if stale or externals:
+            relinked = self._relink_connections(stale, externals)
+
+        # Bus connections to or from anything that was touched
+        touched = {id(self.blocks[name]) for name in updated}
+        for key, bus in list(self.busses.items()):
+            if bus._src_port is None or bus._dst_port is None:
+                continue
+            if (
+                id(bus._src_port._parent) in touched
+                or id(bus._src_port._parent) in stale
+                or id(bus._dst_port._parent) in stale
+                or id(bus._src_port) in relinked
+            ):
+                del self.busses[key]
+        for name in updated:
+            for port in self.blocks[name].ports.values():
+                self._populate_port_connections(port)
+        for port in relinked.values():
+            self._populate_port_connections(port)
+
+        if replaced:
+            self._allocate_hierarchies()
+
+        if not self._streaming and self._root is not None:
+            self._update_modules_section(old_elements, changes, list(digest.modules))
+
+    def _update_modules_section(
+        self,
+        old_elements: Dict[str, ElementTree.Element],
+        changes: HwhChanges,
+        order: List[str],
+    ) -> None:
+        """Puts the new MODULE elements into the element tree in place of the old"""
+        for section in self._root:
+            if section.tag == "MODULES":
+                for name in changes.changed:
+                    pos = list(section).index(old_elements[name])
+                    section[pos] = self._index.modules[name]
+                for name in changes.removed:
+                    section.remove(old_elements[name])
+                for name in sorted(changes.added, key=order.index):
+                    section.insert(order.index(name), self._index.modules[name])
+
+    def _patch_core(self, core: Block, candidate: Block) -> None:
+        """
+        Moves the parameters and registers of candidate, a new build of
+        core with the same structure, onto core
+        """
+        self._replace_parameters(core, candidate.parameters)
+        for port in core.ports.values():
+            new_port = candidate.ports[port.name]
+            self._replace_parameters(port, new_port.parameters)
+            if isinstance(port, SubordinatePort):
+                port.set_register_descriptions(new_port._register_descriptions)
+
+    @staticmethod
+    def _replace_parameters(
+        item: MetadataObject, parameters: Dict[str, Parameter]
+    ) -> None:
+        """Replaces all the parameters of a core or port"""
+        for pname in item.parameters:
+            item._remove_child(f"{pname}[parameter]")
+        item.parameters = {}
+        for param in parameters.values():
+            item.add(param)
+
+    def _update_subordinate_addressing(self, keys: Set[Tuple[str, str]]) -> None:
+        """
+        Resets the base address and range of the subordinate ports named by
+        (instance, slave bus interface) keys and applies their MEMRANGEs again
+        """
+        for instance, busif in keys:
+            if instance in self.ports:
+                port = self.ports[instance]
+            elif instance in self.blocks:
+                port = self.blocks[instance].ports.get(busif)
+            else:
+                continue
+            if isinstance(port, SubordinatePort):
+                port.baseaddr = SubordinatePort.baseaddr
+                port.range = SubordinatePort.range
+                port.touch()
+
+        for key in keys:
+            for mem in self._index.memranges_by_slave.get(key, []):
+                self._set_subordinate_addressing(mem)
+
+    def _update_manager_address_map(
+        self, core: Block, by_master: Dict[str, List[ElementTree.Element]]
+    ) -> None:
+        """Rebuilds the address maps of the manager ports of core"""
+        for port in core.ports.values():
+            if isinstance(port, ManagerPort):
+                port.addrmap = {}
+                port._addrmap_obj = {}
+                port.touch()
+        for mems in by_master.values():
+            for mem in mems:
+                self._add_manager_address_map(core, mem)
+
+    def _external_destinations(self, core: Block) -> Set[str]:
+        """Returns the names of the external ports that core connects to"""
+        ret = set()
+        for port in core.ports.values():
+            for signal in port.signals.values():
+                for dst in signal._connections.values():
+                    if dst._parent is not None and dst._parent._parent is self:
+                        ret.add(dst._parent.name)
+        return ret
+
+    def _relink_connections(
+        self, stale: Dict[int, Block], externals: Set[str]
+    ) -> Dict[int, Port]:
+        """
+        Points every connection into a stale core at the signal that replaced
+        it, dropping those with no replacement, and infers the VLNV of the
+        external ports in externals again.
+        Returns the ports that had connections relinked, by identity.
+        """
+        relinked = {}
+        vlnvs = {}
+        for core in self.blocks.values():
+            for port in core.ports.values():
+                for signal in port.signals.values():
+                    for ref, dst in list(signal._connections.items()):
+                        dst_port = dst._parent
+                        if id(dst_port._parent) in stale:
+                            relinked[id(port)] = port
+                            try:
+                                signal._link(ref, self.lookup(ref))
+                            except MetadataObjectNotFound:
+                                signal._remove_con_ref(ref)
+                        elif dst_port._parent is self and port.vlnv is not None:
+                            vlnvs[dst_port.name] = port.vlnv
+
+        for name in externals:
+            if name in self.ports:
+                if name in vlnvs:
+                    self.ports[name].vlnv = vlnvs[name].copy()
+                else:
+                    self.ports[name].vlnv = self._external_port_vlnv(name)
+        return relinked
+
+    def _external_port_vlnv(self, name: str) -> Optional[Vlnv]:
+        """Returns the VLNV an external port has before anything connects to it"""
+        for b_itf in self._index.external_busifs:
+            if b_itf.get("NAME") == name:
+                return external_port_factory(b_itf).vlnv
+        return None
+
+
+def parse_throughput(
+    hwhfile: str,
+    backends: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    streaming: bool = False,
+) -> Dict[str, float]:
+    """
+    Parses hwhfile with each of the XML backends (default: all that are
+    available) and returns the parse throughput of each in MB/s,
+    taking the best of repeat parses.
+    """
+    if os.path.isfile(hwhfile):
+        nbytes = os.path.getsize(hwhfile)
+    else:
+        nbytes = len(hwhfile.encode())
+
+    if backends is None:
+        backends = available_backends()
+
+    ret = {}
+    for backend in backends:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            HwhFrontend(_hwhfile=hwhfile, _xml_backend=backend, _streaming=streaming)
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        ret[backend] = nbytes / best / 1e6
+    return ret
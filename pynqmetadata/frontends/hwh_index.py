@@ -0,0 +1,131 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from .xml_backend import EtreeBackend, get_backend
+
+
+class HwhIndex:
+    """
+    A one-time index over the elements of a HWH file.
+
+    The HwhFrontend passes consult these tables rather than
+    re-iterating the element tree, so that every lookup of a
+    port, bus interface or memory range by name is a dict probe.
+        * modules : MODULE elements by instance name
+        * ports : [instance][port name] -> PORT
+        * busifs : [instance][bus interface name] -> BUSINTERFACE
+        * memranges_by_master : [instance][master bus interface] -> [MEMRANGE]
+        * memranges_by_slave : (instance, slave bus interface) -> [MEMRANGE]
+        * external_ports : [port name] -> EXTERNALPORTS/PORT
+        * external_busifs : every EXTERNALINTERFACES/BUSINTERFACE
+    Where a name appears more than once the first element is indexed.
+    The elements are selected with the XML backend that parsed them,
+    the default selection works for any ElementTree compatible elements.
+    """
+
+    def __init__(
+        self,
+        root: Optional[ElementTree.Element] = None,
+        backend: Optional[EtreeBackend] = None,
+    ) -> None:
+        if backend is None:
+            backend = get_backend(EtreeBackend.name)
+        self.backend = backend
+        self.modules: Dict[str, ElementTree.Element] = {}
+        self.ports: Dict[str, Dict[str, ElementTree.Element]] = {}
+        self.busifs: Dict[str, Dict[str, ElementTree.Element]] = {}
+        self.memranges_by_master: Dict[str, Dict[str, List[ElementTree.Element]]] = {}
+        self.memranges_by_slave: Dict[Tuple[str, str], List[ElementTree.Element]] = {}
+        self.external_ports: Dict[str, ElementTree.Element] = {}
+        self.external_busifs: List[ElementTree.Element] = []
+
+        if root is not None:
+            for section in root:
+                if section.tag == "MODULES":
+                    for module in self.backend.select(section, "MODULE"):
+                        self.add_module(module)
+            self.add_externals(root)
+
+    def add_module(self, module: ElementTree.Element) -> None:
+        """Indexes a single MODULE element"""
+        name = module.get("INSTANCE")
+        self.modules.setdefault(name, module)
+
+        ports = self.ports.setdefault(name, {})
+        busifs = self.busifs.setdefault(name, {})
+        by_master = self.memranges_by_master.setdefault(name, {})
+        for section in module:
+            if section.tag == "PORTS":
+                for p in section.iter("PORT"):
+                    ports.setdefault(p.get("NAME"), p)
+            elif section.tag == "BUSINTERFACES":
+                for b in self.backend.select(section, "BUSINTERFACE"):
+                    busifs.setdefault(b.get("NAME"), b)
+            elif section.tag == "MEMORYMAP":
+                for mem in self.backend.select(section, "MEMRANGE"):
+                    by_master.setdefault(mem.get("MASTERBUSINTERFACE"), []).append(mem)
+                    self.memranges_by_slave.setdefault(
+                        (mem.get("INSTANCE"), mem.get("SLAVEBUSINTERFACE")), []
+                    ).append(mem)
+
+    def discard_module(self, name: str) -> None:
+        """
+        Drops the per-instance element tables for a module that has
+        been consumed, keeping the memory ranges as they are resolved
+        once all the modules are known
+        """
+        self.modules.pop(name, None)
+        self.ports.pop(name, None)
+        self.busifs.pop(name, None)
+
+    def replace_module(self, module: ElementTree.Element) -> None:
+        """
+        Indexes a MODULE element in place of the one with the same instance
+        name, keeping its position. The memory ranges by slave are stale
+        until reindex_memranges() is called.
+        """
+        name = module.get("INSTANCE")
+        if name in self.modules:
+            self.modules[name] = module
+        for table in (self.ports, self.busifs, self.memranges_by_master):
+            if name in table:
+                table[name] = {}
+        self.add_module(module)
+
+    def remove_module(self, name: str) -> None:
+        """
+        Drops every table entry of a module, the memory ranges
+        by slave are stale until reindex_memranges() is called
+        """
+        self.discard_module(name)
+        self.memranges_by_master.pop(name, None)
+
+    def reorder(self, names: List[str]) -> None:
+        """Puts the per-instance tables into the order of names"""
+        for attr in ("modules", "ports", "busifs", "memranges_by_master"):
+            table = getattr(self, attr)
+            setattr(
+                self, attr, {name: table[name] for name in names if name in table}
+            )
+
+    def reindex_memranges(self) -> None:
+        """Rebuilds the memory ranges by slave from those by master"""
+        self.memranges_by_slave = {}
+        for by_master in self.memranges_by_master.values():
+            for mems in by_master.values():
+                for mem in mems:
+                    self.memranges_by_slave.setdefault(
+                        (mem.get("INSTANCE"), mem.get("SLAVEBUSINTERFACE")), []
+                    ).append(mem)
+
+    def add_externals(self, root: ElementTree.Element) -> None:
+        """Indexes the EXTERNALPORTS and EXTERNALINTERFACES sections"""
+        for section in root:
+            if section.tag == "EXTERNALPORTS":
+                for p in section.iter("PORT"):
+                    self.external_ports.setdefault(p.get("NAME"), p)
+            elif section.tag == "EXTERNALINTERFACES":
+                self.external_busifs.extend(self.backend.select(section, "BUSINTERFACE"))
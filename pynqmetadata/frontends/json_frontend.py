@@ -3,11 +3,11 @@
 
 import json
 import os
-from typing import Dict
+from sys import intern
+from typing import Dict, Optional
 
 from pydantic import Field
 
-from ..models.bit_field import BitField
 from ..models.block import Block
 from ..models.dfx_core import DFXCore
 from ..models.ip_core import IPCore
@@ -15,8 +15,9 @@ from ..models.manager_port import ManagerPort
 from ..models.metadata_object import MetadataObject
 from ..models.module import Module
 from ..models.parameter import Parameter
+from ..models.pass_stats import PassStats
 from ..models.port import Port
-from ..models.register import Register
+from ..models.register import BitFieldDescription, RegisterDescription
 from ..models.scalar_port import ScalarPort
 from ..models.signal import Signal
 from ..models.stream_port import StreamPort
@@ -109,25 +110,6 @@ def _port_factory(j: Dict) -> Port:
             baseaddr=j["baseaddr"],
             range=j["range"],
         )
-        for r in j["registers"].values():
-            reg = Register(
-                name=r["name"],
-                description=r["description"],
-                access=r["access"],
-                offset=r["offset"],
-                width=r["width"],
-                enabled=r["enabled"],
-            )
-            for f in r["bitfields"].values():
-                bit = BitField(
-                    name=f["name"],
-                    LSB=f["LSB"],
-                    MSB=f["MSB"],
-                    description=f["description"],
-                    access=f["access"],
-                )
-                reg.add(bit)
-            port.add(reg)
 
     elif t == "port-stream":
         port = StreamPort(
@@ -154,13 +136,39 @@ def _port_factory(j: Dict) -> Port:
     for s in j["signals"].values():
         signal = Signal(
             name=s["name"],
-            con_refs=s["con_refs"],
             width=s["width"],
             driver=s["driver"],
             external=s["external"],
+            con_refs=[intern(c) for c in s["con_refs"]],
         )
         port.add(signal)
 
+    if isinstance(port, SubordinatePort):
+        # The Register objects are only built if the registers are used
+        port.add_register_descriptions(
+            tuple(
+                RegisterDescription(
+                    name=r["name"],
+                    description=r["description"],
+                    offset=r["offset"],
+                    width=r["width"],
+                    access=r["access"],
+                    enabled=r["enabled"],
+                    bitfields=tuple(
+                        BitFieldDescription(
+                            name=f["name"],
+                            description=f["description"],
+                            LSB=f["LSB"],
+                            MSB=f["MSB"],
+                            access=f["access"],
+                        )
+                        for f in r["bitfields"].values()
+                    ),
+                )
+                for r in j["registers"].values()
+            )
+        )
+
     return port
 
 
@@ -176,30 +184,37 @@ def _relink_objects(md: Module) -> None:
 
             for sig in port.signals.values():
                 for con in sig.con_refs:
-                    sig._connections[con] = md.lookup(con)
+                    sig._link(con, md.lookup(con))
 
 
-def _module_factory(j: Dict) -> Module:
-    """From the JSON object describing a module generate the pydantic object model"""
-    md = Module(name=j["name"])
+def _module_factory(j: Dict, stats: Optional[PassStats] = None) -> Module:
+    """
+    From the JSON object describing a module generate the pydantic object model,
+    recording the passes run on it in stats when given
+    """
+    md = Module(name=j["name"], _stats=stats)
 
-    for p in j["ports"].values():
-        md.add(_port_factory(p))
+    with md._measure("populate_cores"):
+        for p in j["ports"].values():
+            md.add(_port_factory(p))
 
-    for b in j["blocks"].values():
-        block = _block_factory(b)
-        for p in b["ports"].values():
-            port = _port_factory(p)
-            block.add(port)
-        md.add(block)
+        for b in j["blocks"].values():
+            block = _block_factory(b)
+            for p in b["ports"].values():
+                port = _port_factory(p)
+                block.add(port)
+            md.add(block)
 
     md._relink_objects()
     md.refresh()
     return md
 
 
-def JsonFrontend(input: str) -> MetadataObject:
-    """Converts a Json file or string into a module"""
+def JsonFrontend(input: str, stats: Optional[PassStats] = None) -> MetadataObject:
+    """
+    Converts a Json file or string into a module. For a module
+    the passes run while building it are recorded in stats when given
+    """
     if os.path.isfile(input):
         jstr = _get_json_str(input)
     else:
@@ -209,7 +224,7 @@ def JsonFrontend(input: str) -> MetadataObject:
     jtype = jdict["type"]
 
     if jtype == "module":
-        return _module_factory(jdict)
+        return _module_factory(jdict, stats=stats)
     if jtype.split("-")[0] == "core":
         return _block_factory(jdict)
     if jtype.split("-")[0] == "port":
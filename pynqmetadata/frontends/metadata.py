@@ -3,6 +3,7 @@
 
 import json
 import os
+import time
 from distutils.command.install_headers import install_headers
 from typing import Optional
 
@@ -11,9 +12,11 @@ from pydantic import Field
 from ..models.metadata_extension import MetadataExtension
 from ..models.metadata_object import MetadataObject
 from ..models.module import Module
+from ..models.pass_stats import PassStats
 from .hwh_frontend import HwhFrontend
 from .json_frontend import JsonFrontend
-from .xsa_frontend import XsaFrontend
+from .parse_cache import CACHE_DIR_ENV, ParseCache
+from .xsa_frontend import XsaFrontend, attach_xsa_parser
 
 
 class ExpectedFileInput(Exception):
@@ -24,7 +27,12 @@ class UnknownInputFileExtension(Exception):
     pass
 
 
-def Metadata(input: str) -> MetadataObject:
+def Metadata(
+    input: str,
+    cache: Optional[ParseCache] = None,
+    parallel: bool = False,
+    stats: bool = False,
+) -> MetadataObject:
     """
     Can accept:
         * An XSA file
@@ -32,16 +40,47 @@ def Metadata(input: str) -> MetadataObject:
         * A JSON file of the metadata
 
         and will produce a metadata module
+
+    When a ParseCache is given as cache, a previously parsed model
+    for the same file contents is loaded from the cache instead of
+    parsing the input again, and newly parsed models are added to it.
+    Setting $PYNQMETADATA_CACHE_DIR enables a cache in that directory
+    for every call that does not pass one.
+
+    For an XSA, parallel parses the HWHs and metadata objects it
+    contains in a pool of processes (see XsaFrontend).
+
+    With stats set, the time spent in each parse and refresh pass
+    is recorded in the PassStats object at md.stats
     """
 
+    if cache is None and os.environ.get(CACHE_DIR_ENV):
+        cache = ParseCache()
+
     if os.path.isfile(input):
+        pass_stats = PassStats() if stats else None
+        if cache is not None:
+            start = time.perf_counter()
+            md = cache.load(input)
+            if md is not None:
+                if str(input).endswith(".xsa"):
+                    attach_xsa_parser(md, input)
+                if pass_stats is not None:
+                    pass_stats.record("cache_load", time.perf_counter() - start)
+                    md.enable_stats(pass_stats)
+                return md
+
         if str(input).endswith(".hwh"):
-            return HwhFrontend(_hwhfile=input)
+            md = HwhFrontend(_hwhfile=input, _stats=pass_stats)
         elif str(input).endswith(".xsa"):
-            return XsaFrontend(input=input) 
+            md = XsaFrontend(input=input, parallel=parallel, stats=pass_stats)
         elif str(input).endswith(".json"):
-            return JsonFrontend(input=input)
+            md = JsonFrontend(input=input, stats=pass_stats)
         else:
             raise UnknownInputFileExtension(f"{input} is not a valid input")
+
+        if cache is not None:
+            cache.store(input, md)
+        return md
     else:
         raise ExpectedFileInput(f"{input} is not a valid path to a file")
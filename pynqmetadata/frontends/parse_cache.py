@@ -0,0 +1,200 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import hashlib
+import os
+import pickle
+import stat
+import sys
+import tempfile
+import warnings
+from typing import Optional
+
+from .. import __version__
+from ..models.module import Module
+from ..models.pass_stats import PassStats
+from .hwh_index import HwhIndex
+from .xml_backend import element_types
+from .xsa_frontend import XsaObjectExtension
+
+CACHE_DIR_ENV = "PYNQMETADATA_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pynqmetadata")
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+_ENTRY_SUFFIX = ".pmdcache"
+_PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+_PARSER_STATE_TYPES = element_types() + (HwhIndex, PassStats)
+
+
+class _ModelPickler(pickle.Pickler):
+    """
+    Pickles a metadata model, dropping the parser state that
+    hangs off it (XML elements, the HWH index and pass stats) along with
+    any XSA parser object, neither of which are part of the model
+    """
+
+    def persistent_id(self, obj: object) -> Optional[str]:
+        if isinstance(obj, _PARSER_STATE_TYPES):
+            return "parser_state"
+        if isinstance(obj, XsaObjectExtension):
+            return "xsa"
+        return None
+
+
+class _ModelUnpickler(pickle.Unpickler):
+    """Loads a model pickled by _ModelPickler, the dropped objects become None"""
+
+    def persistent_load(self, pid: str) -> None:
+        return None
+
+
+def _trusted(st: os.stat_result) -> bool:
+    """
+    Returns True if the file or directory st is owned by the current user
+    and can not be written by anyone else
+    """
+    if not hasattr(os, "getuid"):
+        return True  # No file ownership to check, e.g. on Windows
+    return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+class ParseCache:
+    """
+    A persistent on-disk cache of parsed metadata models.
+
+    Entries are keyed by a hash of the contents of the input file,
+    the pynqmetadata version and the Python version, so an edited
+    input or an upgraded library never hits a stale entry.
+    Each entry holds the fully refreshed model in pickled form.
+
+    The total size of the cache is bounded by max_size bytes. When
+    a new entry takes it over the bound the least recently used
+    entries are evicted. Entries are written to a temporary file
+    and atomically renamed into place, so any number of processes
+    can share the same cache directory.
+
+    The cache directory defaults to $PYNQMETADATA_CACHE_DIR if set,
+    otherwise ~/.cache/pynqmetadata
+
+    Loading an entry unpickles it, which can run arbitrary code, so
+    entries are only trusted if the current user wrote them. The
+    directory is created readable and writable by its owner alone,
+    entries that are owned by another user, or that another user
+    can write to, are treated as misses and never loaded, and models
+    are not stored in a directory that belongs to another user. Any
+    process running as the same user is trusted, so a cache directory
+    should not be shared between users.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        if path is None:
+            path = os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+        self.path = path
+        self.max_size = max_size
+
+    def key(self, input: str) -> str:
+        """Returns the cache key for the file input"""
+        h = hashlib.sha256()
+        h.update(f"pynqmetadata-{__version__}:".encode())
+        h.update(f"python-{sys.version_info[0]}.{sys.version_info[1]}:".encode())
+        h.update(f"{os.path.splitext(input)[1]}:".encode())
+        with open(input, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}{_ENTRY_SUFFIX}")
+
+    def load(self, input: str) -> Optional[Module]:
+        """
+        Returns the cached model for the file input,
+        or None if there is no usable entry for it
+        """
+        entry = self._entry_path(self.key(input))
+        try:
+            with open(entry, "rb") as f:
+                if not _trusted(os.fstat(f.fileno())):
+                    # Not written by us, left alone rather than unpickled
+                    return None
+                md = _ModelUnpickler(f).load()
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Unreadable entry, e.g. written by an incompatible model, drop it
+            self._remove(entry)
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return md
+
+    def store(self, input: str, md: Module) -> None:
+        """
+        Adds the model md to the cache as the parsed form of the file input.
+        Failing to write the cache only issues a warning.
+        """
+        try:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            if not _trusted(os.stat(self.path)):
+                raise PermissionError(
+                    f"{self.path} is not a private directory of the current user"
+                )
+            entry = self._entry_path(self.key(input))
+            fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    _ModelPickler(f, protocol=_PICKLE_PROTOCOL).dump(md)
+                os.replace(tmp, entry)
+            except BaseException:
+                self._remove(tmp)
+                raise
+            self.evict()
+        except (OSError, pickle.PicklingError, RecursionError) as e:
+            warnings.warn(f"Unable to cache the metadata for {input}: {e}")
+
+    def _entries(self):
+        """Returns a list of (last used time, size, path) for all cache entries"""
+        ret = []
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return ret
+        for name in names:
+            if name.endswith(_ENTRY_SUFFIX):
+                path = os.path.join(self.path, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue  # evicted by another process
+                ret.append((st.st_mtime, st.st_size, path))
+        return ret
+
+    def size(self) -> int:
+        """Returns the total size in bytes of the entries in the cache"""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        """Evicts the least recently used entries until the cache fits in max_size"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total = total - size
+
+    def clear(self) -> None:
+        """Removes every entry from the cache"""
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
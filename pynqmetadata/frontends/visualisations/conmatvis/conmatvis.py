@@ -11,7 +11,7 @@ import string
 def VisHierarchyFilter(md:Module, h:Hierarchy)->Module:
     """ when given a hierarchy return a metadata object where 
     for visualisation the hierarchy has been filtered out """
-    ret = md.copy()
+    ret = md.copy(copy_on_write=True)
     for c in ret.busses.values():
         c.ext["vis"]={}
         
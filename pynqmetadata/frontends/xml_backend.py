@@ -0,0 +1,133 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import io
+import os
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from xml.etree import ElementTree
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+
+class UnknownXmlBackend(Exception):
+    pass
+
+
+class EtreeBackend:
+    """
+    XML backend for the HWH frontend using the standard library
+    xml.etree.ElementTree. Always available.
+    """
+
+    name: str = "etree"
+    element_types: Tuple[type, ...] = (ElementTree.Element, ElementTree.ElementTree)
+
+    def __reduce__(self):
+        # Backends are shared, so copies and pickles refer to them by name
+        return (get_backend, (self.name,))
+
+    def parse(self, hwhfile: str) -> object:
+        """Returns the element tree of hwhfile, which is either a path or an XML string"""
+        if os.path.isfile(hwhfile):
+            return ElementTree.parse(hwhfile)
+        return ElementTree.ElementTree(ElementTree.fromstring(hwhfile))
+
+    def iterparse(self, hwhfile: str) -> Iterator[Tuple[str, object]]:
+        """Yields the start and end events of hwhfile, a path or an XML string"""
+        if os.path.isfile(hwhfile):
+            source = hwhfile
+        else:
+            source = io.StringIO(hwhfile)
+        return ElementTree.iterparse(source, events=("start", "end"))
+
+    def fromstring(self, data: bytes) -> object:
+        """Returns the element parsed from a fragment of XML"""
+        return ElementTree.fromstring(data)
+
+    def select(self, elem: object, tag: str) -> Iterable[object]:
+        """Returns elem and all of its descendants with the tag, in document order"""
+        return elem.iter(tag)
+
+
+class LxmlBackend(EtreeBackend):
+    """
+    XML backend for the HWH frontend using lxml. The tags that the frontend
+    selects most often are matched with precompiled XPath expressions.
+    Only available when lxml is installed.
+    """
+
+    name: str = "lxml"
+    compiled_selectors: Tuple[str, ...] = (
+        "MODULE",
+        "BUSINTERFACE",
+        "PORTMAP",
+        "MEMRANGE",
+    )
+
+    def __init__(self) -> None:
+        if lxml_etree is None:
+            raise UnknownXmlBackend("The lxml XML backend needs lxml to be installed")
+        self.element_types = (lxml_etree._Element, lxml_etree._ElementTree)
+        self._selectors = {
+            tag: lxml_etree.XPath(f"descendant-or-self::{tag}")
+            for tag in self.compiled_selectors
+        }
+
+    def parse(self, hwhfile: str) -> object:
+        if os.path.isfile(hwhfile):
+            return lxml_etree.parse(hwhfile)
+        # lxml rejects str input that carries an encoding declaration
+        return lxml_etree.fromstring(hwhfile.encode()).getroottree()
+
+    def iterparse(self, hwhfile: str) -> Iterator[Tuple[str, object]]:
+        if os.path.isfile(hwhfile):
+            source = hwhfile
+        else:
+            source = io.BytesIO(hwhfile.encode())
+        return lxml_etree.iterparse(source, events=("start", "end"))
+
+    def fromstring(self, data: bytes) -> object:
+        return lxml_etree.fromstring(data)
+
+    def select(self, elem: object, tag: str) -> Iterable[object]:
+        if tag in self._selectors:
+            return self._selectors[tag](elem)
+        return elem.iter(tag)
+
+
+_BACKENDS = {EtreeBackend.name: EtreeBackend, LxmlBackend.name: LxmlBackend}
+_instances: Dict[str, EtreeBackend] = {}
+
+
+def available_backends() -> Tuple[str, ...]:
+    """Returns the names of the XML backends that can be used here, fastest first"""
+    if lxml_etree is not None:
+        return (LxmlBackend.name, EtreeBackend.name)
+    return (EtreeBackend.name,)
+
+
+def get_backend(name: Optional[str] = None) -> EtreeBackend:
+    """
+    Returns the XML backend called name, by default the
+    fastest one available (lxml when it is installed)
+    """
+    if name is None:
+        name = available_backends()[0]
+    if name not in _BACKENDS:
+        raise UnknownXmlBackend(
+            f"{name} is not a known XML backend, expected one of {list(_BACKENDS)}"
+        )
+    if name not in _instances:
+        _instances[name] = _BACKENDS[name]()
+    return _instances[name]
+
+
+def element_types() -> Tuple[type, ...]:
+    """Returns the element and tree types of every available backend"""
+    types: Tuple[type, ...] = ()
+    for name in available_backends():
+        types = types + get_backend(name).element_types
+    return types
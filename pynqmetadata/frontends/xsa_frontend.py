@@ -1,11 +1,15 @@
 # Copyright (C) 2022 Xilinx, Inc
 # SPDX-License-Identifier: BSD-3-Clause
 
+import io
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from .hwh_frontend import HwhFrontend
 from .json_frontend import JsonFrontend
 from ..models.metadata_object import MetadataObject
 from ..models.module import Module
-from typing import Optional
+from ..models.pass_stats import PassStats
+from typing import Callable, Optional, Tuple
 from pydantic import Field
 from ..models.metadata_extension import MetadataExtension
 
@@ -13,16 +17,58 @@ class XsaObjectExtension(MetadataExtension):
     """Extends the metadata to include an XSA parser object"""
     xsa: Optional[object] = Field(default=None, exclude=True)
 
-def XsaFrontend(input: str) -> MetadataObject:
-    """ 
-    Convert an XSA into a metadata object. The XSA may contain
-    multiple hwh files / BDC descriptions / or Metadata json files.
-    """
+def _xsa_parser(input: str) -> object:
+    """Returns an XSA parser for input with the BDC metadata loaded"""
     from pynqutils.build_utils import XsaParser
     xsa = XsaParser(input)
     xsa.load_bdc_metadata()
-    md = HwhFrontend(_hwhfile=xsa.defaultHwhPaths[0])
-    md.ext["xsa"] = XsaObjectExtension(xsa=xsa)
+    return xsa
+
+def attach_xsa_parser(md: MetadataObject, input: str) -> None:
+    """Attaches a parser for the XSA input to the extension space of md"""
+    md.ext["xsa"] = XsaObjectExtension(xsa=_xsa_parser(input))
+
+def _parse_bdc(hwh_fp: str) -> Tuple[str, str]:
+    """Parses a BDC HWH, returning the name of the design and its JSON form"""
+    bdc_md = HwhFrontend(_hwhfile=hwh_fp)
+    return bdc_md.name, bdc_md.json()
+
+def _parse_mergeable(merge_obj_file: str) -> MetadataObject:
+    """Parses one of the mergeable metadata objects in an XSA"""
+    if merge_obj_file.endswith(".hwh"):
+        return HwhFrontend(_hwhfile=merge_obj_file)
+    elif merge_obj_file.endswith(".json"):
+        return JsonFrontend(input=merge_obj_file)
+    else:
+        raise RuntimeError(f"{merge_obj_file} is an unknown file format that cannot be parsed")
+
+def _parse_mergeable_pickled(merge_obj_file: str) -> bytes:
+    """
+    Process pool worker for _parse_mergeable, the model is returned
+    pickled without any of the parser state hanging off it
+    """
+    from .parse_cache import _ModelPickler
+    buf = io.BytesIO()
+    _ModelPickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(
+        _parse_mergeable(merge_obj_file)
+    )
+    return buf.getvalue()
+
+def _unpickle_mergeable(data: bytes) -> MetadataObject:
+    from .parse_cache import _ModelUnpickler
+    return _ModelUnpickler(io.BytesIO(data)).load()
+
+def _merge_xsa_objects(
+    md: Module,
+    xsa: object,
+    get_bdc: Callable[[str], Tuple[str, str]],
+    get_mergeable: Callable[[str], MetadataObject],
+) -> None:
+    """
+    Merges the BDC designs and mergeable metadata objects of the XSA into md.
+        * get_bdc : returns the (name, JSON) of the BDC HWH at a path, see _parse_bdc
+        * get_mergeable : returns a fresh model of the mergeable object at a path
+    """
     for b in md.blocks.values():
         if isinstance(b, Module):
             if "bdc" in b.ext:
@@ -30,8 +76,8 @@ def XsaFrontend(input: str) -> MetadataObject:
                 bdc_filename = f"{bd.bd_name}.hwh"
                 for hwh_fp in xsa.referenceHwhPaths:
                     if hwh_fp.endswith(bdc_filename):
-                        bdc_md = HwhFrontend(_hwhfile=hwh_fp)
-                        bdc_md_json = bdc_md.json().replace(bdc_md.name, b.name)
+                        bdc_name, bdc_json = get_bdc(hwh_fp)
+                        bdc_md_json = bdc_json.replace(bdc_name, b.name)
                         mod_bdc_md = JsonFrontend(bdc_md_json)
                         mod_bdc_md.hierarchy_name = b.hierarchy_name
                         b.merge(
@@ -39,23 +85,64 @@ def XsaFrontend(input: str) -> MetadataObject:
                             skip_external=True,
                             inherit_signal_width=True,
                             inherit_addr_info=True,
+                            skip_identical=True,
                         )
                 for merge_obj_file in xsa.mergeableMetadataObjects:
-                    if merge_obj_file.endswith(".hwh"):
-                        merge_obj = HwhFrontend(_hwhfile=merge_obj_file)
-                    elif merge_obj_file.endswith(".json"):
-                        merge_obj = JsonFrontend(input=merge_obj_file)
-                    else:
-                        raise RuntimeError(f"{merge_obj_file} is an unknown file format that cannot be parsed")
+                    merge_obj = get_mergeable(merge_obj_file)
                     name_matches = md.get_dict_of_block_instances_with(
                         merge_obj.name
                     )
                     if len(name_matches) == 1:
                         orig_obj = name_matches[list(name_matches.keys())[0]]
-                        orig_obj.merge(merge_obj, ignore_addr_info=True)
+                        orig_obj.merge(
+                            merge_obj, ignore_addr_info=True, skip_identical=True
+                        )
                     else:
                         raise RuntimeError(
                             f"Aborting more than one object matches name {merge_obj.name} = {name_matches}"
                         )
-                b.refresh()
-    return md
\ No newline at end of file
+                b.refresh(full=False)
+
+def XsaFrontend(
+    input: str,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    stats: Optional[PassStats] = None,
+) -> MetadataObject:
+    """ 
+    Convert an XSA into a metadata object. The XSA may contain
+    multiple hwh files / BDC descriptions / or Metadata json files.
+
+    With parallel set, the BDC HWHs and mergeable metadata objects are
+    parsed in a pool of max_workers processes (default: one per CPU)
+    alongside the default HWH. Every file in the XSA is parsed up front
+    in this mode, whether or not it is merged. Merging remains serial.
+
+    The passes run on the default HWH, and the merges into it, are
+    recorded in stats when given.
+    """
+    xsa = _xsa_parser(input)
+    if not parallel:
+        md = HwhFrontend(_hwhfile=xsa.defaultHwhPaths[0], _stats=stats)
+        md.ext["xsa"] = XsaObjectExtension(xsa=xsa)
+        with md._measure("merge_xsa_objects"):
+            _merge_xsa_objects(md, xsa, _parse_bdc, _parse_mergeable)
+        return md
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        bdcs = {fp: pool.submit(_parse_bdc, fp) for fp in xsa.referenceHwhPaths}
+        mergeables = {
+            fp: pool.submit(_parse_mergeable_pickled, fp)
+            for fp in xsa.mergeableMetadataObjects
+        }
+        md = HwhFrontend(_hwhfile=xsa.defaultHwhPaths[0], _stats=stats)
+        md.ext["xsa"] = XsaObjectExtension(xsa=xsa)
+        with md._measure("merge_xsa_objects"):
+            _merge_xsa_objects(
+                md,
+                xsa,
+                lambda fp: bdcs[fp].result(),
+                # Merging takes objects from the merged model, so unpickle a new one each time
+                lambda fp: _unpickle_mergeable(mergeables[fp].result()),
+            )
+    return md
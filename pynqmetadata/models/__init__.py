@@ -2,22 +2,27 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from .addrmap import AddressMap
+from .address_index import AddressIndex, AddressTarget
 from .bit_field import BitField
 from .block import Block
 from .bus_connection import BusConnection
+from .connectivity_graph import ConnectivityGraph
 from .core import Core
 from .dfx_core import DFXCore
 from .interrupt_signal import InterruptSignal
 from .ip_core import IPCore
 from .manager_port import ManagerPort
 from .metadata_extension import MetadataExtension
+from .metadata_object import MetadataObject, current_generation
 from .microblaze_core import MicroblazeCore
 from .module import Module
 from .parameter import Parameter
+from .pass_stats import PassRecord, PassStats
 from .port import Port
 from .proc_sys_core import ProcSysCore
-from .register import Register
+from .register import BitFieldDescription, Register, RegisterDescription
 from .signal import Signal
+from .signal_store import SignalStore
 from .stream_port import StreamPort
 from .subordinate_port import SubordinatePort
 from .ultrascale_proc_sys_core import UltrascaleProcSysCore
@@ -0,0 +1,229 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .subordinate_port import SubordinatePort
+
+if TYPE_CHECKING:
+    from .metadata_object import MetadataObject
+    from .register import Register
+
+
+class AddressTarget(NamedTuple):
+    """What an address decodes to: the block, its subordinate port and the register, if any"""
+
+    block: MetadataObject
+    port: SubordinatePort
+    register: Optional[Register]
+
+
+def _stale_index() -> None:
+    """Unpickles, and copies, an index as None so that it is built again"""
+    return None
+
+
+def _mapped(port: SubordinatePort) -> bool:
+    """Returns true if port has been given an address, see HwhFrontend"""
+    return port.baseaddr != SubordinatePort.baseaddr
+
+
+@dataclass
+class AddressIndex:
+    """
+    The address regions, base address to base address plus range, of the
+    subordinate ports of a design, sorted by base address. Addresses are
+    resolved to the port whose region holds them with a bisect. The
+    regions are sorted in starts, ends and ports, along with max_ends,
+    the highest end of the regions up to each one, which bounds how far
+    back a region that holds an address can start when regions overlap.
+    Subordinate ports that have not been given an address are left out.
+
+    The index is kept by Module.address_index(), which updates it from
+    the blocks that have been modified since it was last updated, and
+    for the targets of a single manager by ManagerPort.decode_table().
+    Assigning to the baseaddr or range of a port marks it as modified.
+    """
+
+    generation: int = -1
+    starts: List[int] = field(default_factory=lambda: ([]))
+    ends: List[int] = field(default_factory=lambda: ([]))
+    max_ends: List[int] = field(default_factory=lambda: ([]))
+    ports: List[SubordinatePort] = field(default_factory=lambda: ([]))
+    # The region of each port, the subordinate ports of each block and the
+    # blocks of each module, all by id, as of the last update
+    _regions: Dict[int, Tuple[int, int, SubordinatePort]] = field(
+        default_factory=lambda: ({})
+    )
+    _ports_of: Dict[int, Tuple[int, ...]] = field(default_factory=lambda: ({}))
+    _blocks_of: Dict[int, Tuple[MetadataObject, ...]] = field(
+        default_factory=lambda: ({})
+    )
+    # The registers of each port looked up, sorted by offset
+    _registers: Dict[int, Tuple[List[int], List[Register]]] = field(
+        default_factory=lambda: ({})
+    )
+
+    @classmethod
+    def of_ports(
+        cls, ports: Iterable[SubordinatePort], generation: int = -1
+    ) -> AddressIndex:
+        """Builds the index of the regions of ports alone, see ManagerPort.decode_table()"""
+        index = cls(generation=generation)
+        for port in ports:
+            if _mapped(port):
+                index._regions[id(port)] = (
+                    port.baseaddr,
+                    port.baseaddr + port.range,
+                    port,
+                )
+        index._sort()
+        return index
+
+    def update(self, root: MetadataObject, generation: int) -> None:
+        """
+        Updates the index from the blocks below root modified since it was
+        last updated, and records generation as the one it is up to date in
+        """
+        self._update(root)
+        self._sort()
+        self.generation = generation
+
+    def _update(self, obj: MetadataObject) -> None:
+        ports = [p for p in obj.ports.values() if isinstance(p, SubordinatePort)]
+        for key in self._ports_of.get(id(obj), ()):
+            self._regions.pop(key, None)
+            self._registers.pop(key, None)
+        for port in ports:
+            if _mapped(port):
+                self._regions[id(port)] = (
+                    port.baseaddr,
+                    port.baseaddr + port.range,
+                    port,
+                )
+        self._ports_of[id(obj)] = tuple(id(p) for p in ports)
+
+        blocks = getattr(obj, "blocks", None)
+        if blocks is None:
+            return
+        current = tuple(blocks.values())
+        kept = {id(b) for b in current}
+        for block in self._blocks_of.get(id(obj), ()):
+            if id(block) not in kept:
+                self._forget(block)
+        self._blocks_of[id(obj)] = current
+        for block in current:
+            if id(block) not in self._ports_of or block.changed_since(
+                self.generation
+            ):
+                self._update(block)
+
+    def _forget(self, obj: MetadataObject) -> None:
+        """Drops obj, which has been removed, and everything below it"""
+        for key in self._ports_of.pop(id(obj), ()):
+            self._regions.pop(key, None)
+            self._registers.pop(key, None)
+        for block in self._blocks_of.pop(id(obj), ()):
+            self._forget(block)
+
+    def _sort(self) -> None:
+        regions = sorted(self._regions.values(), key=lambda r: (r[0], r[1]))
+        self.starts = [r[0] for r in regions]
+        self.ends = [r[1] for r in regions]
+        self.ports = [r[2] for r in regions]
+        self.max_ends = []
+        highest = None
+        for end in self.ends:
+            highest = end if highest is None or end > highest else highest
+            self.max_ends.append(highest)
+
+    def _holding(self, address: int) -> List[int]:
+        """Returns the positions of the regions that hold address, innermost first"""
+        found = []
+        k = bisect_right(self.starts, address) - 1
+        while k >= 0 and self.max_ends[k] > address:
+            if self.ends[k] > address:
+                found.append(k)
+            k -= 1
+        return found
+
+    def port_at(self, address: int) -> Optional[SubordinatePort]:
+        """Returns the subordinate port whose region holds address, or None"""
+        found = self._holding(address)
+        return self.ports[found[0]] if found else None
+
+    def find(self, address: int) -> Optional[AddressTarget]:
+        """
+        Returns the block, subordinate port and register that address
+        decodes to, or None if no port holds it. The register is None when
+        the address is not that of one of the registers of the port.
+        """
+        port = self.port_at(address)
+        if port is None:
+            return None
+        return AddressTarget(
+            port._parent, port, self._register_at(port, address - port.baseaddr)
+        )
+
+    def _register_at(self, port: SubordinatePort, offset: int) -> Optional[Register]:
+        table = self._registers.get(id(port))
+        if table is None:
+            regs = sorted(port.registers.values(), key=lambda r: r.offset)
+            table = self._registers[id(port)] = ([r.offset for r in regs], regs)
+        offsets, regs = table
+        k = bisect_right(offsets, offset) - 1
+        if k >= 0 and offset < offsets[k] + max(regs[k].width // 8, 1):
+            return regs[k]
+        return None
+
+    def window(self, start: int, end: int) -> List[SubordinatePort]:
+        """Returns the subordinate ports whose regions overlap start to end, end excluded"""
+        found = []
+        k = bisect_right(self.starts, end - 1) - 1
+        while k >= 0 and self.max_ends[k] > start:
+            if self.ends[k] > start:
+                found.append(self.ports[k])
+            k -= 1
+        found.reverse()
+        return found
+
+    def overlaps(self) -> List[Tuple[SubordinatePort, SubordinatePort]]:
+        """Returns every pair of subordinate ports whose regions overlap"""
+        found = []
+        active: List[int] = []
+        for k, start in enumerate(self.starts):
+            active = [a for a in active if self.ends[a] > start]
+            found.extend((self.ports[a], self.ports[k]) for a in active)
+            active.append(k)
+        return found
+
+    def gaps(
+        self, start: Optional[int] = None, end: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Returns the (start, end) of the ranges of addresses that no region
+        holds, end excluded, between start and end, by default the lowest
+        and highest addresses held
+        """
+        if not self.starts:
+            return [] if start is None or end is None else [(start, end)]
+        start = self.starts[0] if start is None else start
+        end = self.max_ends[-1] if end is None else end
+        found = []
+        covered = start
+        for s, e in zip(self.starts, self.ends):
+            if s >= end:
+                break
+            if s > covered:
+                found.append((covered, s))
+            covered = max(covered, e)
+        if covered < end:
+            found.append((covered, end))
+        return found
+
+    def __reduce__(self):
+        return (_stale_index, ())
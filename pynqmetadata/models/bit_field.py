@@ -5,9 +5,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from .metadata_object import MetadataObject
+from .metadata_object import MetadataObject, slotted
 
 
+@slotted
 @dataclass(repr=False)
 class BitField(MetadataObject):
     """
@@ -32,6 +32,7 @@ class Block(MetadataObject):
         inherit_signal_width: bool = False,
         inherit_addr_info: bool = False,
         ignore_addr_info: bool = False,
+        skip_identical: bool = False,
     ) -> None:
         """Base merge for block objects
 
@@ -42,8 +43,11 @@ class Block(MetadataObject):
         * skip_external : skip the merge conflict check on the external port parameter
         * inherit_addr_info : for subordinate ports, get the addressing info from the object being merged, skip the conflict check
         * ignore_addr_info : for subordinate ports don't do any merging of address info
-
+        * skip_identical : skip the block, and the ports within it, if they have the
+        same structural hash as those merged in, see _same_structure()
         """
+        if skip_identical and self._same_structure(a):
+            return
         self._mo_merge(a)
 
         if self.hierarchy_name is not None and a.hierarchy_name is not None:
@@ -56,6 +60,8 @@ class Block(MetadataObject):
 
         for p in a.ports:
             if p in self.ports:
+                if skip_identical and self.ports[p]._same_structure(a.ports[p]):
+                    continue
                 self.ports[p].merge(
                     a.ports[p],
                     skip_external=skip_external,
@@ -64,13 +70,13 @@ class Block(MetadataObject):
                     ignore_addr_info=ignore_addr_info,
                 )
             else:
-                self.ports[p] = a.ports[p]
+                self._add(a.ports[p])
 
         for param in a.parameters:
             if param in self.parameters:
                 self.parameters[param].merge(a.parameters[param])
             else:
-                self.parameters[param] = a.parameters[param]
+                self._add(a.parameters[param])
 
     def merge(
         self,
@@ -79,6 +85,7 @@ class Block(MetadataObject):
         inherit_signal_width: bool = False,
         inherit_addr_info: bool = False,
         ignore_addr_info: bool = False,
+        skip_identical: bool = False,
     ):
         """Basic merge of blocks, overridden in the subclasses
 
@@ -89,6 +96,7 @@ class Block(MetadataObject):
         * skip_external : skip the merge conflict check on the external port parameter
         * inherit_addr_info : for subordinate ports, get the addressing info from the object being merged, skip the conflict check
         * ignore_addr_info : for subordinate ports don't do any merging of address info
+        * skip_identical : skip the parts of the block that are identical, see _block_merge()
 
         """
         self._block_merge(
@@ -97,6 +105,7 @@ class Block(MetadataObject):
             inherit_signal_width=inherit_signal_width,
             inherit_addr_info=inherit_addr_info,
             ignore_addr_info=ignore_addr_info,
+            skip_identical=skip_identical,
         )
 
     def _exists(self, item: MetadataObject) -> bool:
@@ -166,14 +175,16 @@ class Block(MetadataObject):
                 self.ports[p].remove(refresh=False)
 
             if isinstance(self._parent, MetadataObject):
+                self._unindex()
                 del self._parent.blocks[self.name]
+                self._parent.touch()
             else:
                 raise UnexpectedMetadataObjectType(
                     f"Expecting the parent of Core {self.ref} to be of type Module"
                 )
 
             if refresh:
-                self._get_root().refresh()
+                self._get_root().refresh(full=False)
 
     def remove(
         self, item: Optional[MetadataObject] = None, refresh: bool = True
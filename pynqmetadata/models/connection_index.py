@@ -0,0 +1,108 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, List
+
+from .ref_index import _walk
+
+if TYPE_CHECKING:
+    from .metadata_object import MetadataObject
+    from .signal import Signal
+
+# Set once the first index is built, until then connecting signals
+# does not look for an index to keep up to date
+indexing = False
+
+
+def _signals(md: MetadataObject) -> Iterator[Signal]:
+    """Yields the signals of the ports of md and of everything below it"""
+    for block in getattr(md, "blocks", {}).values():
+        yield from _signals(block)
+    for port in md.ports.values():
+        yield from port.signals.values()
+
+
+def _links(src: Signal, dst: Signal) -> bool:
+    """Returns true if src is connected to dst"""
+    return src._connections.get(dst.ref) is dst
+
+
+def _stale_index() -> None:
+    """Unpickles, and copies, an index as None so that it is built again"""
+    return None
+
+
+@dataclass
+class ConnectionIndex:
+    """
+    Finds the signals connected to a signal without searching the
+    design for them. Connections are nearly always made in both
+    directions, so the signals connected to a signal are those it
+    is connected to itself. Only the one way connections, from
+    signals it is not connected to, need to be kept; they are held
+    by the identity of the signal connected to and then of the
+    signal it is connected from.
+    The index is held by the root Module of the tree, see
+    Module._get_connection_index(), and is kept up to date as
+    signals are connected and disconnected.
+    """
+
+    one_way: Dict[int, Dict[int, Signal]] = field(default_factory=lambda: ({}))
+
+    @classmethod
+    def of_tree(cls, root: MetadataObject) -> ConnectionIndex:
+        """Builds the index of the connections of every signal below root"""
+        global indexing
+        indexing = True
+        index = cls()
+        for sig in _signals(root):
+            for dst in sig._connections.values():
+                if dst is not None:
+                    index.linked(sig, dst)
+        return index
+
+    def add_tree(self, obj: MetadataObject) -> None:
+        """Adds the connections of the signals below obj, which moved into the tree"""
+        for o in _walk(obj):
+            if o.generic_type == "signal":
+                for dst in o._connections.values():
+                    if dst is not None:
+                        self.linked(o, dst)
+
+    def linked(self, src: Signal, dst: Signal) -> None:
+        """Records that src has been connected to dst"""
+        if _links(dst, src):
+            self._drop(dst, src)
+            self._drop(src, dst)
+        else:
+            self.one_way.setdefault(id(dst), {})[id(src)] = src
+
+    def unlinked(self, src: Signal, dst: Signal) -> None:
+        """Records that src has been disconnected from dst"""
+        self._drop(dst, src)
+        if _links(dst, src):
+            self.one_way.setdefault(id(src), {})[id(dst)] = dst
+
+    def _drop(self, dst: Signal, src: Signal) -> None:
+        sources = self.one_way.get(id(dst))
+        if sources is not None and sources.pop(id(src), None) is not None:
+            if not sources:
+                del self.one_way[id(dst)]
+
+    def sources(self, sig: Signal) -> List[Signal]:
+        """Returns the signals that are connected to sig"""
+        found = {}
+        for src in sig._connections.values():
+            if src is not None and _links(src, sig):
+                found[id(src)] = src
+        for key, src in self.one_way.get(id(sig), {}).items():
+            # Entries are left behind by signals that were removed
+            if _links(src, sig):
+                found[key] = src
+        return list(found.values())
+
+    def __reduce__(self):
+        return (_stale_index, ())
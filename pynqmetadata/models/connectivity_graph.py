@@ -0,0 +1,308 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .manager_port import ManagerPort
+from .port import Port
+from .stream_port import StreamPort
+from .subordinate_port import SubordinatePort
+
+if TYPE_CHECKING:
+    from .metadata_object import MetadataObject
+    from .signal_store import SignalStore
+
+_Adjacency = Tuple[Tuple[int, ...], ...]
+
+
+def _stale_graph() -> None:
+    """Unpickles, and copies, a graph as None so that it is built again"""
+    return None
+
+
+def _drives_bus(port: Port) -> Optional[bool]:
+    """
+    Returns whether port drives the bus it is on, as seen from inside its
+    module, or None when port is not a bus port. An external port is
+    driven by the port inside its module it is connected to.
+    """
+    if isinstance(port, ManagerPort):
+        drives = True
+    elif isinstance(port, SubordinatePort):
+        drives = False
+    elif isinstance(port, StreamPort):
+        drives = port.driver
+    else:
+        return None
+    return drives != port.external
+
+
+def _adjacency(edges: List[set]) -> _Adjacency:
+    return tuple(tuple(sorted(e)) for e in edges)
+
+
+@dataclass
+class ConnectivityGraph:
+    """
+    The connectivity of a design between its ports, and between its
+    blocks, compiled from its SignalStore. A port is connected to another
+    when one of its signals is connected to a signal of the other, and the
+    edges follow the direction data flows in. Between bus ports this is
+    from the ManagerPort to the SubordinatePort, and from the driving
+    StreamPort to the one it drives, as each side of a bus drives some of
+    its signals. Between other ports it is from the port whose signal
+    drives to the one it drives; connections between signals of the same
+    polarity, such as through external ports, go both ways. A block is
+    connected to another when one of its ports is.
+
+    The queries take either ports, and are answered over the port
+    graph, or blocks, and are answered over the block graph, and their
+    results are kept for as long as the graph. Port queries can also be
+    given a follow function, the paths then continue through the blocks
+    they reach, from each port follow() is true for to the others of its
+    block it is true for. For example, the cores reachable over AXI from
+    a manager port of the PS are found with
+
+        graph.reachable(port, follow=lambda p: isinstance(p, (ManagerPort, SubordinatePort)))
+
+    The graph is that of the design in generation, see Module.connectivity() which compiles it
+    again once the design changes.
+    """
+
+    generation: int = 0
+    ports: List[Port] = field(default_factory=lambda: ([]))
+    blocks: List[MetadataObject] = field(default_factory=lambda: ([]))
+    # Successors and predecessors of each port and block, by their position in ports and blocks
+    port_succ: _Adjacency = ()
+    port_pred: _Adjacency = ()
+    block_succ: _Adjacency = ()
+    block_pred: _Adjacency = ()
+    # The block of each port, by position
+    port_block: Tuple[int, ...] = ()
+    _ids: Dict[int, int] = field(default_factory=lambda: ({}))
+    _results: Dict[tuple, object] = field(default_factory=lambda: ({}))
+
+    @classmethod
+    def of_store(cls, store: SignalStore) -> ConnectivityGraph:
+        """Compiles the graph of the ports, and of their blocks, in store"""
+        graph = cls(generation=store.generation, ports=list(store.ports))
+        block_ids: Dict[int, int] = {}
+        port_block = []
+        for port in graph.ports:
+            block = port._parent
+            if id(block) not in block_ids:
+                block_ids[id(block)] = len(graph.blocks)
+                graph.blocks.append(block)
+            port_block.append(block_ids[id(block)])
+
+        port_succ = [set() for _ in graph.ports]
+        port_pred = [set() for _ in graph.ports]
+        block_succ = [set() for _ in graph.blocks]
+        block_pred = [set() for _ in graph.blocks]
+        bus = [_drives_bus(p) for p in graph.ports]
+        sig_port, driver = store.port, store.driver
+        indptr, indices = store.indptr, store.indices
+        for i in range(len(store.signals)):
+            src = sig_port[i]
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                dst = sig_port[j]
+                if dst == src:
+                    continue
+                if bus[src] is None or bus[dst] is None or bus[src] == bus[dst]:
+                    if driver[j] and not driver[i]:
+                        continue
+                elif not bus[src]:
+                    continue
+                port_succ[src].add(dst)
+                port_pred[dst].add(src)
+                src_block, dst_block = port_block[src], port_block[dst]
+                if src_block != dst_block:
+                    block_succ[src_block].add(dst_block)
+                    block_pred[dst_block].add(src_block)
+        graph.port_succ = _adjacency(port_succ)
+        graph.port_pred = _adjacency(port_pred)
+        graph.block_succ = _adjacency(block_succ)
+        graph.block_pred = _adjacency(block_pred)
+        graph.port_block = tuple(port_block)
+        graph._ids = {id(p): i for i, p in enumerate(graph.ports)}
+        graph._ids.update((id(b), i) for i, b in enumerate(graph.blocks))
+        return graph
+
+    def _level(self, obj: MetadataObject) -> Tuple[List[MetadataObject], int]:
+        """Returns the nodes of the graph obj is in, and its position in them"""
+        nodes = self.ports if isinstance(obj, Port) else self.blocks
+        i = self._ids.get(id(obj))
+        if i is None or nodes[i] is not obj:
+            raise KeyError(f"{obj.ref} is not in the connectivity graph")
+        return nodes, i
+
+    def _edges(
+        self,
+        obj: MetadataObject,
+        directed: bool,
+        follow: Optional[Callable[[Port], bool]] = None,
+    ):
+        """Returns the successors of each node of the graph obj is in"""
+        if isinstance(obj, Port):
+            succ, pred = self.port_succ, self.port_pred
+        else:
+            succ, pred = self.block_succ, self.block_pred
+        if not directed:
+            succ = self._cached(
+                ("undirected", succ is self.port_succ),
+                lambda: tuple(s + p for s, p in zip(succ, pred)),
+            )
+        if follow is None:
+            return succ
+        if not isinstance(obj, Port):
+            raise TypeError("follow can only be given for queries on ports")
+        followed = [follow(p) for p in self.ports]
+        siblings: Dict[int, List[int]] = {}
+        for n, block in enumerate(self.port_block):
+            if followed[n]:
+                siblings.setdefault(block, []).append(n)
+        return tuple(
+            succ[n] + tuple(m for m in siblings[self.port_block[n]] if m != n)
+            if followed[n]
+            else succ[n]
+            for n in range(len(self.ports))
+        )
+
+    def _cached(self, key: Optional[tuple], compute):
+        if key is None:
+            # Queries given a follow function are not kept
+            return compute()
+        ret = self._results.get(key)
+        if ret is None:
+            ret = self._results[key] = compute()
+        return ret
+
+    def fan_out(self, obj: MetadataObject) -> List[MetadataObject]:
+        """Returns the ports, or blocks, obj drives"""
+        nodes, i = self._level(obj)
+        succ = self.port_succ if nodes is self.ports else self.block_succ
+        return [nodes[j] for j in succ[i]]
+
+    def fan_in(self, obj: MetadataObject) -> List[MetadataObject]:
+        """Returns the ports, or blocks, that drive obj"""
+        nodes, i = self._level(obj)
+        pred = self.port_pred if nodes is self.ports else self.block_pred
+        return [nodes[j] for j in pred[i]]
+
+    def reachable(
+        self,
+        start: MetadataObject,
+        directed: bool = True,
+        depth_first: bool = False,
+        follow: Optional[Callable[[Port], bool]] = None,
+    ) -> List[MetadataObject]:
+        """
+        Returns the ports, or blocks, that can be reached from start, in
+        the order a breadth first search, or a depth first search if
+        depth_first is set, reaches them. Unless directed is set
+        connections are followed in both directions.
+        """
+        nodes, i = self._level(start)
+
+        def search() -> List[MetadataObject]:
+            edges = self._edges(start, directed, follow)
+            order = []
+            if depth_first:
+                seen = set()
+                pending = [i]
+                while pending:
+                    n = pending.pop()
+                    if n in seen:
+                        continue
+                    seen.add(n)
+                    order.append(n)
+                    pending.extend(m for m in reversed(edges[n]) if m not in seen)
+            else:
+                seen = {i}
+                pending = deque([i])
+                while pending:
+                    n = pending.popleft()
+                    order.append(n)
+                    for m in edges[n]:
+                        if m not in seen:
+                            seen.add(m)
+                            pending.append(m)
+            del order[0]
+            return [nodes[n] for n in order]
+
+        key = ("reachable", i, nodes is self.ports, directed, depth_first)
+        return list(self._cached(key if follow is None else None, search))
+
+    def shortest_path(
+        self,
+        src: MetadataObject,
+        dst: MetadataObject,
+        directed: bool = True,
+        follow: Optional[Callable[[Port], bool]] = None,
+    ) -> Optional[List[MetadataObject]]:
+        """
+        Returns the ports, or blocks, on the shortest path from src to dst,
+        both included, or None if dst cannot be reached from src
+        """
+        nodes, i = self._level(src)
+        dst_nodes, j = self._level(dst)
+        if dst_nodes is not nodes:
+            raise TypeError("src and dst need to both be ports or both be blocks")
+
+        def search() -> Tuple[int, ...]:
+            edges = self._edges(src, directed, follow)
+            previous = {i: i}
+            pending = deque([i])
+            while pending and j not in previous:
+                n = pending.popleft()
+                for m in edges[n]:
+                    if m not in previous:
+                        previous[m] = n
+                        pending.append(m)
+            if j not in previous:
+                return ()
+            path = [j]
+            while path[-1] != i:
+                path.append(previous[path[-1]])
+            return tuple(reversed(path))
+
+        key = ("path", i, j, nodes is self.ports, directed)
+        path = self._cached(key if follow is None else None, search)
+        return [nodes[n] for n in path] if path else None
+
+    def components(self, ports: bool = False) -> List[List[MetadataObject]]:
+        """
+        Returns the groups of blocks, or of ports if ports is set, that
+        are connected to each other in either direction, the largest first
+        """
+        nodes = self.ports if ports else self.blocks
+
+        def search() -> Tuple[Tuple[int, ...], ...]:
+            edges = self._edges(nodes[0], False) if nodes else ()
+            component = [-1] * len(nodes)
+            found = []
+            for start in range(len(nodes)):
+                if component[start] != -1:
+                    continue
+                component[start] = len(found)
+                members = [start]
+                pending = [start]
+                while pending:
+                    for m in edges[pending.pop()]:
+                        if component[m] == -1:
+                            component[m] = len(found)
+                            members.append(m)
+                            pending.append(m)
+                found.append(tuple(sorted(members)))
+            return tuple(sorted(found, key=len, reverse=True))
+
+        found = self._cached(("components", ports), search)
+        return [[nodes[n] for n in members] for members in found]
+
+    def __reduce__(self):
+        return (_stale_graph, ())
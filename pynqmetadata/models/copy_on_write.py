@@ -0,0 +1,299 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import copy
+from enum import Enum
+from types import MemberDescriptorType
+from typing import Dict, List, Set, Tuple
+
+from pydantic import BaseModel
+
+from .connection_index import ConnectionIndex
+from .metadata_object import MetadataObject, _Clock
+from .ref_index import RefIndex
+from .vlnv import Vlnv
+
+_IMMUTABLE = frozenset([str, int, float, bool, bytes, type(None)])
+
+# Shared by the copies rather than copied: the ref cache is valid in both
+_SHARED = frozenset(["_ref_valid"])
+
+_MISSING = object()
+
+_slot_names: Dict[type, Tuple[str, ...]] = {}
+_deferrable: Dict[Tuple[type, str], bool] = {}
+_pending_classes: Dict[type, type] = {}
+
+
+def _immutable(value: object) -> bool:
+    return type(value) in _IMMUTABLE or isinstance(value, Enum)
+
+
+def _slots(cls: type) -> Tuple[str, ...]:
+    names = _slot_names.get(cls)
+    if names is None:
+        names = tuple(
+            name
+            for klass in reversed(cls.__mro__)
+            for name in klass.__dict__.get("__slots__", ())
+        )
+        _slot_names[cls] = names
+    return names
+
+
+def _is_deferrable(cls: type, name: str) -> bool:
+    """
+    Returns true if the attribute can be left unset on a copy, which it
+    can unless a class attribute of the same name would then be read
+    """
+    key = (cls, name)
+    ret = _deferrable.get(key)
+    if ret is None:
+        default = getattr(cls, name, _MISSING)
+        ret = _deferrable[key] = default is _MISSING or isinstance(
+            default, MemberDescriptorType
+        )
+    return ret
+
+
+def _getattr(self: MetadataObject, name: str) -> object:
+    # Only called for attributes that are not set, which copy on write
+    # copies leave unset until they are first used
+    pending = self.__dict__.get("_cow")
+    if pending is None or name not in pending.names:
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    return pending.materialize(self, name)
+
+
+def _reduce_ex(self: MetadataObject, protocol: int) -> object:
+    # Pickles and deepcopies are taken of the complete object, as its class
+    pending = self.__dict__.get("_cow")
+    if pending is not None:
+        pending.complete(self)
+    return object.__reduce_ex__(self, protocol)
+
+
+def _pending_class(cls: type) -> type:
+    """
+    Returns the subclass of cls the copies of objects of class cls are made
+    as, which copies their unset attributes when they are first read. A
+    copy is given its class once all of them have been.
+    """
+    pending = _pending_classes.get(cls)
+    if pending is None:
+        pending = _pending_classes[cls] = type(cls)(
+            cls.__name__,
+            (cls,),
+            {
+                "__slots__": (),
+                "__getattr__": _getattr,
+                "__reduce_ex__": _reduce_ex,
+                "__module__": cls.__module__,
+                "__qualname__": cls.__qualname__,
+            },
+        )
+    return pending
+
+
+class _Pending:
+    """The attributes of a copy that are still to be copied from the record of its source"""
+
+    __slots__ = ("cls", "record", "copier", "names")
+
+    def __init__(
+        self,
+        cls: type,
+        record: Dict[str, object],
+        copier: "CopyOnWrite",
+        names: Set[str],
+    ):
+        self.cls = cls
+        self.record = record
+        self.copier = copier
+        self.names = names
+
+    def materialize(self, obj: MetadataObject, name: str) -> object:
+        """Copies the attribute name from the record to obj, and returns it"""
+        value = self.copier.copied(self.record[name])
+        object.__setattr__(obj, name, value)
+        self._done(obj, name)
+        return value
+
+    def complete(self, obj: MetadataObject) -> None:
+        """Copies every attribute of obj that has not been set since it was made"""
+        for name in list(self.names):
+            try:
+                object.__getattribute__(obj, name)
+            except AttributeError:
+                self.materialize(obj, name)
+            else:
+                self._done(obj, name)
+
+    def _done(self, obj: MetadataObject, name: str) -> None:
+        self.names.discard(name)
+        if not self.names:
+            # Fully copied, the record is no longer needed
+            del obj.__dict__["_cow"]
+            obj.__class__ = self.cls
+
+
+class CopyOnWrite:
+    """
+    Makes a copy on write copy of a tree of MetadataObjects, see
+    MetadataObject.copy(). The state of every object in the tree, its
+    plain values and shallow copies of its containers and extensions, is
+    recorded when the copy is taken, so that changes made to the tree
+    afterwards are not seen by the copy. Each object is only made from
+    its record when it is first reached from the copy, through its parent
+    or a link such as a connection. Its plain values are set straight
+    away, but the containers of Blocks, Ports and the other objects that
+    have a __dict__ are left unset and copied when first read, by the
+    __getattr__() of the class they are made as, see _pending_class().
+    The slotted objects, such as Signals, are copied in full.
+
+        * source : an object of the tree to copy
+    """
+
+    def __init__(self, source: MetadataObject):
+        # The class and state of every object of the tree, by its id
+        self.records: Dict[int, Tuple[MetadataObject, type, Dict[str, object]]] = {}
+        # Every object copied, by the id of the object it is a copy of
+        self.copies: Dict[int, Tuple[MetadataObject, MetadataObject]] = {}
+        self._unfilled: List[Tuple[MetadataObject, MetadataObject]] = []
+        self._filling = False
+        self._record_tree(source)
+
+    def copied(self, value: object) -> object:
+        """Returns the copy of value"""
+        value = self._value(value)
+        if not self._filling:
+            self._filling = True
+            try:
+                # Filled in a loop, connections between signals chain for as long as a net
+                while self._unfilled:
+                    self._fill(*self._unfilled.pop())
+            finally:
+                self._filling = False
+        return value
+
+    def _record_tree(self, source: MetadataObject) -> None:
+        found = [source]
+        while found:
+            obj = found.pop()
+            if id(obj) not in self.records:
+                self.records[id(obj)] = self._record(obj, found)
+
+    def _record(
+        self, obj: MetadataObject, found: List[MetadataObject]
+    ) -> Tuple[MetadataObject, type, Dict[str, object]]:
+        """Records the state of obj, adding the objects it refers to to found"""
+        attrs = getattr(obj, "__dict__", None)
+        if attrs is not None and "_cow" in attrs:
+            # A copy of a copy, the source has to be complete first
+            attrs["_cow"].complete(obj)
+        cls = type(obj)
+        dropped = getattr(cls, "_parser_state", ())
+        items = [(name, getattr(obj, name, _MISSING)) for name in _slots(cls)]
+        if attrs is not None:
+            items.extend(attrs.items())
+        record = {}
+        for name, value in items:
+            if value is _MISSING:
+                continue
+            if name in _SHARED:
+                if value.__class__ is _Clock:
+                    # The copy of a root is given a clock of its own
+                    value = value.copy()
+            elif name in dropped:
+                value = None
+            elif value.__class__ not in _IMMUTABLE:
+                value = self._snapshot(value, found)
+            record[name] = value
+        return (obj, cls, record)
+
+    def _snapshot(self, value: object, found: List[MetadataObject]) -> object:
+        """Returns value with its containers copied, the objects in it are kept"""
+        if _immutable(value):
+            return value
+        if isinstance(value, MetadataObject):
+            found.append(value)
+            return value
+        cls = type(value)
+        if cls is dict:
+            snapshot = self._snapshot
+            return {
+                k: v if v.__class__ in _IMMUTABLE else snapshot(v, found)
+                for k, v in value.items()
+            }
+        if cls is list:
+            return [self._snapshot(v, found) for v in value]
+        if cls in (set, frozenset):
+            return cls(self._snapshot(v, found) for v in value)
+        if isinstance(value, tuple):
+            items = [self._snapshot(v, found) for v in value]
+            if all(a is b for a, b in zip(items, value)):
+                # Nothing in it to copy, such as the descriptions of lazy registers
+                return value
+            if cls is tuple:
+                return tuple(items)
+        elif isinstance(value, (Vlnv, BaseModel)):
+            # Extensions are copied, but what they hold, such as driver objects, is shared
+            return value.copy()
+        elif isinstance(value, (RefIndex, ConnectionIndex)):
+            # Rebuilt by the copy when it needs one
+            return None
+        return copy.deepcopy(value)
+
+    def _value(self, value: object) -> object:
+        """Returns the recorded value with the objects in it replaced by their copies"""
+        if _immutable(value):
+            return value
+        if isinstance(value, MetadataObject):
+            return self._resolve(value)
+        cls = type(value)
+        if cls is dict:
+            return {k: self._value(v) for k, v in value.items()}
+        if cls is list:
+            return [self._value(v) for v in value]
+        if cls in (set, frozenset):
+            return cls(self._value(v) for v in value)
+        if cls is tuple:
+            items = [self._value(v) for v in value]
+            if all(a is b for a, b in zip(items, value)):
+                return value
+            return tuple(items)
+        # Anything else was copied when it was recorded
+        return value
+
+    def _resolve(self, obj: MetadataObject) -> MetadataObject:
+        """Returns the copy of obj, making it if obj has not been reached yet"""
+        entry = self.copies.get(id(obj))
+        if entry is not None:
+            return entry[1]
+        _, cls, record = self.records[id(obj)]
+        parent = record.get("_parent")
+        new_parent = None if parent is None else self._resolve(parent)
+        new = object.__new__(_pending_class(cls) if cls.__dictoffset__ else cls)
+        object.__setattr__(new, "_parent", new_parent)
+        self.copies[id(obj)] = (obj, new)
+        self._unfilled.append((obj, new))
+        return new
+
+    def _fill(self, source: MetadataObject, new: MetadataObject) -> None:
+        """Sets the attributes of new from the record of source, leaving the containers unset if it can"""
+        _, cls, record = self.records[id(source)]
+        lazy = bool(cls.__dictoffset__)
+        deferred = set()
+        for name, value in record.items():
+            if name == "_parent":
+                continue
+            if name in _SHARED or _immutable(value):
+                object.__setattr__(new, name, value)
+            elif lazy and _is_deferrable(cls, name):
+                deferred.add(name)
+            else:
+                object.__setattr__(new, name, self._value(value))
+        if deferred:
+            new.__dict__["_cow"] = _Pending(cls, record, self, deferred)
+        elif lazy:
+            new.__class__ = cls
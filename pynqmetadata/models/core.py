@@ -36,6 +36,7 @@ class Core(Block):
         inherit_signal_width: bool = False,
         inherit_addr_info: bool = False,
         ignore_addr_info: bool = False,
+        skip_identical: bool = False,
     ) -> None:
         """Base merge operation"""
         self._block_merge(
@@ -44,8 +45,9 @@ class Core(Block):
             inherit_signal_width=inherit_signal_width,
             inherit_addr_info=inherit_addr_info,
             ignore_addr_info=ignore_addr_info,
+            skip_identical=skip_identical,
         )
-        if self.vlnv.dict() != a.vlnv.dict():
+        if self.vlnv != a.vlnv:
             raise MergeConflict(f"{self.vlnv=} confilcts with {a.vlnv=}")
 
     def merge(
@@ -55,6 +57,7 @@ class Core(Block):
         inherit_signal_width: bool = False,
         inherit_addr_info: bool = False,
         ignore_addr_info: bool = False,
+        skip_identical: bool = False,
     ) -> None:
         """Overloaded in the specialised class"""
         self._merge(
@@ -63,4 +66,5 @@ class Core(Block):
             inherit_signal_width=inherit_signal_width,
             inherit_addr_info=inherit_addr_info,
             ignore_addr_info=ignore_addr_info,
+            skip_identical=skip_identical,
         )
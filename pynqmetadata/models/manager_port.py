@@ -4,12 +4,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from pydantic import Field
 
 from ..errors import AddressMapAlreadyExists, AddrMapNotFound, MergeConflict
+from .address_index import AddressIndex, AddressTarget
 from .addrmap import AddressMap
+from .metadata_object import current_generation
 from .port import Port
 from .subordinate_port import SubordinatePort
 
@@ -25,6 +27,8 @@ class ManagerPort(Port):
     # addrmap: Dict[str, AddressMap] = {}
     _addrmap_obj: Dict[str, SubordinatePort] = field(default_factory=lambda: ({}))
     addrmap: Dict[str, Dict[str, str]] = field(default_factory=lambda: ({}))
+    # The address regions of the targets of the addrmap, see decode_table()
+    _decode_table: Optional[AddressIndex] = None
 
     def merge(
         self,
@@ -39,14 +43,49 @@ class ManagerPort(Port):
         self._merge(
             a, skip_external=skip_external, inherit_signal_width=inherit_signal_width
         )
-        for i, adr in self.addrmap.items():
-            if adr in self.addrmap:
-                if a.addrmap[adr] != self.addrmap[adr]:
+        for ref, adr in a.addrmap.items():
+            if ref in self.addrmap:
+                if adr != self.addrmap[ref]:
                     raise MergeConflict(
-                        f"{a.addrmap[adr]=} conflicts with {self.addrmap[adr]=}"
+                        f"{a.addrmap[ref]=} conflicts with {self.addrmap[ref]=}"
                     )
             else:
-                self.addrmap[i] = adr
+                self.addrmap[ref] = adr
+                if ref in a._addrmap_obj:
+                    self._addrmap_obj[ref] = a._addrmap_obj[ref]
+
+    def decode_table(self) -> AddressIndex:
+        """
+        Returns the address regions of the subordinate ports in the address
+        map of this manager, sorted by base address, see AddressIndex. It
+        is built when first asked for, and again once this manager or one
+        of its targets has been modified since, such as the baseaddr or
+        range of a target being assigned. Changes elsewhere in the design
+        keep it.
+        """
+        table = self._decode_table
+        if table is None or self._targets_changed_since(table.generation):
+            table = AddressIndex.of_ports(
+                self._addrmap_obj.values(), current_generation(self)
+            )
+            self._decode_table = table
+        return table
+
+    def _targets_changed_since(self, generation: int) -> bool:
+        if self.changed_since(generation):
+            return True
+        return any(p.changed_since(generation) for p in self._addrmap_obj.values())
+
+    def decode(self, address: int) -> Optional[AddressTarget]:
+        """
+        Returns the block, subordinate port and register address decodes
+        to as seen from this manager, or None if none of its targets hold it
+        """
+        return self.decode_table().find(address)
+
+    def targets(self, start: int, end: int) -> List[SubordinatePort]:
+        """Returns the subordinate ports of this manager whose regions overlap start to end, end excluded"""
+        return self.decode_table().window(start, end)
 
     def addrmap_exists(self, subord_port: SubordinatePort) -> bool:
         """returns true if a SubordinatePort exists in the address map for this manager"""
@@ -57,6 +96,7 @@ class ManagerPort(Port):
         if self.addrmap_exists(subord_port):
             del self._addrmap_obj[subord_port.ref]
             del self.addrmap[subord_port.ref]
+            self.touch()
         else:
             raise AddrMapNotFound(
                 f"Could not find an address map from manager {self.ref} to subordinate {subord_port.ref}"
@@ -72,6 +112,7 @@ class ManagerPort(Port):
             self.addrmap[subord_port.ref]["block"] = block
             self.addrmap[subord_port.ref]["memtype"] = memtype
             self.addrmap[subord_port.ref]["subord_port"] = subord_port.ref
+            self.touch()
         else:
             raise AddressMapAlreadyExists(
                 f"{subord_port.ref} is already an address target of manager {self.ref}"
@@ -5,50 +5,420 @@ from __future__ import annotations
 
 import copy
 import json
-from dataclasses import dataclass, field, fields
-from datetime import datetime
-from typing import Dict, List, Optional, Set
+from dataclasses import MISSING, dataclass, field, fields
+from enum import Enum
+from hashlib import blake2b
+from sys import intern
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from pydantic import BaseModel
 
 from ..errors import MergeConflict, MetadataObjectNotFound
 from .metadata_extension import MetadataExtension
+from . import connection_index
+from .connection_index import ConnectionIndex
+from .ref_index import RefIndex, _walk
 from .vlnv import Vlnv
 
 
+# Returned for the containers of an object that have not been allocated yet
+EMPTY_MAPPING = MappingProxyType({})
+
+class _Clock:
+    """
+    The generation changes to a tree of objects are made in, and the epoch
+    of the refs cached in it, kept by the object at the root of the tree.
+    The generation only advances once it has been read, so the changes
+    made between two reads share one. The epoch is replaced whenever an
+    object in the tree that has children is renamed or moved, the refs
+    cached before then are checked against their parents when next used.
+    """
+
+    __slots__ = ("generation", "read", "epoch")
+
+    def __init__(self, generation: int = 0, epoch: Optional[object] = None) -> None:
+        self.generation = generation
+        self.read = False
+        self.epoch = object() if epoch is None else epoch
+
+    def current(self) -> int:
+        self.read = True
+        return self.generation
+
+    def advance(self) -> int:
+        if self.read:
+            self.generation += 1
+            self.read = False
+        return self.generation
+
+    def catch_up(self, other: _Clock) -> None:
+        """Advances past the generation of other, such as that of a tree merged into this one"""
+        if other is not self and other.generation >= self.generation:
+            self.generation = other.generation + 1
+            self.read = False
+
+    def invalidate_refs(self) -> None:
+        self.epoch = object()
+
+    def copy(self) -> _Clock:
+        """A clock for a copy of the tree, in which the refs cached so far stay valid"""
+        return _Clock(self.generation, self.epoch)
+
+
+def current_generation(obj: MetadataObject) -> int:
+    """
+    Returns the current generation of the tree obj is in, changes made
+    to it after this have a later one
+    """
+    return obj._clock().current()
+
+
+# The fields each class of object is hashed over, see _hashed_fields()
+_hashed: Dict[type, Tuple[Tuple[str, Optional[Callable]], ...]] = {}
+
+
+def _hashed_fields(cls: type) -> Tuple[Tuple[str, Optional[Callable]], ...]:
+    """
+    Returns the fields the structural hash of objects of class cls is
+    taken over, those rendered by dict() other than the ref, with the
+    empty value of the lazily allocated ones read from their private field
+    """
+    ret = _hashed.get(cls)
+    if ret is None:
+        ret = []
+        for f in fields(cls):
+            if not f.name.startswith("_"):
+                ret.append((f.name, None))
+            elif f.name in cls._lazy_fields and f.name != "_ref":
+                name, empty = cls._lazy_fields[f.name]
+                ret.append((f.name, empty) if empty is not None else (name, None))
+        ret = _hashed[cls] = tuple(ret)
+    return ret
+
+
+def _canonical(value: object) -> object:
+    """
+    Returns value in a form whose repr is the same for equal values, with
+    the objects in it replaced by their structural hash
+    """
+    if isinstance(value, MetadataObject):
+        return value.structural_hash
+    if isinstance(value, dict):
+        try:
+            items = sorted(value.items())
+        except TypeError:
+            items = sorted(value.items(), key=lambda kv: repr(kv[0]))
+        return tuple((k, _canonical(v)) for k, v in items)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(repr(_canonical(v)) for v in value)
+    if isinstance(value, Vlnv):
+        return (value.vendor, value.library, value.name, _canonical(value.version))
+    if isinstance(value, BaseModel):
+        return _canonical(value.dict())
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+# The classes objects are constructed as, with the names of the properties
+# that can be given to the constructor, see _ModelType
+_constructing: Dict[type, Tuple[type, FrozenSet[str]]] = {}
+
+# Public attributes whose assignment is not a modification of the model
+_UNTRACKED = frozenset(["ref"])
+
+
+class _ModelType(type):
+    """
+    The metaclass of MetadataObject. An object is constructed as an
+    instance of a subclass of its class that assigns its attributes
+    directly, and is only given its class once __init__() has returned,
+    so that the assignments made while constructing it do not pay for
+    the MetadataObject.__setattr__() that records modifications.
+
+    The lazily allocated fields are not parameters of the dataclass
+    __init__(), they are given to the constructor under their public
+    names (ref, ext, con_refs) and assigned through their properties.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        entry = _constructing.get(cls)
+        if entry is None:
+            constructing = type(cls)(
+                cls.__name__,
+                (cls,),
+                {
+                    "__slots__": (),
+                    "__setattr__": object.__setattr__,
+                    "__module__": cls.__module__,
+                    "__qualname__": cls.__qualname__,
+                },
+            )
+            properties = frozenset(name for name, _ in cls._lazy_fields.values())
+            entry = _constructing[cls] = (constructing, properties)
+        constructing, properties = entry
+        obj = object.__new__(constructing)
+        if kwargs and not properties.isdisjoint(kwargs):
+            given = {name: kwargs.pop(name) for name in properties if name in kwargs}
+            obj.__init__(*args, **kwargs)
+            for name, value in given.items():
+                setattr(obj, name, value)
+        else:
+            obj.__init__(*args, **kwargs)
+        obj.__class__ = cls
+        return obj
+
+
+def slotted(cls: type) -> type:
+    """
+    Recreates the dataclass cls with a __slots__ entry for each of its
+    fields, so that its instances do not carry a __dict__. This is what
+    dataclass(slots=True) does from Python 3.10. Every base class of cls
+    needs to be slotted for its instances to have no __dict__.
+    """
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    inherited = set()
+    for base in cls.__mro__[1:-1]:
+        inherited.update(base.__dict__.get("__slots__", ()))
+    cls_dict["__slots__"] = tuple(n for n in field_names if n not in inherited)
+    for name in field_names:
+        # Defaults live in the generated __init__, class attributes would hide the slots
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+@slotted
 @dataclass(repr=False)
-class MetadataObject:
+class MetadataObject(metaclass=_ModelType):
     """
     Base metadata object
+
+    The _children and ext containers are only allocated when
+    something is first added to them, most objects never have either.
+    The ref is computed when it is first used, see ref.
+
+    Assigning to a public field of an object touch()es it, see
+    __setattr__(). Changes made to its containers directly, rather than
+    through add() and remove(), are not seen until it is touch()ed.
     """
 
     name: str = ""
     type: str = ""
     generic_type: str = ""
     _parent: Optional[MetadataObject] = None
-    _children: Dict[str, MetadataObject] = field(default_factory=lambda: ({}))
-    ref: str = ""
-    ext: Dict[str, MetadataExtension] = field(default_factory=lambda: ({}))
-    _timestamp: float = 0.0
-
-    def walk_up_tree_timestamp_update(self, timestamp: float) -> None:
-        """Recursively walk up the tree until you can't anymore
-        applying the new timestamp"""
-        if self._parent == None:
-            return
-        else:
-            self._parent._timestamp = timestamp
-            self._parent.walk_up_tree_timestamp_update(timestamp=timestamp)
+    _children: Optional[Dict[str, MetadataObject]] = None
+    _ref: Optional[str] = None
+    # The epoch of the clock the ref was cached in, and for the object at
+    # the root of a tree the _Clock of the tree, see _clock()
+    _ref_valid: Optional[object] = field(default=None, compare=False)
+    _ext: Optional[Dict[str, MetadataExtension]] = field(default=None, compare=False)
+    _modified: int = 0
+    _subtree_modified: int = 0
+
+    # Lazily allocated private fields rendered by dict() under their public
+    # name, with the empty value to render if they have not been allocated
+    # (None when the public property is always rendered)
+    _lazy_fields = {"_ref": ("ref", None), "_ext": ("ext", dict)}
+
+    def __init_subclass__(cls) -> None:
+        # Keeps __eq__ from being generated by the dataclass decorator of subclasses
+        if "__eq__" not in cls.__dict__:
+            cls.__eq__ = MetadataObject.__eq__
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """
+        Sets an attribute, touch()ing the object when it is a public field,
+        so that the generations, the structural hash, and everything kept
+        until the model changes see the assignment. The assignments made
+        while the object is constructed are not modifications, see _ModelType.
+        """
+        object.__setattr__(self, name, value)
+        if name[0] != "_" and name not in _UNTRACKED:
+            self.touch()
+
+    def __setstate__(self, state: object) -> None:
+        """Restores a pickled or copied object, which is not a modification of it"""
+        attrs, slots = state if isinstance(state, tuple) else (state, None)
+        if attrs:
+            self.__dict__.update(attrs)
+        if slots:
+            for name, value in slots.items():
+                object.__setattr__(self, name, value)
+
+    @property
+    def ref(self) -> str:
+        """
+        The ref of this object, name[generic_type] appended to the ref of
+        its parent, or the name of the object if it has no parent. It is
+        cached until this object, or one of those above it, is renamed or
+        moved to a new parent.
+        """
+        ref = self._ref
+        parent = self._parent
+        if parent is None:
+            return self.name if ref is None else ref
+        epoch = self._clock().epoch
+        if ref is not None and self._ref_valid is epoch:
+            return ref
+        new = f"{parent.ref}:{self.name}[{self.generic_type}]"
+        if new != ref:
+            # Interned so the copies of the ref held in con_refs and addrmaps share it
+            ref = intern(new)
+            _set_ref(self, ref)
+        _set_ref_valid(self, epoch)
+        return ref
+
+    @ref.setter
+    def ref(self, value: str) -> None:
+        clock = self._clock()
+        if self._children and value != self.ref:
+            clock.invalidate_refs()
+        self._ref = value
+        if self._parent is not None:
+            self._ref_valid = clock.epoch
+
+    def _invalidate_ref(self) -> None:
+        """Recomputes the ref of this object, and those below it, when next used"""
+        _set_ref(self, None)
+        if self._children:
+            self._clock().invalidate_refs()
+
+    def _clock(self) -> _Clock:
+        """
+        Returns the clock of the tree this object is in, kept by the object
+        at its root, so that the generations and refs of one model are
+        independent of those of any other
+        """
+        root = self
+        while root._parent is not None:
+            root = root._parent
+        clock = root._ref_valid
+        if clock.__class__ is not _Clock:
+            clock = _Clock()
+            _set_ref_valid(root, clock)
+        return clock
+
+    @property
+    def ext(self) -> Dict[str, MetadataExtension]:
+        """The extension space of this object, allocated on first access"""
+        if self._ext is None:
+            self._ext = {}
+        return self._ext
+
+    @ext.setter
+    def ext(self, value: Dict[str, MetadataExtension]) -> None:
+        self._ext = value
+
+    @property
+    def modified(self) -> int:
+        """The generation this object was created or last modified in"""
+        return self._modified
+
+    def changed_since(self, generation: int) -> bool:
+        """
+        Returns True if this object, or anything below it, has been
+        modified after generation, as returned by current_generation()
+        for the tree it is in
+        """
+        return self._subtree_modified > generation
+
+    @property
+    def structural_hash(self) -> bytes:
+        """
+        A hash of the public fields of this object and of the structural
+        hashes of the objects below it, the same for any two objects that
+        would render the same dict(), ignoring their refs and the order
+        of their containers. Objects that have a __dict__ keep it, along
+        with the generation it was taken in, until they or something
+        below them are modified, so the hash of a whole design is only
+        taken over the parts of it that changed since it was last taken.
+        """
+        attrs = getattr(self, "__dict__", None)
+        if attrs is None:
+            return self._structural_hash()
+        cached = attrs.get("_structure_hash")
+        if cached is not None and self._subtree_modified <= cached[0]:
+            return cached[1]
+        generation = current_generation(self)
+        digest = self._structural_hash()
+        attrs["_structure_hash"] = (generation, digest)
+        return digest
+
+    @property
+    def fingerprint(self) -> str:
+        """The structural hash of this object as a hex string, for use as a cache key"""
+        return self.structural_hash.hex()
+
+    def _structural_hash(self) -> bytes:
+        """Takes the structural hash of this object, see structural_hash"""
+        values = []
+        for name, empty in _hashed_fields(type(self)):
+            value = self._hashed_value(name)
+            if value is None and empty is not None:
+                value = empty()
+            values.append(_canonical(value))
+        return blake2b(repr(values).encode(), digest_size=16).digest()
+
+    @classmethod
+    def _described_hash(cls, **values: object) -> bytes:
+        """
+        Returns the structural hash an object of this class would have,
+        with the fields in values and the defaults for the others, without
+        creating it. The objects below it can be given by their hash.
+        """
+        defaults = {
+            f.name: f.default_factory() if f.default is MISSING else f.default
+            for f in fields(cls)
+            if f.name not in values
+            and (f.default is not MISSING or f.default_factory is not MISSING)
+        }
+        hashed = []
+        for name, empty in _hashed_fields(cls):
+            value = values[name] if name in values else defaults.get(name)
+            if value is None and empty is not None:
+                value = empty()
+            hashed.append(_canonical(value))
+        return blake2b(repr(hashed).encode(), digest_size=16).digest()
+
+    def _hashed_value(self, name: str) -> object:
+        """Returns the value of the field name to hash, subclasses can override"""
+        return getattr(self, name)
+
+    def touch(self) -> None:
+        """
+        Marks this object as modified in the current generation of its
+        tree, and everything above it as having a modification below it.
+        The walk up stops at the first object already marked in this
+        generation, so repeated changes between two reads of the
+        generation only walk up as far as the root to find its clock.
+        """
+        generation = self._clock().advance()
+        _set_modified(self, generation)
+        obj = self
+        while obj is not None and obj._subtree_modified != generation:
+            _set_subtree_modified(obj, generation)
+            obj = obj._parent
 
     def __post_init__(self) -> None:
         """
         Add to the pydantic model constructor to preassign a reference for the object
         """
-        self.ref = self.name
-        self._timestamp = datetime.timestamp(datetime.now())
+        # Names recur across the design (every AXI port has a BVALID signal),
+        # interning them lets equal names share one string object
+        if isinstance(self.name, str):
+            self.name = intern(self.name)
 
     def _mo_merge(self, a: MetadataObject) -> None:
         """Merges the base metadata object attributes. Raises an error if there are any conflicts"""
+        self.touch()
         if self.name != a.name:
             raise MergeConflict(f"{self.name=} does not match {a.name=}")
         if self.type != a.type:
@@ -58,11 +428,13 @@ class MetadataObject:
                 f"{self.generic_type=} does not match {a.generic_type=}"
             )
 
-        for a_ext in a.ext.keys():
+        if not a._ext:
+            return
+        for a_ext in a._ext.keys():
             if a_ext not in self.ext.keys():
                 self.ext[a_ext] = a.ext[a_ext]
             else:
-                if self.ext[a_ext].dict() != a.ext[a_ext].dict():
+                if self.ext[a_ext] != a.ext[a_ext]:
                     raise MergeConflict(
                         f"Extension space object {a_ext} is not equivalent for both objects"
                     )
@@ -71,6 +443,13 @@ class MetadataObject:
         """Default case is just to call the _mo_merge method"""
         self._mo_merge(a)
 
+    def _same_structure(self, a: MetadataObject) -> bool:
+        """
+        Returns true if a has the same structural hash as this object, in
+        which case merging it in would change nothing and can be skipped.
+        """
+        return a is self or self.structural_hash == a.structural_hash
+
     def _lookup(self, ref_levels: List[str]) -> Optional[MetadataObject]:
         """
         helper used for recursively looking down the object
@@ -79,24 +458,27 @@ class MetadataObject:
         """
         if ref_levels[0] == self.name:
             ref_levels.pop(0)
+        children = self._children
+        if children is None:
+            return None
         if len(ref_levels) == 1:
-            if ref_levels[0] in self._children:
-                return self._children[ref_levels[0]]
-            elif ref_levels[0].upper() in self._children:
-                return self._children[ref_levels[0].upper()]
-            elif ref_levels[0].lower() in self._children:
-                return self._children[ref_levels[0].lower()]
+            if ref_levels[0] in children:
+                return children[ref_levels[0]]
+            elif ref_levels[0].upper() in children:
+                return children[ref_levels[0].upper()]
+            elif ref_levels[0].lower() in children:
+                return children[ref_levels[0].lower()]
             else:
                 return None
         else:
             current = ref_levels[0]
             del ref_levels[0]
-            if current in self._children:
-                return self._children[current]._lookup(ref_levels)
-            elif current.upper() in self._children:
-                return self._children[current.upper()]._lookup(ref_levels)
-            elif current.lower() in self._children:
-                return self._children[current.lower()]._lookup(ref_levels)
+            if current in children:
+                return children[current]._lookup(ref_levels)
+            elif current.upper() in children:
+                return children[current.upper()]._lookup(ref_levels)
+            elif current.lower() in children:
+                return children[current.lower()]._lookup(ref_levels)
             else:
                 return None
 
@@ -138,24 +520,52 @@ class MetadataObject:
                     ret[field.name] = self._obj_dict(obj=atr)
                 else:
                     ret[field.name] = atr
+            elif field.name in self._lazy_fields:
+                name, empty = self._lazy_fields[field.name]
+                atr = getattr(self, field.name if empty is not None else name)
+                ret[name] = empty() if atr is None else self._obj_dict(obj=atr)
         return ret
 
-    def copy(self):
-        """Returns a deepcopy of the object"""
-        return copy.deepcopy(self)
+    def copy(self, copy_on_write: bool = False):
+        """
+        Returns a deepcopy of the object
+
+        With copy_on_write set, the state of the objects is recorded, but
+        the objects of the copy are only made as they are reached from it,
+        and their containers as they are first read, see CopyOnWrite. The
+        parts of the design a copy never uses are never made, which makes
+        deriving variants of a large design to annotate cheap. Changes made
+        to this object afterwards are not seen by the copy.
+        """
+        if not copy_on_write:
+            return copy.deepcopy(self)
+        from .copy_on_write import CopyOnWrite
+
+        return CopyOnWrite(self).copied(self)
 
     def __eq__(self, a: object) -> bool:
-        """Returns true if the non-private member fields are equal, false otherwise"""
+        """
+        Returns true if the non-private member fields are equal, false
+        otherwise. Objects that keep their structural hash are compared by
+        it, which only has to be taken again over the parts of either that
+        were modified since it was last taken, the others field by field.
+        """
+        if a is self:
+            return True
         if not isinstance(a, MetadataObject):
             return False
-
-        for field in fields(self):
-            if not field.name.startswith("_"):
-                if field.name not in fields(a):
-                    return False
-                else:
-                    if getattr(self, field.name) != getattr(a, field.name):
-                        return False
+        names = _hashed_fields(type(self))
+        if names != _hashed_fields(type(a)):
+            return False
+        if hasattr(self, "__dict__") and hasattr(a, "__dict__"):
+            return self.structural_hash == a.structural_hash
+        for name, empty in names:
+            value, other = getattr(self, name), getattr(a, name)
+            if empty is not None:
+                value = empty() if value is None else value
+                other = empty() if other is None else other
+            if value != other:
+                return False
         return True
 
     def __ne__(self, a: object) -> bool:
@@ -177,26 +587,40 @@ class MetadataObject:
         if there is anything matching the input ref
         WARNING: lookups are case insensitive
         """
+        index = self._tree_root()._get_ref_index(build=True)
+        if index is not None:
+            obj = index.find(self, ref)
+            if obj is not None:
+                return obj
+        # Objects not in the index, such as registers that are only described, are found by walking
         ref_levels = ref.split(":")
         obj = self._lookup(ref_levels)
         if isinstance(obj, MetadataObject):
             return obj
         else:
             raise MetadataObjectNotFound(
-                f"{ref} cannot be found in {self.ref} children={self._children.keys()}"
+                f"{ref} cannot be found in {self.ref} children={self.children().keys()}"
             )
 
     def _child_exists(self, item: MetadataObject) -> bool:
         """
         returns True if a child exists False otherwise
         """
-        return f"{item.name}[{item.type}]" in self._children
+        return f"{item.name}[{item.type}]" in self.children()
+
+    def children(self) -> Dict[str, MetadataObject]:
+        """Returns the children of this object, keyed by name[generic_type]"""
+        if self._children is None:
+            return EMPTY_MAPPING
+        return self._children
 
     def _add_child(self, item: MetadataObject) -> None:
         """
         Adds a child to this metadata object
         """
-        self._children[f"{item.name}[{item.generic_type}]"] = item
+        if self._children is None:
+            _set_children(self, {})
+        self._children[intern(f"{item.name}[{item.generic_type}]")] = item
         # if not self._child_exists(item):
         #    self._children[f"{item.name}[{item.generic_type}]"] = item
         # else:
@@ -204,27 +628,115 @@ class MetadataObject:
         #    f"{item.ref}[{item.generic_type}] type={type(item)} is already a child of {self.ref} type={type(self)} children={self._children.keys()}"
         # )
 
+    def _remove_child(self, key: str) -> None:
+        """Removes the child with the key name[generic_type], if there is one"""
+        if self._children is not None:
+            child = self._children.pop(key, None)
+            if child is not None:
+                child._unindex()
+                self.touch()
+
+    def _tree_root(self) -> MetadataObject:
+        """Returns the object at the top of the tree this object is in"""
+        obj = self
+        while obj._parent is not None:
+            obj = obj._parent
+        return obj
+
+    def _get_ref_index(self, build: bool = False) -> Optional[RefIndex]:
+        """
+        Returns the ref index of the tree this object is the root of.
+        Only a root Module keeps an index, see Module._get_ref_index()
+        """
+        return None
+
+    def _get_connection_index(self, build: bool = False) -> Optional[ConnectionIndex]:
+        """
+        Returns the connection index of the tree this object is the root of.
+        Only a root Module keeps an index, see Module._get_connection_index()
+        """
+        return None
+
+    def _unindex(self) -> None:
+        """Removes this object, and everything below it, from the ref index of its tree"""
+        index = self._tree_root()._get_ref_index()
+        if index is not None:
+            index.discard_tree(self)
+
     def parent(self) -> Optional[MetadataObject]:
         """
         Returns a reference to the parent of this object
         """
         return self._parent
 
-    def _refresh_child_refs(self, parent_ref: str) -> None:
-        """Whenever the parent changes we needs to walk down through all the children
-        recursively and update the refs"""
-        for _, child in self._children.items():
-            child.ref = f"{parent_ref}:{child.name}[{child.generic_type}]"
-            child._refresh_child_refs(child.ref)
-
     def set_parent(self, parent: MetadataObject) -> None:
         """
         Sets the parent of this object
         """
-        self._parent = parent
-        self.ref = f"{self._parent.ref}:{self.name}[{self.generic_type}]"
-        self._refresh_child_refs(self.ref)
-        self._parent._add_child(self)
+        if parent is self._parent:
+            return
+        if self._parent is not None:
+            # It is no longer found at its ref in the tree it was in
+            self._unindex()
+            self._parent.touch()
+            moved_from = self._parent._clock()
+        else:
+            moved_from = self._ref_valid
+        _set_parent(self, parent)
+        self._invalidate_ref()
+        parent._add_child(self)
+        if moved_from.__class__ is _Clock:
+            # The generations it was modified in stay ordered before those of its new tree
+            self._clock().catch_up(moved_from)
+        parent.touch()
+        self.touch()
+        root = parent._tree_root()
+        index = root._get_ref_index()
+        if index is not None:
+            index.add_tree(self)
+        if connection_index.indexing:
+            connections = root._get_connection_index()
+            if connections is not None:
+                connections.add_tree(self)
+
+    def rename(self, name: str) -> None:
+        """
+        Renames this object. It is rekeyed in its parent, the refs of it
+        and everything below it are updated, along with the connections
+        and address maps in the design that refer to them.
+        """
+        parent = self._parent
+        old_name = self.name
+        old_refs = {id(o): o.ref for o in _walk(self)}
+        if parent is not None:
+            parent._remove_child(f"{old_name}[{self.generic_type}]")
+            for f in fields(parent):
+                container = getattr(parent, f.name)
+                if isinstance(container, dict) and container.get(old_name) is self:
+                    # Rebuilt in place so the order of the siblings is kept
+                    items = list(container.items())
+                    container.clear()
+                    for k, v in items:
+                        container[name if v is self else k] = v
+        self.name = intern(name)
+        # The index of a renamed root is rebuilt, as every ref in it changes
+        self._invalidate_ref()
+        self.touch()
+        if parent is not None:
+            parent._add_child(self)
+            index = parent._tree_root()._get_ref_index()
+            if index is not None:
+                index.add_tree(self)
+
+        renamed = {old_refs[id(o)]: o.ref for o in _walk(self)}
+        self._tree_root()._retarget_refs(renamed)
+
+    def _retarget_refs(self, renamed: Dict[str, str]) -> None:
+        """
+        Replaces the old refs in renamed with their new ones wherever
+        they are referred to below this object, see Module
+        """
+        pass
 
     def _default_repr(self, obj: object):
         return repr(obj)
@@ -232,3 +744,13 @@ class MetadataObject:
     def _repr_json_(self) -> str:
         """For pretty printing the objects to the jupyter repr"""
         return json.loads(json.dumps(self.dict(), default=self._default_repr))
+
+
+# The private fields written on the hot paths of building and walking a
+# model, set through their slots rather than through __setattr__()
+_set_parent = MetadataObject._parent.__set__
+_set_children = MetadataObject._children.__set__
+_set_ref = MetadataObject._ref.__set__
+_set_ref_valid = MetadataObject._ref_valid.__set__
+_set_modified = MetadataObject._modified.__set__
+_set_subtree_modified = MetadataObject._subtree_modified.__set__
@@ -1,22 +1,29 @@
 # Copyright (C) 2022 Xilinx, Inc
 # SPDX-License-Identifier: BSD-3-Clause
 
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
 from re import L
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from pynqmetadata.errors.metadata_type_errors import UnexpectedMetadataObjectType
 
 from ..errors import CoreAlreadyExists, UnexpectedPmdObject
+from .address_index import AddressIndex
 from .block import Block
 from .bus_connection import BusConnection
+from .connection_index import ConnectionIndex
+from .connectivity_graph import ConnectivityGraph
 from .core import Core
 from .hierarchy import Hierarchy
 from .manager_port import ManagerPort
-from .metadata_object import MetadataObject
+from .metadata_object import MetadataObject, current_generation
 from .parameter import Parameter
+from .pass_stats import PassStats, timed_pass
 from .port import Port
 from .proc_sys_core import ProcSysCore
+from .ref_index import RefIndex
+from .signal_store import SignalStore
 
 
 @dataclass(repr=False)
@@ -32,6 +39,31 @@ class Module(Block):
     busses: Dict[str, BusConnection] = field(default_factory=lambda: ({}))
     _hierarchies: Optional[Hierarchy] = None
 
+    # Timings of the passes run on this module, only collected when set
+    _stats: Optional[PassStats] = None
+
+    # Refs of everything in the design, built by the first lookup on the root module
+    _ref_index: Optional[RefIndex] = None
+
+    # One way signal connections, built by the first signal removed from the root module
+    _connection_index: Optional[ConnectionIndex] = None
+
+    # Columnar snapshot of the signals, built by signal_store()
+    _signal_store: Optional[SignalStore] = None
+
+    # Port and block connectivity, compiled by connectivity() from the signal store
+    _connectivity: Optional[ConnectivityGraph] = None
+
+    # Address regions of the subordinate ports, kept up to date by address_index()
+    _address_index: Optional[AddressIndex] = None
+
+    # The generation of the last refresh, the changes made since are refreshed incrementally
+    _refreshed: Optional[int] = None
+
+    # Depth of the batch() contexts, and the refresh deferred to the end of them
+    _batching: int = 0
+    _deferred_refresh: Optional[bool] = None
+
     def merge(
         self,
         a: Block,
@@ -39,31 +71,51 @@ class Module(Block):
         inherit_signal_width: bool = False,
         inherit_addr_info: bool = False,
         ignore_addr_info: bool = False,
+        skip_identical: bool = False,
     ) -> None:
+        """
+        Merges the module a into this one, see Block.merge(). With
+        skip_identical set the blocks and modules that have the same
+        structural hash as those in a are skipped, which is only safe for
+        models that have not been assigned to directly since they were
+        built, as the hashes cached on them do not see such changes.
+        """
         assert isinstance(a, Module)
+        if skip_identical and self._same_structure(a):
+            return
         self._block_merge(
             a,
             skip_external=skip_external,
             inherit_signal_width=inherit_signal_width,
             inherit_addr_info=inherit_addr_info,
             ignore_addr_info=ignore_addr_info,
+            skip_identical=skip_identical,
         )
 
         for block in a.blocks:
             if block in self.blocks:
+                if skip_identical and self.blocks[block]._same_structure(
+                    a.blocks[block]
+                ):
+                    continue
                 self.blocks[block].merge(
                     a.blocks[block],
                     skip_external=skip_external,
                     inherit_signal_width=inherit_signal_width,
                     inherit_addr_info=inherit_addr_info,
                     ignore_addr_info=ignore_addr_info,
+                    skip_identical=skip_identical,
                 )
             else:
-                self.blocks[block] = a.blocks[block]
+                self.add(a.blocks[block])
 
         for mod in a.modules:
             if mod in self.modules:
-                self.modules[mod].merge(a.modules[mod])
+                if not (
+                    skip_identical
+                    and self.modules[mod]._same_structure(a.modules[mod])
+                ):
+                    self.modules[mod].merge(a.modules[mod])
             else:
                 self.modules[mod] = a.modules[mod]
 
@@ -95,13 +147,208 @@ class Module(Block):
                 f"unable to add {item} to {self.name} as it is not a external port or a core"
             )
 
-    def refresh(self) -> None:
+    def _get_ref_index(self, build: bool = False) -> Optional[RefIndex]:
+        """
+        Returns the index of the refs of everything in this module, built
+        if it does not exist yet and build is set. Only the root module of a
+        design has an index, it is dropped when the module is renamed or
+        gets a parent.
+        """
+        index = self._ref_index
+        if index is not None and index.root_ref != self.ref:
+            index = self._ref_index = None
+        if index is None and build and self._parent is None:
+            index = self._ref_index = RefIndex.of_tree(self)
+        return index
+
+    @contextmanager
+    def batch(self) -> Iterator["Module"]:
+        """
+        Defers the refreshes of this module requested within the context,
+        such as by removing blocks, ports and signals from it, to a single
+        refresh at the end of it.
+
+            with md.batch():
+                for name in unused:
+                    md.blocks[name].remove()
+        """
+        self._batching += 1
+        try:
+            yield self
+        finally:
+            self._batching -= 1
+        if not self._batching and self._deferred_refresh is not None:
+            full, self._deferred_refresh = self._deferred_refresh, None
+            self.refresh(full=full)
+
+    def remove_many(
+        self, items: Iterable[MetadataObject], refresh: bool = True
+    ) -> None:
+        """
+        Removes the blocks, ports and signals in items from the design,
+        refreshing this module once at the end rather than after each of
+        them. Those below another of the items are removed along with it.
+        """
+        items = list(items)
+        ids = {id(item) for item in items}
+        with self.batch():
+            for item in items:
+                obj = item._parent
+                while obj is not None and id(obj) not in ids:
+                    obj = obj._parent
+                if obj is None:
+                    item.remove(refresh=False)
+            if refresh:
+                self.refresh(full=False)
+
+    def _get_connection_index(self, build: bool = False) -> Optional[ConnectionIndex]:
+        """
+        Returns the index of the signal connections in this module, built
+        if it does not exist yet and build is set. Only the root module of a
+        design has an index, it is dropped when the module gets a parent.
+        """
+        index = self._connection_index
+        if index is None and build and self._parent is None:
+            index = self._connection_index = ConnectionIndex.of_tree(self)
+        return index
+
+    def signal_store(self) -> SignalStore:
+        """
+        Returns the ports and signals of this module, and those below it,
+        held column by column for analyses over all of them at once, see
+        SignalStore. It is built when first asked for and again once
+        anything in the module has been modified. As with refresh(),
+        changes made to the containers of an object directly are only
+        seen once the object is touch()ed.
+        """
+        store = self._signal_store
+        if store is None or self.changed_since(store.generation):
+            generation = current_generation(self)
+            with self._measure("signal_store"):
+                store = SignalStore.of_tree(self, generation)
+            self._signal_store = store
+        return store
+
+    def connectivity(self) -> ConnectivityGraph:
+        """
+        Returns the graph of the connections between the ports, and
+        between the blocks, of this module and of those below it, for
+        reachability, path and fan in and out queries, see
+        ConnectivityGraph. It is compiled when first asked for and again
+        once anything in the module has been modified, along with the
+        signal store it is compiled from.
+        """
+        store = self.signal_store()
+        graph = self._connectivity
+        if graph is None or graph.generation != store.generation:
+            with self._measure("connectivity"):
+                graph = ConnectivityGraph.of_store(store)
+            self._connectivity = graph
+        return graph
+
+    def address_index(self) -> AddressIndex:
+        """
+        Returns the index of the address regions of the subordinate ports
+        of this module, and of those below it, that resolves an address to
+        the block, port and register it decodes to and finds the regions
+        in a window, their overlaps and the gaps between them, see
+        AddressIndex. It is built when first asked for, and afterwards
+        updated from only the blocks modified since.
+        """
+        index = self._address_index
+        if index is None:
+            index = self._address_index = AddressIndex()
+        if index.generation < 0 or self.changed_since(index.generation):
+            with self._measure("address_index"):
+                index.update(self, current_generation(self))
+        return index
+
+    def set_parent(self, parent: MetadataObject) -> None:
+        """Sets the parent of this module, whose objects are then indexed by the new root"""
+        self._ref_index = None
+        self._connection_index = None
+        super().set_parent(parent)
+
+    def _retarget_refs(self, renamed: Dict[str, str]) -> None:
+        """
+        Replaces the old refs in renamed with their new ones in the
+        signal connections and address maps of this module
+        """
+        for block in self.blocks.values():
+            if isinstance(block, Module):
+                block._retarget_refs(renamed)
+            else:
+                for port in block.ports.values():
+                    self._retarget_port_refs(port, renamed)
+        for port in self.ports.values():
+            self._retarget_port_refs(port, renamed)
+
+    def _retarget_port_refs(self, port: Port, renamed: Dict[str, str]) -> None:
+        if isinstance(port, ManagerPort):
+            for addr in port.addrmap.values():
+                if addr.get("subord_port") in renamed:
+                    addr["subord_port"] = renamed[addr["subord_port"]]
+        for sig in port.signals.values():
+            if not any(c in renamed for c in sig.con_refs):
+                continue
+            sig._connections = {
+                renamed.get(c, c): s for c, s in sig._connections.items()
+            }
+            sig.touch()
+
+    @property
+    def generation(self) -> int:
+        """
+        The current generation of the model, changes made from now on have
+        a later one. changed_since() tells whether anything below an object
+        has been modified after it.
+        """
+        return current_generation(self)
+
+    @property
+    def stats(self) -> Optional[PassStats]:
+        """The timings of the passes run on this module, None unless enabled"""
+        return self._stats
+
+    def enable_stats(self, stats: Optional[PassStats] = None) -> PassStats:
+        """
+        Starts recording the wall time, call count and object count of the
+        passes run on this module (and of the runtime views built from it)
+        into stats, or into a new PassStats, which is returned
+        """
+        if stats is None:
+            stats = PassStats() if self._stats is None else self._stats
+        self._stats = stats
+        return stats
+
+    def disable_stats(self) -> None:
+        self._stats = None
+
+    def _measure(self, name: str):
+        """Records the code run within the context as the pass name, if stats are enabled"""
+        if self._stats is None:
+            return nullcontext()
+        return self._stats.measure(name)
+
+    @timed_pass(objects=lambda md: len(md.blocks))
+    def refresh(self, full: bool = True) -> None:
         """
         Refreshes the design:
             * populates all the connections
             * performs well-formdness checks on the design
             * populates the hierarchy mappings
+
+        With full cleared only the blocks and ports modified since the last
+        refresh are refreshed, see _refresh_changed(). That is what removing
+        blocks, ports and signals does, as their methods record what they
+        modify, as does assigning to the fields of an object. Changes made
+        to the containers of an object directly are not recorded, and are
+        only picked up by a full refresh unless the object is touch()ed.
+        Within batch() the refresh is deferred to the end of the batch.
         """
+        if self._batching:
+            self._deferred_refresh = full or bool(self._deferred_refresh)
+            return
         if self.parent is None:
             self.ref = self.name
         else:
@@ -112,25 +359,117 @@ class Module(Block):
             #        f"Parent of {self.name} is of type {type(self.parent)}"
             #    )
 
-        self._update_parents()
-        self._relink_objects()
-        self._populate_connections()
-        self._allocate_hierarchies()
+        if full or self._refreshed is None:
+            self._update_parents()
+            self._relink_objects()
+            self._populate_connections()
+            self._allocate_hierarchies()
+        else:
+            self._refresh_changed(self._refreshed)
+        self._refreshed = current_generation(self)
+
+    @timed_pass(objects=lambda md: len(md.blocks))
+    def _refresh_changed(self, since: int) -> None:
+        """
+        Refreshes the blocks and ports modified after generation since, or
+        moved into this module. Their parents are updated and their
+        connections relinked, and the bus connections from them rebuilt.
+        The hierarchies are only rebuilt if blocks were added, removed or
+        changed themselves.
+        """
+        ports: List[Port] = []
+        rebuild_hierarchies = self._modified > since
+        for block in self.blocks.values():
+            moved = block._parent is not self
+            if not moved and not block.changed_since(since):
+                continue
+            block.set_parent(self)
+            block._update_parents()
+            whole = moved or block._modified > since
+            rebuild_hierarchies = rebuild_hierarchies or whole
+            ports.extend(
+                p for p in block.ports.values() if whole or p.changed_since(since)
+            )
+        if self._modified > since:
+            self._update_parents_base()
+            ports.extend(self.ports.values())
+        else:
+            ports.extend(p for p in self.ports.values() if p.changed_since(since))
+
+        for port in ports:
+            self._relink_port(port)
+
+        changed = {id(p) for p in ports}
+        for key, bus in list(self.busses.items()):
+            if (
+                id(bus._src_port) in changed
+                or not self._attached(bus._src_port)
+                or not self._attached(bus._dst_port)
+            ):
+                del self.busses[key]
+        for port in ports:
+            self._populate_port_connections(port)
+        self._order_busses()
+
+        if rebuild_hierarchies:
+            self._allocate_hierarchies()
+
+    def _attached(self, port: Optional[Port]) -> bool:
+        """Returns True if port has not been removed from this module, or the blocks in it"""
+        if port is None:
+            return False
+        obj, parent = port, port._parent
+        if parent is None or parent.ports.get(obj.name) is not obj:
+            return False
+        while parent is not self:
+            obj, parent = parent, parent._parent
+            if not isinstance(parent, Module) or parent.blocks.get(obj.name) is not obj:
+                return False
+        return True
+
+    def _order_busses(self) -> None:
+        """Puts the bus connections in the order a full refresh builds them in"""
+        by_src: Dict[int, List[str]] = {}
+        for key, bus in self.busses.items():
+            by_src.setdefault(id(bus._src_port), []).append(key)
+        ports = [p for b in self.blocks.values() for p in b.ports.values()]
+        ports.extend(self.ports.values())
+        busses = {}
+        for port in ports:
+            for key in by_src.pop(id(port), ()):
+                busses[key] = self.busses[key]
+        self.busses.clear()
+        self.busses.update(busses)
 
+    @timed_pass(objects=lambda md: md._count_links())
     def _relink_objects(self) -> None:
         """Using the string references, relink the objects together in the model"""
         for block in self.blocks.values():
             for port in block.ports.values():
-                if isinstance(port, ManagerPort):
-                    for addr in port.addrmap:
-                        port._addrmap_obj[addr] = self.lookup(
-                            port.addrmap[addr]["subord_port"]
-                        )
+                self._relink_port(port)
+
+    def _relink_port(self, port: Port) -> None:
+        """Relinks the address map and signal connections of a single port"""
+        if isinstance(port, ManagerPort):
+            for addr in port.addrmap:
+                port._addrmap_obj[addr] = self.lookup(port.addrmap[addr]["subord_port"])
 
+        for sig in port.signals.values():
+            for con in sig.con_refs:
+                sig._link(con, self.lookup(con))
+
+    def _count_links(self) -> int:
+        """Returns the number of signal connections and address maps to relink"""
+        links = 0
+        for block in self.blocks.values():
+            for port in block.ports.values():
+                if isinstance(port, ManagerPort):
+                    links += len(port.addrmap)
                 for sig in port.signals.values():
-                    for con in sig.con_refs:
-                        sig._connections[con] = self.lookup(con)
+                    links += len(sig.con_refs)
+        return links
 
+    @timed_pass(objects=lambda md: len(md.blocks))
     def _update_parents(self) -> None:
         """Walk down through the module and makes sure all the parent references are accurate
         This is usually performed when we do an update, merge, parse some json metadata
@@ -139,42 +478,36 @@ class Module(Block):
         for b in self.blocks.values():
             b.set_parent(self)
             b._update_parents()
-        for b in self.busses.values():
-            b.set_parent(self)
 
+    @timed_pass(objects=lambda md: len(md.busses))
     def _populate_connections(self) -> None:
         """
         Populates bus-level connections in the design. Walks over the signal
         level wiring to determine this
         """
+        self.busses.clear()
         for c in self.blocks.values():
             for p in c.ports.values():
-                for d in p.destinations().values():
-                    con_name = f"{p.ref}->{d.ref}"
-                    conn = BusConnection(
-                        name=con_name,
-                        ref=con_name,
-                        src_port=p.ref,
-                        dst_port=d.ref,
-                        _src_port=p,
-                        _dst_port=d,
-                    )
-                    self.busses[conn.ref] = conn
+                self._populate_port_connections(p)
 
         # External ports
         for p in self.ports.values():
-            for d in p.destinations().values():
-                con_name = f"{p.ref}->{d.ref}"
-                conn = BusConnection(
-                    name=con_name,
-                    ref=con_name,
-                    src_port=p.ref,
-                    dst_port=d.ref,
-                    _src_port=p,
-                    _dst_port=d,
-                )
-                self.busses[conn.ref] = conn
+            self._populate_port_connections(p)
+
+    def _populate_port_connections(self, p: Port) -> None:
+        """Adds a bus-level connection from port p to each of its destinations"""
+        for d in p.destinations().values():
+            con_name = f"{p.ref}->{d.ref}"
+            conn = BusConnection(
+                name=con_name,
+                src_port=p.ref,
+                dst_port=d.ref,
+                _src_port=p,
+                _dst_port=d,
+            )
+            self.busses[conn.ref] = conn
 
+    @timed_pass(objects=lambda md: len(md.blocks))
     def _allocate_hierarchies(self) -> None:
         """
         Walks over all the cores and allocates them into the hierarchies.
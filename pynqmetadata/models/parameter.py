@@ -8,9 +8,10 @@ from typing import Optional
 
 from pynqmetadata.errors.construction_errors import MergeConflict
 
-from .metadata_object import MetadataObject
+from .metadata_object import MetadataObject, slotted
 
 
+@slotted
 @dataclass(repr=False)
 class Parameter(MetadataObject):
     """
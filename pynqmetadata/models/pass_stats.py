@@ -0,0 +1,97 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import functools
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterator, Optional
+
+
+@dataclass
+class PassRecord:
+    """
+    What was recorded for a single pass
+        * calls : number of times the pass ran
+        * seconds : total wall time spent in the pass, including any passes it ran
+        * objects : total number of objects the pass worked over
+    """
+
+    calls: int = 0
+    seconds: float = 0.0
+    objects: int = 0
+
+
+@dataclass
+class PassStats:
+    """
+    Collects the wall time, call count and object count of the parse
+    and refresh passes run on a model, and of the runtime views built
+    from it. A model only collects these when it has a PassStats
+    object, see Module.enable_stats()
+    """
+
+    passes: Dict[str, PassRecord] = field(default_factory=lambda: ({}))
+
+    def record(self, name: str, seconds: float, objects: int = 0) -> None:
+        """Adds a single run of the pass name"""
+        rec = self.passes.get(name)
+        if rec is None:
+            rec = self.passes[name] = PassRecord()
+        rec.calls += 1
+        rec.seconds += seconds
+        rec.objects += objects
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Records the code run within the context as a run of the pass name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        self.passes = {}
+
+    def dict(self) -> Dict:
+        return {name: asdict(rec) for name, rec in self.passes.items()}
+
+    def report(self) -> str:
+        """Returns a table of the passes, in the order they first ran"""
+        lines = [f"{'pass':<32} {'calls':>6} {'ms':>10} {'objects':>9}"]
+        for name, rec in self.passes.items():
+            lines.append(
+                f"{name:<32} {rec.calls:>6} {rec.seconds * 1000:>10.2f} {rec.objects:>9}"
+            )
+        return "\n".join(lines)
+
+
+def timed_pass(
+    name: Optional[str] = None, objects: Optional[Callable[[object], int]] = None
+) -> Callable:
+    """
+    Decorates a pass method so that its runs are recorded in the _stats of
+    the object it is called on, under name (default: the name of the method).
+    objects returns the number of objects the pass worked over, it is
+    evaluated after the pass and outside of its measured time. When the
+    object has no _stats the method is called directly.
+    """
+
+    def _decorator(f: Callable) -> Callable:
+        pass_name = f.__name__ if name is None else name
+
+        @functools.wraps(f)
+        def _wrapper(self, *args, **kwargs):
+            stats = self._stats
+            if stats is None:
+                return f(self, *args, **kwargs)
+            start = time.perf_counter()
+            ret = f(self, *args, **kwargs)
+            elapsed = time.perf_counter() - start
+            stats.record(pass_name, elapsed, 0 if objects is None else objects(self))
+            return ret
+
+        return _wrapper
+
+    return _decorator
@@ -41,7 +41,7 @@ class Port(MetadataObject):
         """Attempts to merge two ports together. Generates a confilict if there is a collision."""
         self._mo_merge(a)
         if self.vlnv is not None and a.vlnv is not None:
-            if self.vlnv.dict() != a.vlnv.dict():
+            if self.vlnv != a.vlnv:
                 raise MergeConflict(f"{self.vlnv=} conflicts with {a.vlnv=}")
 
         # Skip over external ports (used when a separate BDC is being merged into a module)
@@ -216,14 +216,16 @@ class Port(MetadataObject):
                 self.signals[sig].remove(refresh=False)
 
             if isinstance(self._parent, MetadataObject):
+                self._unindex()
                 del self._parent.ports[self.name]
+                self._parent.touch()
             else:
                 raise UnexpectedMetadataObjectType(
                     f"Expecting parent of Port {self.ref} to be either a Core or a Module"
                 )
 
             if refresh:
-                self._get_root().refresh()
+                self._get_root().refresh(full=False)
 
     def remove(
         self, item: Optional[MetadataObject] = None, refresh: bool = True
@@ -0,0 +1,129 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+
+if TYPE_CHECKING:
+    from .metadata_object import MetadataObject
+
+
+def _walk(obj: MetadataObject) -> Iterator[MetadataObject]:
+    """Yields obj and everything below it"""
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        yield o
+        if o._children:
+            stack.extend(o._children.values())
+
+
+@dataclass
+class RefIndex:
+    """
+    Maps the ref of every object in a tree to the object, so that
+    lookups are a dictionary probe rather than a walk down the tree.
+    A second map, keyed by the casefolded refs, serves the case
+    insensitive lookups; it is only built when the first one is made.
+    The index is held by the root Module of the tree, see
+    Module._get_ref_index(), and is kept up to date as objects are
+    added, removed, renamed and moved to a new parent.
+
+        * root_ref : the ref of the root when the index was built, the
+        index is dropped if the root is renamed
+    """
+
+    root_ref: str = ""
+    refs: Dict[str, MetadataObject] = field(default_factory=lambda: ({}))
+    folded: Optional[Dict[str, MetadataObject]] = None
+
+    @classmethod
+    def of_tree(cls, root: MetadataObject) -> RefIndex:
+        """Builds the index of everything below root"""
+        index = cls(root_ref=root.ref)
+        for obj in _walk(root):
+            if obj is not root:
+                index.add(obj)
+        return index
+
+    def add(self, obj: MetadataObject) -> None:
+        """Adds obj under its current ref, replacing any object at that ref"""
+        ref = obj.ref
+        old = self.refs.get(ref)
+        if old is obj:
+            return
+        self.refs[ref] = obj
+        if self.folded is not None:
+            self._add_folded(obj, old)
+
+    def _add_folded(self, obj: MetadataObject, old: Optional[MetadataObject]) -> None:
+        key = obj.ref.casefold()
+        # The first object added for refs that only differ by case keeps the entry
+        current = self.folded.get(key)
+        if current is None or current is old:
+            self.folded[key] = obj
+
+    def discard(self, obj: MetadataObject) -> None:
+        """Removes obj, which has to still have the ref it was added with"""
+        ref = obj.ref
+        if self.refs.get(ref) is obj:
+            del self.refs[ref]
+            if self.folded is not None:
+                key = ref.casefold()
+                if self.folded.get(key) is obj:
+                    del self.folded[key]
+
+    def add_tree(self, obj: MetadataObject) -> None:
+        """Adds obj and everything below it"""
+        for o in _walk(obj):
+            self.add(o)
+
+    def discard_tree(self, obj: MetadataObject) -> None:
+        """Removes obj and everything below it"""
+        for o in _walk(obj):
+            self.discard(o)
+
+    def get(self, ref: str) -> Optional[MetadataObject]:
+        """
+        Returns the object with the ref, trying an exact match first
+        and then a case insensitive one, or None if there is neither
+        """
+        obj = self.refs.get(ref)
+        if obj is not None and (obj._ref is ref or obj.ref == ref):
+            return obj
+        if self.folded is None:
+            self.folded = {}
+            for o in self.refs.values():
+                self._add_folded(o, None)
+        key = ref.casefold()
+        obj = self.folded.get(key)
+        # Entries left behind by refs that only differ by case are not trusted
+        if obj is not None and obj.ref.casefold() == key:
+            if self.refs.get(obj.ref) is obj:
+                return obj
+        return None
+
+    def find(self, base: MetadataObject, ref: str) -> Optional[MetadataObject]:
+        """
+        Returns the object at ref relative to base, which is in the
+        indexed tree. Like MetadataObject.lookup() the ref may start with
+        the name of base.
+        """
+        first, sep, rest = ref.partition(":")
+        base_ref = base.ref
+        if first == base.name:
+            if not sep:
+                return None
+            if first == base_ref:
+                # Already a full ref, as held by con_refs and addrmaps
+                return self.get(ref)
+            ref = rest
+        return self.get(f"{base_ref}:{ref}")
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self.refs
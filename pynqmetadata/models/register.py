@@ -4,13 +4,36 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict
+from typing import Dict, NamedTuple, Tuple
 
 from ..errors import BitAlreadyExists, MergeConflict
 from .bit_field import BitField
-from .metadata_object import MetadataObject
+from .metadata_object import MetadataObject, slotted
 
 
+class BitFieldDescription(NamedTuple):
+    """A compact description of a BitField, used before the BitField object is needed"""
+
+    name: str
+    description: str
+    LSB: int
+    MSB: int
+    access: str
+
+
+class RegisterDescription(NamedTuple):
+    """A compact description of a Register, used before the Register object is needed"""
+
+    name: str
+    description: str
+    offset: int
+    width: int
+    access: str
+    enabled: bool
+    bitfields: Tuple[BitFieldDescription, ...]
+
+
+@slotted
 @dataclass(repr=False)
 class Register(MetadataObject):
     """
@@ -40,7 +63,7 @@ class Register(MetadataObject):
 
         for bit in a.bitfields:
             if bit in self.bitfields:
-                if a.bitfields[bit].dict() != self.bitfields[bit].dict():
+                if a.bitfields[bit] != self.bitfields[bit]:
                     raise MergeConflict(
                         f"{self.name} and {a.name} cannot be merged there is a conflict on {self.bitfields[bit].ref}"
                     )
@@ -70,3 +93,72 @@ class Register(MetadataObject):
         This is usually performed when we do an update, merge, or parse some json metadata"""
         for bit in self.bitfields.values():
             bit.set_parent(self)
+
+    @classmethod
+    def description_hash(cls, d: RegisterDescription) -> bytes:
+        """
+        Returns the structural hash of the Register that would be created
+        from a compact description, without creating it or its BitFields
+        """
+        return cls._described_hash(
+            name=d.name,
+            description=d.description,
+            offset=d.offset,
+            width=d.width,
+            enabled=d.enabled,
+            access=d.access,
+            bitfields={
+                f.name: BitField._described_hash(
+                    name=f.name,
+                    description=f.description,
+                    LSB=f.LSB,
+                    MSB=f.MSB,
+                    access=f.access,
+                )
+                for f in d.bitfields
+            },
+        )
+
+    @classmethod
+    def from_description(cls, d: RegisterDescription) -> Register:
+        """Creates a Register, along with its BitFields, from a compact description"""
+        reg = cls(
+            name=d.name,
+            description=d.description,
+            offset=d.offset,
+            width=d.width,
+            enabled=d.enabled,
+            access=d.access,
+        )
+        for f in d.bitfields:
+            reg.add(
+                BitField(
+                    name=f.name,
+                    description=f.description,
+                    LSB=f.LSB,
+                    MSB=f.MSB,
+                    access=f.access,
+                )
+            )
+        return reg
+
+    def to_description(self) -> RegisterDescription:
+        """Returns the compact description of this Register and its BitFields"""
+        return RegisterDescription(
+            name=self.name,
+            description=self.description,
+            offset=self.offset,
+            width=self.width,
+            access=self.access,
+            enabled=self.enabled,
+            bitfields=tuple(
+                BitFieldDescription(
+                    name=f.name,
+                    description=f.description,
+                    LSB=f.LSB,
+                    MSB=f.MSB,
+                    access=f.access,
+                )
+                for f in self.bitfields.values()
+            ),
+        )
@@ -14,9 +14,12 @@ from ..errors import (
     UnexpectedMetadataObjectType,
     WrongPolarityConnection,
 )
-from .metadata_object import MetadataObject
+from . import connection_index
+from .connection_index import ConnectionIndex
+from .metadata_object import EMPTY_MAPPING, MetadataObject, slotted
 
 
+@slotted
 @dataclass(repr=False)
 class Signal(MetadataObject):
     """
@@ -24,16 +27,98 @@ class Signal(MetadataObject):
     are grouped together to form a port.
     They keep track of what they are connected
     to in the metadata.
+
+    The connection containers are only allocated when
+    the signal is first connected, many signals never are.
     """
 
     type: str = "signal"
     generic_type: str = "signal"
-    _connections: Dict[str, Signal] = field(default_factory=lambda: ({}))
-    con_refs: List[str] = field(default_factory=lambda: ([]))
+    # The refs connected to, in the order they were connected, each with
+    # the signal it has been linked to or None until it is
+    _conns: Optional[Dict[str, Optional[Signal]]] = None
+    # How many of the refs have not been linked to a signal yet
+    _unlinked: int = 0
     width: int = 1
     driver: bool = True
     external: bool = False
 
+    _lazy_fields = {**MetadataObject._lazy_fields, "_conns": ("con_refs", None)}
+
+    @property
+    def con_refs(self) -> List[str]:
+        """The refs of the signals this signal is connected to"""
+        if self._conns is None:
+            return []
+        return list(self._conns)
+
+    @con_refs.setter
+    def con_refs(self, value: Optional[List[str]]) -> None:
+        old = self._connections
+        self._set_conns({ref: old.get(ref) for ref in value} if value else None)
+
+    @property
+    def _connections(self) -> Dict[str, Signal]:
+        if self._conns is None:
+            return EMPTY_MAPPING
+        if self._unlinked:
+            return {ref: sig for ref, sig in self._conns.items() if sig is not None}
+        return self._conns
+
+    @_connections.setter
+    def _connections(self, value: Optional[Dict[str, Signal]]) -> None:
+        self._set_conns(value)
+
+    def _connection_index(self) -> Optional[ConnectionIndex]:
+        """Returns the connection index of the tree this signal is in, if it has one"""
+        if not connection_index.indexing:
+            return None
+        return self._tree_root()._get_connection_index()
+
+    def _set_conns(self, conns: Optional[Dict[str, Optional[Signal]]]) -> None:
+        index = self._connection_index()
+        if index is not None:
+            old = [dst for dst in self._connections.values() if dst is not None]
+            _set_conns(self, conns)
+            self._count_unlinked()
+            for dst in old:
+                index.unlinked(self, dst)
+            for dst in self._connections.values():
+                if dst is not None:
+                    index.linked(self, dst)
+        else:
+            _set_conns(self, conns)
+            self._count_unlinked()
+
+    def _count_unlinked(self) -> None:
+        if self._conns is None:
+            _set_unlinked(self, 0)
+        else:
+            _set_unlinked(self, sum(sig is None for sig in self._conns.values()))
+
+    def _link(self, ref: str, sig: Signal) -> None:
+        """Sets the object for the connection ref, adding the ref if it is new"""
+        if self._conns is None:
+            _set_conns(self, {})
+        old = self._conns.get(ref)
+        if old is None and ref in self._conns:
+            _set_unlinked(self, self._unlinked - 1)
+        self._conns[ref] = sig
+        if old is not sig:
+            index = self._connection_index()
+            if index is not None:
+                if old is not None:
+                    index.unlinked(self, old)
+                index.linked(self, sig)
+
+    def _add_con_ref(self, ref: str) -> None:
+        """Adds the connection ref, its signal is linked by the next refresh"""
+        if self._conns is None:
+            _set_conns(self, {})
+        if ref not in self._conns:
+            self._conns[ref] = None
+            _set_unlinked(self, self._unlinked + 1)
+
     def merge(
         self, a: Signal, skip_external: bool = False, inherit_signal_width: bool = False
     ) -> None:
@@ -68,9 +153,9 @@ class Signal(MetadataObject):
         else:
             self.external = a.external
 
-        for c in a.con_refs:
-            if c not in self.con_refs:
-                self.con_refs.append(c)
+        if a._conns is not None:
+            for c in a._conns:
+                self._add_con_ref(c)
 
     def connection_exists(self, sig: Signal) -> bool:
         """
@@ -84,15 +169,21 @@ class Signal(MetadataObject):
         returns true if the connection reference already
         exists, false otherwise
         """
-        return ref in self.con_refs
+        return self._conns is not None and ref in self._conns
 
     def _remove_con_ref(self, ref: str):
         """
         Removes a connection from the references
         """
         if self._con_ref_exists(ref):
-            self.con_refs.remove(ref)
-            del self._connections[ref]
+            dst = self._conns.pop(ref)
+            if dst is None:
+                _set_unlinked(self, self._unlinked - 1)
+            else:
+                index = self._connection_index()
+                if index is not None:
+                    index.unlinked(self, dst)
+            self.touch()
         else:
             raise PortSignalNotFound(
                 f"Could not find reference connection to {ref} in {self.ref}"
@@ -120,8 +211,8 @@ class Signal(MetadataObject):
         """
         if not self.connection_exists(sig):
             self._check_polarity(sig)
-            self._connections[sig.ref] = sig
-            self.con_refs.append(sig.ref)
+            self._link(sig.ref, sig)
+            self.touch()
         #else: ## TODO: This needs to be added back in for buildtime stuff
         #    raise PortSignalAlreadyExists(
         #        f"{sig.ref} is already connected to {self.ref} .  full list of signals {self._connections.keys()}"
@@ -161,7 +252,7 @@ class Signal(MetadataObject):
                 )
 
             if refresh:
-                self._get_root().refresh()
+                self._get_root().refresh(full=False)
 
         else:
             raise PortSignalNotFound(
@@ -196,25 +287,25 @@ class Signal(MetadataObject):
             )
         else:
             root = self._get_root()
-            for core in root.blocks.values():
-                for port in core.ports.values():
-                    for signal in port.signals.values():
-                        if signal != self:
-                            if signal.connection_exists(self):
-                                signal.disconnect(self)
-
-            # remove from external ports also
-            for port in root.ports.values():
-                for signal in port.signals.values():
-                    if signal != self:
-                        signal.disconnect(self)
+            # Only the signals connected to this one refer to it
+            index = self._tree_root()._get_connection_index(build=True)
+            for signal in index.sources(self):
+                if signal is not self:
+                    signal._remove_con_ref(self.ref)
 
         if isinstance(self._parent, MetadataObject):
+            self._unindex()
             del self._parent.signals[self.name]
+            self._parent.touch()
         else:
             raise UnexpectedMetadataObjectType(
                 f"Trying to remove {self.ref} from it's parent, but it's parent was not type Port"
             )
 
         if refresh:
-            root.refresh()
+            root.refresh(full=False)
+
+
+# Set through their slots rather than through __setattr__(), see metadata_object
+_set_conns = Signal._conns.__set__
+_set_unlinked = Signal._unlinked.__set__
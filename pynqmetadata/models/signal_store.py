@@ -0,0 +1,193 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, List, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from .metadata_object import MetadataObject
+    from .port import Port
+    from .signal import Signal
+
+
+def _ports(md: MetadataObject) -> Iterator[Port]:
+    """Yields the ports of md and of everything below it"""
+    for block in getattr(md, "blocks", {}).values():
+        yield from _ports(block)
+    yield from md.ports.values()
+
+
+def _stale_store() -> None:
+    """Unpickles, and copies, a store as None so that it is built again"""
+    return None
+
+
+@dataclass
+class SignalStore:
+    """
+    The ports and signals of a design held column by column, for
+    analyses over every signal at once. Each port and signal is given an
+    integer id, its position in ports and signals, and the columns are
+    arrays indexed by them:
+
+        * width, driver, external : the fields of each signal
+        * port : the id of the port of each signal
+        * indptr, indices : the connections of the signals in compressed
+        sparse row form, those of signal i are the ids in
+        indices[indptr[i]:indptr[i + 1]]
+
+    The store is a snapshot of the design taken in generation, see
+    Module.signal_store() which rebuilds it once the design changes. The
+    columns are array.arrays, column() returns them as numpy arrays when
+    numpy is installed, which the analyses then run on.
+    """
+
+    generation: int = 0
+    ports: List[Port] = field(default_factory=lambda: ([]))
+    signals: List[Signal] = field(default_factory=lambda: ([]))
+    width: array = field(default_factory=lambda: (array("q")))
+    driver: array = field(default_factory=lambda: (array("b")))
+    external: array = field(default_factory=lambda: (array("b")))
+    port: array = field(default_factory=lambda: (array("q")))
+    indptr: array = field(default_factory=lambda: (array("q", [0])))
+    indices: array = field(default_factory=lambda: (array("q")))
+    _ids: Dict[int, int] = field(default_factory=lambda: ({}))
+
+    @classmethod
+    def of_tree(cls, root: MetadataObject, generation: int = 0) -> SignalStore:
+        """
+        Builds the store of the ports and signals below root, connections
+        to signals outside of root are left out
+        """
+        store = cls(generation=generation)
+        for port in _ports(root):
+            port_id = len(store.ports)
+            store.ports.append(port)
+            for sig in port.signals.values():
+                store._ids[id(sig)] = len(store.signals)
+                store.signals.append(sig)
+                store.width.append(sig.width)
+                store.driver.append(sig.driver)
+                store.external.append(sig.external)
+                store.port.append(port_id)
+        ids = store._ids
+        for sig in store.signals:
+            for dst in sig._connections.values():
+                dst_id = ids.get(id(dst))
+                if dst_id is not None:
+                    store.indices.append(dst_id)
+            store.indptr.append(len(store.indices))
+        return store
+
+    def column(self, name: str) -> Sequence:
+        """
+        Returns the column name, as a numpy array that shares its memory
+        if numpy is installed, or as the array.array itself if it is not
+        """
+        col = getattr(self, name)
+        if numpy is None:
+            return col
+        return numpy.frombuffer(col, dtype=col.typecode)
+
+    def id_of(self, sig: Signal) -> int:
+        """Returns the id of sig, raises KeyError if it is not in the store"""
+        return self._ids[id(sig)]
+
+    def peers(self, sig: Signal) -> List[Signal]:
+        """Returns the signals sig is connected to"""
+        i = self.id_of(sig)
+        return [self.signals[j] for j in self.indices[self.indptr[i] : self.indptr[i + 1]]]
+
+    def fan_out(self) -> Sequence:
+        """Returns how many signals each signal is connected to, by signal id"""
+        if numpy is not None:
+            return numpy.diff(self.column("indptr"))
+        indptr = self.indptr
+        return array("q", (indptr[i + 1] - indptr[i] for i in range(len(self.signals))))
+
+    def fan_in(self) -> Sequence:
+        """Returns how many signals are connected to each signal, by signal id"""
+        if numpy is not None:
+            return numpy.bincount(self.column("indices"), minlength=len(self.signals))
+        counts = array("q", bytes(8 * len(self.signals)))
+        for j in self.indices:
+            counts[j] += 1
+        return counts
+
+    def width_mismatches(self) -> List[Tuple[Signal, Signal]]:
+        """Returns the pairs of connected signals whose widths differ"""
+        return self._pairs(self._mismatched("width"))
+
+    def polarity_errors(self) -> List[Tuple[Signal, Signal]]:
+        """
+        Returns the pairs of connected signals whose polarities do not
+        allow them to be connected, as checked by Signal.connect(): both
+        drive or both are driven, unless one is external, in which case
+        both have to have the same polarity
+        """
+        if numpy is not None:
+            rows, cols = self._edges()
+            driver = self.column("driver")
+            external = self.column("external")
+            same = driver[rows] == driver[cols]
+            either_external = (external[rows] | external[cols]).astype(bool)
+            bad = same ^ either_external
+            return self._pairs(zip(rows[bad].tolist(), cols[bad].tolist()))
+        driver, external = self.driver, self.external
+        return self._pairs(
+            (i, j)
+            for i, j in self._edges()
+            if (driver[i] == driver[j]) != bool(external[i] or external[j])
+        )
+
+    def _edges(self):
+        """
+        Returns the (source, destination) ids of every connection, as two
+        numpy arrays or, without numpy, as an iterator of pairs
+        """
+        if numpy is not None:
+            rows = numpy.repeat(
+                numpy.arange(len(self.signals), dtype=numpy.int64), self.fan_out()
+            )
+            return rows, self.column("indices")
+        indptr, indices = self.indptr, self.indices
+        return (
+            (i, indices[k])
+            for i in range(len(self.signals))
+            for k in range(indptr[i], indptr[i + 1])
+        )
+
+    def _mismatched(self, name: str) -> Iterator[Tuple[int, int]]:
+        """Yields the connections between signals whose values in column name differ"""
+        if numpy is not None:
+            rows, cols = self._edges()
+            values = self.column(name)
+            bad = values[rows] != values[cols]
+            return zip(rows[bad].tolist(), cols[bad].tolist())
+        col = getattr(self, name)
+        return ((i, j) for i, j in self._edges() if col[i] != col[j])
+
+    def _pairs(self, edges) -> List[Tuple[Signal, Signal]]:
+        """Returns the signals of edges, each pair of signals once, driver first"""
+        seen = set()
+        ret = []
+        for i, j in edges:
+            key = (i, j) if i < j else (j, i)
+            if key in seen:
+                continue
+            seen.add(key)
+            if self.driver[j] and not self.driver[i]:
+                i, j = j, i
+            ret.append((self.signals[i], self.signals[j]))
+        return ret
+
+    def __reduce__(self):
+        return (_stale_store, ())
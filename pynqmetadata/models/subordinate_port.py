@@ -3,8 +3,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from pynqmetadata.errors.construction_errors import MergeConflict
 
@@ -12,10 +12,30 @@ from ..errors import UnexpectedPmdObject
 from .metadata_object import MetadataObject
 from .parameter import Parameter
 from .port import Port
-from .register import Register
+from .register import Register, RegisterDescription
 from .signal import Signal
 
 
+class _LazyRegisters:
+    """
+    Descriptor for SubordinatePort.registers. Registers that have been
+    added to the port as RegisterDescriptions are only turned into
+    Register objects the first time the registers are accessed.
+    """
+
+    def __get__(self, obj: Optional[SubordinatePort], objtype=None):
+        if obj is None:
+            return self
+        if obj._register_descriptions:
+            obj._load_registers()
+        return obj.__dict__["registers"]
+
+    def __set__(self, obj: SubordinatePort, value: Dict[str, Register]) -> None:
+        if value is self:
+            value = {}
+        obj.__dict__["registers"] = value
+
+
 @dataclass(repr=False)
 class SubordinatePort(Port):
     """
@@ -26,7 +46,8 @@ class SubordinatePort(Port):
     type: str = "port-subordinate"
     baseaddr: int = 9999999
     range: int = 16
-    registers: Dict[str, Register] = field(default_factory=lambda: ({}))
+    registers: Dict[str, Register] = _LazyRegisters()
+    _register_descriptions: Tuple[RegisterDescription, ...] = ()
 
     def merge(
         self,
@@ -65,7 +86,64 @@ class SubordinatePort(Port):
             if r in self.registers:
                 self.registers[r].merge(a.registers[r])
             else:
-                self.registers[r] = a.registers[r]
+                self.add(a.registers[r])
+
+    def add_register_descriptions(
+        self, descriptions: Tuple[RegisterDescription, ...]
+    ) -> None:
+        """
+        Adds registers to the port in their compact description form.
+        The Register objects are only created when the registers are first accessed.
+        """
+        self._register_descriptions = self._register_descriptions + tuple(descriptions)
+        self.touch()
+
+    def set_register_descriptions(
+        self, descriptions: Tuple[RegisterDescription, ...]
+    ) -> None:
+        """
+        Replaces all the registers of the port with ones in their
+        compact description form, see add_register_descriptions()
+        """
+        for rname in self.__dict__["registers"]:
+            self._remove_child(f"{rname}[register]")
+        self.__dict__["registers"] = {}
+        self._register_descriptions = tuple(descriptions)
+        self.touch()
+
+    def described_registers(self) -> Iterator[RegisterDescription]:
+        """
+        Yields the compact description of every register of the port, in
+        the order of registers, without building the registers that are
+        only described
+        """
+        for reg in self.__dict__["registers"].values():
+            yield reg.to_description()
+        yield from self._register_descriptions
+
+    def _load_registers(self) -> None:
+        """Creates the Register objects for any registers that are only described"""
+        pending = self._register_descriptions
+        self._register_descriptions = ()
+        for d in pending:
+            self.add(Register.from_description(d))
+
+    def _hashed_value(self, name: str) -> object:
+        """Hashes the registers that are only described from their descriptions"""
+        if name != "registers" or not self._register_descriptions:
+            return super()._hashed_value(name)
+        registers = dict(self.__dict__["registers"])
+        for d in self._register_descriptions:
+            registers[d.name] = Register.description_hash(d)
+        return registers
+
+    def _lookup(self, ref_levels: List[str]) -> Optional[MetadataObject]:
+        """Builds any described registers before a register is looked up"""
+        if self._register_descriptions:
+            levels = ref_levels[1:] if ref_levels[0] == self.name else ref_levels
+            if len(levels) > 0 and levels[0].lower().endswith("[register]"):
+                self._load_registers()
+        return super()._lookup(ref_levels)
 
     def exists(self, item: MetadataObject) -> bool:
         """
@@ -98,6 +176,7 @@ class SubordinatePort(Port):
         This is usually performed when we do an update, merge, or parse some json metadata"""
         self._update_parents_base()
 
-        for reg in self.registers.values():
+        # Registers that are still only described get their parent when created
+        for reg in self.__dict__["registers"].values():
             reg.set_parent(self)
             reg._update_parents()
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import json
 from dataclasses import asdict, dataclass, field
+from sys import intern
 from typing import Tuple, Dict
 
 
@@ -20,6 +21,12 @@ class Vlnv:
     name: str
     version: Tuple[int, int] = field(default_factory=tuple)
 
+    def __post_init__(self) -> None:
+        """The same few vendors, libraries and IP names are shared by many cores"""
+        self.vendor = intern(self.vendor)
+        self.library = intern(self.library)
+        self.name = intern(self.name)
+
     def dict(self) -> Dict:
         """Returns a dict of the Vlnv"""
         return asdict(self)
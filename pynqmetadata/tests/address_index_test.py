@@ -0,0 +1,106 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pynqmetadata import AddressIndex
+from pynqmetadata.benchmarks import generate_design
+
+
+def test_addresses_resolve_to_registers():
+    md = generate_design(n_cores=4).parse()
+    index = md.address_index()
+    port = md.blocks["ip_2"].ports["s_axi_control"]
+    assert index.port_at(port.baseaddr + port.range - 1) is port
+    for reg in port.registers.values():
+        target = index.find(port.baseaddr + reg.offset)
+        assert target.block is md.blocks["ip_2"] and target.port is port
+        assert target.register is reg
+    assert index.find(index.starts[0] - 1) is None
+
+    ports = index.window(port.baseaddr - 1, port.baseaddr + port.range + 1)
+    assert [p.parent().name for p in ports] == ["ip_1", "ip_2", "ip_3"]
+    assert index.overlaps() == [] and index.gaps() == []
+
+
+def test_index_is_updated_from_changed_blocks(monkeypatch):
+    md = generate_design(n_cores=4).parse()
+    index = md.address_index()
+    assert md.address_index() is index
+
+    updated = []
+    update = AddressIndex._update
+    monkeypatch.setattr(
+        AddressIndex,
+        "_update",
+        lambda self, obj: updated.append(obj.name) or update(self, obj),
+    )
+    ip1, ip3 = (md.blocks[n].ports["s_axi_control"] for n in ("ip_1", "ip_3"))
+    ip3.baseaddr, ip3.range = ip1.baseaddr + 0x100, 0x100
+    assert md.address_index() is index
+    assert updated == ["synth", "ip_3"]
+    assert [(a.ref, b.ref) for a, b in index.overlaps()] == [(ip1.ref, ip3.ref)]
+    assert index.port_at(ip3.baseaddr) is ip3
+
+    old = md.blocks["ip_2"].ports["s_axi_control"]
+    md.blocks["ip_2"].remove()
+    md.blocks["ip_3"].remove()
+    assert md.address_index().gaps() == [(old.baseaddr, old.baseaddr + 2 * old.range)]
+    assert index.port_at(old.baseaddr) is None
+
+
+def test_index_sees_assigned_addresses():
+    md = generate_design(n_cores=4).parse()
+    port = md.blocks["ip_1"].ports["s_axi_control"]
+    old = port.baseaddr
+    assert md.address_index().port_at(old) is port
+
+    port.baseaddr = 0x7000_0000
+    assert md.address_index().port_at(0x7000_0000) is port
+    assert md.address_index().port_at(old) is None
+
+
+def test_managers_decode_their_targets():
+    md = generate_design(n_cores=4).parse()
+    manager = md.blocks["ps_0"].ports["M_AXI_HPM0_FPD"]
+    table = manager.decode_table()
+    assert manager.decode_table() is table
+    assert len(table.ports) == len(manager.addrmap)
+
+    port = md.blocks["ip_1"].ports["s_axi_control"]
+    reg = list(port.registers.values())[-1]
+    target = manager.decode(port.baseaddr + reg.offset)
+    assert target.port is port and target.register is reg
+    assert manager.targets(port.baseaddr, port.baseaddr + 1) == [port]
+    assert manager.decode(table.ends[-1]) is None
+
+    manager.addrmap_remove(port)
+    assert manager.decode_table() is not table
+    assert manager.decode(port.baseaddr) is None
+
+
+def test_decode_table_sees_assigned_addresses():
+    md = generate_design(n_cores=4).parse()
+    manager = md.blocks["ps_0"].ports["M_AXI_HPM0_FPD"]
+    port = md.blocks["ip_1"].ports["s_axi_control"]
+    old = port.baseaddr
+    assert manager.decode(old).port is port
+    table = manager.decode_table()
+    assert manager.decode_table() is table
+
+    port.baseaddr = 0x7000_0000
+    assert manager.decode_table() is not table
+    assert manager.decode(0x7000_0000).port is port
+    assert manager.decode(old) is None
+
+
+def test_decode_table_is_kept_across_unrelated_changes():
+    md = generate_design(n_cores=4).parse()
+    manager = md.blocks["ps_0"].ports["M_AXI_HPM0_FPD"]
+    table = manager.decode_table()
+
+    md.blocks["ip_1"].hierarchy_name = "other"
+    md.blocks["ip_2"].parameters[next(iter(md.blocks["ip_2"].parameters))].value = "1"
+    assert manager.decode_table() is table
+
+    port = md.blocks["ip_3"].ports["s_axi_control"]
+    port.range = port.range // 2
+    assert manager.decode_table() is not table
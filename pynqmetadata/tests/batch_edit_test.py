@@ -0,0 +1,41 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pynqmetadata import PassStats
+from pynqmetadata.benchmarks import generate_design
+
+
+def test_remove_many_matches_removing_one_at_a_time():
+    md = generate_design(n_cores=6).parse()
+    one_by_one = md.copy()
+
+    md.enable_stats(PassStats())
+    items = [md.blocks["ip_0"], md.blocks["ip_0"].ports["interrupt"]]
+    items += [md.blocks["ip_3"], md.blocks["ip_4"].ports["s_axi_control"]]
+    md.remove_many(items)
+    assert md.stats.passes["_refresh_changed"].calls == 1
+
+    one_by_one.blocks["ip_0"].remove()
+    one_by_one.blocks["ip_3"].remove()
+    one_by_one.blocks["ip_4"].ports["s_axi_control"].remove()
+    assert md.json() == one_by_one.json()
+    assert md.busses.keys() == one_by_one.busses.keys()
+    assert "ip_0" not in md.blocks and "s_axi_control" not in md.blocks["ip_4"].ports
+
+
+def test_batch_defers_refresh():
+    md = generate_design(n_cores=4).parse()
+    md.enable_stats(PassStats())
+    stale = [k for k, b in md.busses.items() if b._src_port._parent.name == "ip_1"]
+    assert stale
+    with md.batch():
+        md.blocks["ip_1"].remove()
+        sig = md.blocks["ip_2"].ports["s_axi_control"].signals["AWADDR"]
+        sig.remove()
+        assert "_refresh_changed" not in md.stats.passes
+        assert all(k in md.busses for k in stale)
+    assert md.stats.passes["_refresh_changed"].calls == 1
+    assert not any(
+        bus._src_port._parent.name == "ip_1" or bus._dst_port._parent.name == "ip_1"
+        for bus in md.busses.values()
+    )
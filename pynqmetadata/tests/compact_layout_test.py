@@ -0,0 +1,68 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import copy
+import os
+import pickle
+
+from pynqmetadata import BitField, Parameter, Register, Signal
+from pynqmetadata.benchmarks import generate_design, memory_footprint
+from pynqmetadata.frontends import HwhFrontend, JsonFrontend
+
+TEST_DIR = os.path.dirname(__file__)
+
+
+def test_leaf_objects_have_no_dict():
+    for cls in [Signal, Parameter, Register, BitField]:
+        assert not hasattr(cls(name="x"), "__dict__")
+
+
+def test_containers_allocated_lazily():
+    sig = Signal(name="s")
+    assert sig._children is None and sig._ext is None
+    assert sig._conns is None
+    assert sig.dict()["ext"] == {} and sig.dict()["con_refs"] == []
+    assert list(sig.con_refs) == [] and len(sig._connections) == 0
+
+    other = Signal(name="d", driver=False)
+    sig.connect(other)
+    assert sig.con_refs == ["d"]
+    assert sig._connections["d"] is other
+
+    sig.ext["tag"] = "value"
+    assert sig._ext == {"tag": "value"}
+
+
+def test_parsed_model_unchanged():
+    md = HwhFrontend(_hwhfile=f"{TEST_DIR}/hwhs/resizer.hwh")
+    unallocated = 0
+    for core in md.blocks.values():
+        for port in core.ports.values():
+            for sig in port.signals.values():
+                assert md.lookup(sig.ref) is sig
+                if sig._ext is None and sig._children is None:
+                    unallocated += 1
+    assert unallocated > 0
+
+    assert copy.deepcopy(md).dict() == md.dict()
+    assert pickle.loads(pickle.dumps(md.dict())) == md.dict()
+
+
+def test_memory_footprint():
+    design = generate_design(n_cores=4)
+    footprint = memory_footprint(lambda: JsonFrontend(design.json()))
+    assert 0 < footprint["retained"] <= footprint["peak"]
+
+
+def test_lazy_fields_given_to_the_constructor():
+    sig = Signal(name="s", con_refs=["a:b[signal]"], ext={"tag": "value"}, ref="top:s")
+    assert type(sig) is Signal
+    assert sig.con_refs == ["a:b[signal]"] and sig._connections == {}
+    assert sig.ext == {"tag": "value"} and sig.ref == "top:s"
+
+    for cls in [Parameter, Register, BitField]:
+        obj = cls(name="x", ext={"tag": 1})
+        assert obj.ext == {"tag": 1} and obj._ext is not None
+
+    # Rebuilding a signal from its dict gives back the same signal
+    assert Signal(**sig.dict()).dict() == sig.dict()
@@ -0,0 +1,73 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pickle
+
+from pynqmetadata import Core, Module, Port, Signal, Vlnv
+from pynqmetadata.benchmarks import generate_design
+
+
+def _design() -> Module:
+    md = Module(name="top")
+    for cname in ("a", "b", "c"):
+        core = Core(
+            name=cname, vlnv=Vlnv(vendor="v", library="l", name="n", version=(1, 0))
+        )
+        port = Port(name="P")
+        port.add(Signal(name="CLK", driver=cname == "a"))
+        core.add(port)
+        md.add(core)
+    md.refresh()
+    return md
+
+
+def _clk(md: Module, cname: str) -> Signal:
+    return md.blocks[cname].ports["P"].signals["CLK"]
+
+
+def test_remove_disconnects_only_peers():
+    md = _design()
+    a, b, c = (_clk(md, n) for n in ("a", "b", "c"))
+    a.connect(b)
+    b.connect(a)
+    # Connected one way only, it is not in the connections of a
+    c.connect(a)
+    a.connect(c)
+    md._get_connection_index(build=True)
+    a.disconnect(c, refresh=False)
+    assert md._connection_index.sources(a) == [b, c]
+
+    a.remove()
+    assert b.con_refs == [] and c.con_refs == []
+    assert "a" in md.blocks and "CLK" not in md.blocks["a"].ports["P"].signals
+
+
+def test_remove_leaves_unconnected_external_ports():
+    md = generate_design(n_cores=4).parse()
+    sig = md.blocks["ip_1"].ports["s_axi_control"].signals["AWADDR"]
+    peers = list(sig.connections().values())
+    assert len(md.ports) > 0 and len(peers) > 0
+
+    sig.remove()
+    for peer in peers:
+        assert not peer.connection_exists(sig)
+    assert md.lookup(peers[0].ref) is peers[0]
+
+
+def test_con_refs_keep_their_order():
+    md = _design()
+    a, b, c = (_clk(md, n) for n in ("a", "b", "c"))
+    b.connect(a)
+    c.connect(a)
+    a.connect(c)
+    a.connect(b)
+    assert a.con_refs == [c.ref, b.ref]
+    assert a.dict()["con_refs"] == [c.ref, b.ref]
+    a.disconnect(c, refresh=False)
+    a.connect(c)
+    assert a.con_refs == [b.ref, c.ref]
+
+    md._get_connection_index(build=True)
+    for copied in (md.copy(), pickle.loads(pickle.dumps(md))):
+        assert copied._connection_index is None
+        assert _clk(copied, "a").con_refs == a.con_refs
@@ -0,0 +1,58 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pynqmetadata import ManagerPort, SubordinatePort
+from pynqmetadata.benchmarks import generate_design
+
+
+def _axi(port) -> bool:
+    return isinstance(port, (ManagerPort, SubordinatePort))
+
+
+def test_paths_through_the_interconnect():
+    md = generate_design(n_cores=4).parse()
+    graph = md.connectivity()
+    hpm = md.blocks["ps_0"].ports["M_AXI_HPM0_FPD"]
+    target = md.blocks["ip_2"].ports["s_axi_control"]
+
+    assert [p.parent().name for p in graph.fan_out(hpm)] == ["axi_interconnect_0_0"]
+    reached = {p.parent().name for p in graph.reachable(hpm, follow=_axi)}
+    assert {"ip_0", "ip_1", "ip_2", "ip_3", "axi_interconnect_0_0"} <= reached
+    assert "xlconcat_ps" not in reached
+    dfs = graph.reachable(hpm, follow=_axi, depth_first=True)
+    assert {id(p) for p in dfs} == {id(p) for p in graph.reachable(hpm, follow=_axi)}
+
+    path = graph.shortest_path(hpm, target, follow=_axi)
+    assert path[0] is hpm and path[-1] is target and len(path) == 4
+    assert graph.shortest_path(target, hpm) is None
+    assert graph.shortest_path(target, hpm, directed=False, follow=_axi) is not None
+
+
+def test_bus_edges_follow_the_port_types():
+    md = generate_design(n_cores=4).parse()
+    hpm = md.blocks["ps_0"].ports["M_AXI_HPM0_FPD"]
+    # Connections are recorded from both ends, as they are in HWH files
+    for sig in hpm.signals.values():
+        for dst in list(sig._connections.values()):
+            dst.connect(sig)
+    graph = md.connectivity()
+
+    assert [p.parent().name for p in graph.fan_out(hpm)] == ["axi_interconnect_0_0"]
+    assert "axi_interconnect_0_0" not in {p.parent().name for p in graph.fan_in(hpm)}
+
+
+def test_blocks_and_caching():
+    md = generate_design(n_cores=4).parse()
+    graph = md.connectivity()
+    ps, ip = md.blocks["ps_0"], md.blocks["ip_1"]
+    assert any(b is ip for b in graph.reachable(ps))
+    assert graph.shortest_path(ps, ip)[0] is ps
+    components = graph.components()
+    assert sum(len(c) for c in components) == len(graph.blocks)
+    # Results are kept, callers get their own copy of them
+    assert graph.reachable(ps) is not graph.reachable(ps)
+    assert md.connectivity() is graph
+
+    ip.remove()
+    rebuilt = md.connectivity()
+    assert rebuilt is not graph and all(b is not ip for b in rebuilt.blocks)
@@ -0,0 +1,74 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pickle
+
+from pynqmetadata import MetadataObject, Parameter
+from pynqmetadata.benchmarks import generate_design
+from pynqmetadata.frontends import JsonFrontend
+
+
+def test_copy_on_write_matches_deepcopy():
+    md = generate_design(n_cores=4).parse()
+    variant = md.copy(copy_on_write=True)
+    assert variant.dict() == md.copy().dict()
+
+    # Copied again, and through a pickle, it is still the same model
+    js = JsonFrontend(md.json())
+    again = js.copy(copy_on_write=True).copy(copy_on_write=True)
+    assert pickle.loads(pickle.dumps(again)).dict() == js.dict()
+
+
+def test_only_what_is_reached_is_copied():
+    md = generate_design(n_cores=4).parse()
+    variant = md.copy(copy_on_write=True)
+    for block in variant.blocks.values():
+        block.ext["vis"] = {"hidden": "yes"}
+    assert all("vis" not in block.ext for block in md.blocks.values())
+    assert "ports" not in variant.blocks["ip_1"].__dict__
+
+    sig = variant.blocks["ip_0"].ports["s_axi_control"].signals["AWADDR"]
+    orig = md.blocks["ip_0"].ports["s_axi_control"].signals["AWADDR"]
+    assert sig is not orig and sig.ref == orig.ref
+    peer = list(sig.connections().values())[0]
+    assert peer is not list(orig.connections().values())[0]
+    assert variant.lookup(peer.ref) is peer
+    assert peer.parent().parent() is variant.blocks[peer.parent().parent().name]
+
+    variant.blocks["ip_2"].remove()
+    assert "ip_2" in md.blocks and "ip_2" not in variant.blocks
+    assert md.lookup(orig.ref) is orig
+
+
+def test_changes_to_the_original_are_not_seen():
+    md = generate_design(n_cores=2).parse()
+    expected = md.copy().dict()
+    variant = md.copy(copy_on_write=True)
+    md.blocks["ip_0"].add(Parameter(name="EXTRA", value="1"))
+    md.blocks["ip_1"].hierarchy_name = "LEAKED"
+    md.blocks["ip_1"].ext["x"] = 1
+    sig = md.blocks["ip_1"].ports["s_axi_control"].signals["AWADDR"]
+    sig.width = 99
+    sig.ext["x"] = 1
+    md.blocks["ip_0"].ports["s_axi_control"].signals["AWADDR"].remove()
+
+    assert "EXTRA" not in variant.blocks["ip_0"].parameters
+    assert variant.blocks["ip_1"].hierarchy_name != "LEAKED"
+    assert "x" not in variant.blocks["ip_1"].ext
+    copied = variant.blocks["ip_1"].ports["s_axi_control"].signals["AWADDR"]
+    assert copied.width != 99 and "x" not in copied.ext
+    assert variant.dict() == expected
+
+
+def test_copies_are_given_their_class():
+    md = generate_design(n_cores=2).parse()
+    variant = md.copy(copy_on_write=True)
+    assert "__getattr__" not in MetadataObject.__dict__
+    block = variant.blocks["ip_0"]
+    assert type(block) is not type(md.blocks["ip_0"])
+    assert isinstance(block, type(md.blocks["ip_0"]))
+
+    # Once everything in it has been copied it no longer needs its source
+    assert type(pickle.loads(pickle.dumps(block))) is type(md.blocks["ip_0"])
+    assert type(block) is type(md.blocks["ip_0"])
+    assert "_cow" not in block.__dict__
@@ -0,0 +1,67 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import os
+
+from pynqmetadata.benchmarks import (
+    MEMORY_STAGES,
+    STAGES,
+    DesignSpec,
+    compare_results,
+    generate_design,
+    load_results,
+    run_benchmarks,
+)
+from pynqmetadata.frontends import HwhFrontend, JsonFrontend
+from pynqmetadata.views.runtime import RuntimeMetadataParser
+
+
+def test_generated_design_runtime_views():
+    for ps in ["zynq_ultra_ps_e", "processing_system7"]:
+        spec = DesignSpec(
+            ps=ps, n_cores=10, fanout=4, concat_width=4, n_gpio=3, n_memories=2
+        )
+        md = generate_design(spec).parse()
+        rt = RuntimeMetadataParser(md)
+        assert len([ip for ip in rt.ip_dict if "/ip_" in ip]) == 10
+        assert len(rt.interrupt_controllers) == 1
+        assert len([p for p in rt.interrupt_pins if p.endswith("/interrupt")]) == 10
+        assert len(rt.gpio_dict) == 3
+        assert len(rt.mem_dict) == 2
+        assert rt.ip_dict["hier_0/ip_0"]["registers"]["REG0"]["fields"].keys() == {
+            "FIELD0",
+            "FIELD1",
+        }
+
+
+def test_generated_design_merges_nested_bdcs():
+    design = generate_design(n_cores=2, n_bdcs=2, bdc_cores=2, bdc_depth=2)
+    assert len(design.bdc_hwhs) == 4
+    md = design.parse()
+    assert "bdc_ip_1" in md.blocks["bdc_1"].blocks
+    assert "bdc_ip_0" in md.blocks["bdc_1"].blocks["nested_bdc"].blocks
+    assert JsonFrontend(md.json()).blocks.keys() == md.blocks.keys()
+
+
+def test_generated_design_streams():
+    hwh = generate_design(n_cores=6).hwh
+    md = HwhFrontend(_hwhfile=hwh)
+    assert HwhFrontend(_hwhfile=hwh, _streaming=True).dict() == md.dict()
+
+
+def test_run_benchmarks_writes_results(tmpdir):
+    output = os.path.join(tmpdir, "results.json")
+    results = run_benchmarks(
+        sizes=[2, 4], repeat=1, spec=DesignSpec(n_bdcs=1), output=output, memory=True
+    )
+    assert load_results(output) == json.loads(json.dumps(results))
+    assert {r["stage"] for r in results["results"]} == set(STAGES)
+    assert {r["size"] for r in results["results"]} == {2, 4}
+    assert all(r["best"] > 0 for r in results["results"])
+    assert len(results["memory"]) == 2 * len(MEMORY_STAGES)
+    assert compare_results(results, results) == []
+
+    slower = json.loads(json.dumps(results))
+    slower["results"][0]["best"] *= 10
+    assert len(compare_results(results, slower)) == 1
@@ -0,0 +1,86 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pynqmetadata import Parameter, current_generation
+from pynqmetadata.benchmarks import generate_design
+
+
+def test_changes_are_seen_from_above():
+    md = generate_design(n_cores=2).parse()
+    core = md.blocks["ip_0"]
+    other = md.blocks["ip_1"]
+    sig = core.ports["s_axi_control"].signals["AWADDR"]
+
+    gen = md.generation
+    assert not md.changed_since(gen)
+    sig.rename("AWADDR_0")
+    assert sig.modified > gen
+    assert sig.changed_since(gen)
+    assert core.changed_since(gen)
+    assert md.changed_since(gen)
+    assert not other.changed_since(gen)
+
+
+def test_generations_are_ordered():
+    md = generate_design(n_cores=2).parse()
+    core = md.blocks["ip_0"]
+
+    first = current_generation(md)
+    core.add(Parameter(name="A", value="1"))
+    second = current_generation(md)
+    assert second > first
+    assert core.changed_since(first)
+    assert not core.changed_since(second)
+
+    # Changes made between two reads share a generation
+    md.blocks["ip_1"].rename("ip_9")
+    core.parameters["A"].rename("B")
+    assert md.modified == core.parameters["B"].modified
+    assert md.changed_since(second)
+
+
+def test_hwh_update_marks_changed_cores():
+    design = generate_design(n_cores=2)
+    md = design.parse()
+    gen = md.generation
+    md.update(
+        design.hwh.replace(
+            '<PARAMETER NAME="C_S_AXI_CONTROL_ADDR_WIDTH" VALUE="16"',
+            '<PARAMETER NAME="C_S_AXI_CONTROL_ADDR_WIDTH" VALUE="17"',
+            1,
+        )
+    )
+    changed = [name for name, b in md.blocks.items() if b.changed_since(gen)]
+    assert changed == ["ip_0"]
+
+
+def test_models_keep_their_own_generations():
+    md = generate_design(n_cores=2).parse()
+    other = generate_design(n_cores=2).parse()
+    sig = other.blocks["ip_0"].ports["s_axi_control"].signals["AWADDR"]
+    ref = sig.ref
+    gen = other.generation
+
+    # Changes to one model neither advance the generation of another nor drop its cached refs
+    md.blocks["ip_0"].rename("ip_9")
+    md.blocks["ip_1"].add(Parameter(name="A", value="1"))
+    assert other.generation == gen
+    assert not other.changed_since(gen)
+    assert sig._ref_valid is other._clock().epoch and sig.ref == ref
+
+
+def test_moved_blocks_are_ordered_in_their_new_model():
+    md = generate_design(n_cores=2).parse()
+    other = generate_design(n_cores=2).parse()
+    for _ in range(5):
+        other.generation
+        other.blocks["ip_1"].add(Parameter(name=f"A{_}", value="1"))
+    block = other.blocks.pop("ip_1")
+    block.rename("ip_7")
+
+    gen = md.generation
+    md.add(block)
+    assert block.changed_since(gen) and md.changed_since(gen)
+    after = md.generation
+    assert not block.changed_since(after)
+    assert block.ports["s_axi_control"].ref == "synth:ip_7[block]:s_axi_control[port]"
@@ -0,0 +1,27 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+from xml.etree import ElementTree
+
+from pynqmetadata.frontends.hwh_index import HwhIndex
+
+TEST_DIR = os.path.dirname(__file__)
+
+
+def test_hwh_index_matches_tree():
+    """Checks the index holds the same elements as a walk of the tree"""
+    root = ElementTree.parse(f"{TEST_DIR}/hwhs/resizer.hwh").getroot()
+    index = HwhIndex(root)
+
+    for module in root.iter("MODULE"):
+        name = module.get("INSTANCE")
+        assert index.modules[name] is module
+        for port in module.iter("PORT"):
+            assert index.ports[name][port.get("NAME")] is port
+        for b_itf in module.iter("BUSINTERFACE"):
+            assert index.busifs[name][b_itf.get("NAME")] is b_itf
+
+    assert len(index.external_ports) == len(list(root.find("EXTERNALPORTS")))
+    assert "M_AXI_GP0" in index.memranges_by_master["processing_system7_0"]
+    assert ("axi_dma_0", "S_AXI_LITE") in index.memranges_by_slave
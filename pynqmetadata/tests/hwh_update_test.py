@@ -0,0 +1,148 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import re
+
+from pynqmetadata.benchmarks import generate_design
+from pynqmetadata.frontends import HwhFrontend
+from pynqmetadata.frontends.hwh_diff import HwhDigest, split_hwh
+
+TEST_DIR = os.path.dirname(__file__)
+
+
+def _hwh_text():
+    with open(f"{TEST_DIR}/hwhs/resizer.hwh", "r") as f:
+        return f.read()
+
+
+def _modules_start(hwh: str) -> int:
+    return hwh.index("<MODULES>")
+
+
+def _check_update(old: str, new: str):
+    """Updating a model of old with new gives the same model as parsing new"""
+    md = HwhFrontend(_hwhfile=old)
+    changes = md.update(new)
+    assert md.dict() == HwhFrontend(_hwhfile=new).dict()
+    return md, changes
+
+
+def test_split_hwh_ignores_timestamp():
+    hwh = _hwh_text()
+    restamped = re.sub(r'TIMESTAMP="[^"]*"', 'TIMESTAMP="0"', hwh, count=1)
+    system, modules = split_hwh(hwh.encode())
+    assert len(modules) > 0
+    assert all(bytes(m).startswith(b"<MODULE ") for m in modules.values())
+    assert HwhDigest(restamped.encode()).system == HwhDigest(hwh.encode()).system
+
+
+def test_update_nothing_changed():
+    hwh = _hwh_text()
+    md, changes = _check_update(hwh, hwh)
+    assert changes.empty()
+
+
+def test_update_parameter_patches_core():
+    hwh = _hwh_text()
+    m = re.compile(r'<PARAMETER NAME="([^"]*)" VALUE="([^"]*)"/>').search(
+        hwh, _modules_start(hwh)
+    )
+    new = hwh[: m.start(2)] + m.group(2) + "_changed" + hwh[m.end(2) :]
+    md, changes = _check_update(hwh, new)
+    assert len(changes.changed) == 1
+    assert changes.rebuilt == []
+    assert md.blocks[changes.changed[0]].parameters[m.group(1)].value.endswith(
+        "_changed"
+    )
+
+
+def test_update_vlnv_rebuilds_core():
+    hwh = _hwh_text()
+    m = re.compile(r'<MODULE [^>]*VLNV="[^"]*:(\d+)\.\d+"').search(hwh)
+    new = hwh[: m.start(1)] + str(int(m.group(1)) + 1) + hwh[m.end(1) :]
+    md, changes = _check_update(hwh, new)
+    assert changes.rebuilt == changes.changed
+    assert len(changes.rebuilt) == 1
+
+
+def test_update_removed_connection():
+    hwh = _hwh_text()
+    m = re.compile(r'<CONNECTION INSTANCE="[^"]*" PORT="[^"]*"/>').search(
+        hwh, _modules_start(hwh)
+    )
+    md, changes = _check_update(hwh, hwh[: m.start()] + hwh[m.end() :])
+    assert len(changes.changed) == 1
+
+
+def test_update_added_and_removed_core():
+    hwh = _hwh_text()
+    for m in re.finditer(
+        r'<MODULE [^>]*INSTANCE="([^"]*)"[^>]*>.*?</MODULE>', hwh, re.S
+    ):
+        if "MEMRANGE" not in m.group(0) and 'IS_PL="FALSE"' not in m.group(0):
+            break
+    name = m.group(1)
+    copy = m.group(0).replace(f'INSTANCE="{name}"', f'INSTANCE="{name}_copy"', 1)
+    added = hwh[: m.end()] + "\n" + copy + hwh[m.end() :]
+
+    md, changes = _check_update(hwh, added)
+    assert changes.added == [f"{name}_copy"]
+    assert not changes.system_changed
+    assert list(md.blocks).index(f"{name}_copy") == list(md.blocks).index(name) + 1
+
+    md, changes = _check_update(added, hwh)
+    assert changes.removed == [f"{name}_copy"]
+
+
+def test_update_streaming():
+    hwh = _hwh_text()
+    m = re.compile(r'<MEMRANGE [^>]*HIGHVALUE="0x([0-9A-Fa-f]+)"').search(hwh)
+    high = format(int(m.group(1), 16) + 0x1000, "X")
+    new = hwh[: m.start(1)] + high + hwh[m.end(1) :]
+    md = HwhFrontend(_hwhfile=hwh, _streaming=True)
+    md.update(new)
+    assert md.dict() == HwhFrontend(_hwhfile=new, _streaming=True).dict()
+
+
+def test_update_external_change_reparses():
+    hwh = _hwh_text()
+    m = re.search(r"<EXTERNALPORTS>\s*<PORT ", hwh)
+    new = hwh[: m.end()] + 'UNUSED="1" ' + hwh[m.end() :]
+    md, changes = _check_update(hwh, new)
+    assert changes.system_changed
+
+
+def test_parse_takes_no_digest(tmpdir):
+    design = generate_design(n_cores=4)
+    path = os.path.join(tmpdir, "design.hwh")
+    with open(path, "w") as f:
+        f.write(design.hwh)
+    md = HwhFrontend(_hwhfile=path)
+    assert md._digest is None
+
+    new = re.sub(
+        r'(<PARAMETER NAME="C_S_AXI_CONTROL_ADDR_WIDTH" VALUE=")16"',
+        r'\g<1>17"',
+        design.hwh,
+        count=1,
+    )
+    changes = md.update(new)
+    assert len(changes.changed) == 1 and not changes.system_changed
+    assert md.dict() == HwhFrontend(_hwhfile=new).dict()
+
+
+def test_update_rewritten_file_reparses(tmpdir):
+    design = generate_design(n_cores=4)
+    path = os.path.join(tmpdir, "design.hwh")
+    with open(path, "w") as f:
+        f.write(design.hwh)
+    md = HwhFrontend(_hwhfile=path)
+
+    # What the file held when it was parsed is gone, so it cannot be diffed
+    new = design.hwh.replace('VALUE="16"', 'VALUE="17"', 1)
+    with open(path, "w") as f:
+        f.write(new + "\n")
+    changes = md.update(path)
+    assert changes.system_changed
+    assert md.dict() == HwhFrontend(_hwhfile=path).dict()
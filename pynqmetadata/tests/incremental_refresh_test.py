@@ -0,0 +1,82 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pynqmetadata import Core, Module, Port, Signal, Vlnv
+from pynqmetadata.benchmarks import generate_design
+
+
+def _state(md: Module):
+    """Everything refresh() builds, in a comparable form"""
+    links = {}
+    for block in md.blocks.values():
+        for port in block.ports.values():
+            for sig in port.signals.values():
+                links[sig.ref] = {r: s.ref for r, s in sig.connections().items()}
+    busses = [
+        (k, b._src_port.ref, b._dst_port.ref) for k, b in md.busses.items()
+    ]
+    return md.json(), links, busses, md._hierarchies.dict()
+
+
+def _refreshed_both_ways(md: Module):
+    full = md.copy()
+    md.refresh(full=False)
+    full.refresh(full=True)
+    return md, full
+
+
+def test_incremental_matches_full():
+    md = generate_design(n_cores=4).parse()
+
+    sig = md.blocks["ip_0"].ports["s_axi_control"].signals["AWADDR"]
+    peer = list(sig.connections().values())[0]
+    sig.disconnect(peer, refresh=False)
+    peer.disconnect(sig, refresh=False)
+
+    core = Core(
+        name="extra",
+        vlnv=Vlnv(vendor="v", library="l", name="n", version=(1, 0)),
+        hierarchy_name="hier_9/extra",
+    )
+    port = Port(name="P")
+    port.add(Signal(name="S", driver=False))
+    core.add(port)
+    md.add(core)
+    port.signals["S"].connect(peer)
+    peer.connect(port.signals["S"])
+
+    md.blocks["ip_1"].ports["interrupt"].rename("irq")
+    md.blocks["ip_2"].rename("ip_renamed")
+
+    md, full = _refreshed_both_ways(md)
+    assert _state(md) == _state(full)
+    assert any(b._src_port is port for b in md.busses.values())
+
+
+def test_refresh_without_changes_keeps_everything():
+    md = generate_design(n_cores=4).parse()
+    busses = dict(md.busses)
+    hierarchies = md._hierarchies
+    md.refresh(full=False)
+    assert all(md.busses[k] is b for k, b in busses.items())
+    assert md._hierarchies is hierarchies
+
+    md.blocks["ip_0"].ports["interrupt"].signals["interrupt"].touch()
+    md, full = _refreshed_both_ways(md)
+    assert _state(md) == _state(full)
+    assert md._hierarchies is hierarchies
+
+
+def test_refresh_sees_assigned_fields():
+    md = generate_design(n_cores=4).parse()
+    md.blocks["ip_1"].hierarchy_name = "newhier/ip_1"
+    md.refresh()
+    assert list(md.hierarchy("newhier")._core_obj.values()) == [md.blocks["ip_1"]]
+
+    # Assignments are not recorded, an incremental refresh needs the block touched
+    md.blocks["ip_2"].hierarchy_name = "otherhier/ip_2"
+    md.refresh(full=False)
+    md.blocks["ip_2"].touch()
+    md, full = _refreshed_both_ways(md)
+    assert _state(md) == _state(full)
+    assert md.hierarchy("otherhier")
@@ -0,0 +1,46 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+
+from pynqmetadata import Core, Module, Port, Signal
+from pynqmetadata.frontends import HwhFrontend, JsonFrontend
+
+TEST_DIR = os.path.dirname(__file__)
+
+
+def _signals(md: Module):
+    for core in md.blocks.values():
+        for port in core.ports.values():
+            yield from port.signals.values()
+
+
+def test_equal_names_share_a_string():
+    md = HwhFrontend(_hwhfile=f"{TEST_DIR}/hwhs/resizer.hwh")
+    by_name = {}
+    for sig in _signals(md):
+        assert by_name.setdefault(sig.name, sig.name) is sig.name
+
+    vendors = [c.vlnv.vendor for c in md.blocks.values() if isinstance(c, Core)]
+    xilinx = [v for v in vendors if v == "xilinx.com"]
+    assert all(v is xilinx[0] for v in xilinx)
+
+
+def test_con_refs_share_the_ref_of_the_signal():
+    md = HwhFrontend(_hwhfile=f"{TEST_DIR}/hwhs/resizer.hwh")
+    md_json = JsonFrontend(md.json())
+    connected = 0
+    for sig in _signals(md_json):
+        for ref in sig.con_refs:
+            assert ref is sig._connections[ref].ref
+            connected += 1
+    assert connected > 0
+
+
+def test_ref_rebuilt_on_rename():
+    port = Port(name="p")
+    port.add(Signal(name="s"))
+    sig = port.signals["s"]
+    assert sig.ref == "p:s[signal]"
+    port.rename("q")
+    assert sig.ref == "q:s[signal]"
@@ -0,0 +1,62 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pynqmetadata import Core, Module, Port, Signal, Vlnv
+from pynqmetadata.benchmarks import generate_design
+
+
+def _core(name: str) -> Core:
+    core = Core(
+        name=name, vlnv=Vlnv(vendor="v", library="l", name="n", version=(1, 0))
+    )
+    port = Port(name="P")
+    port.add(Signal(name="S"))
+    core.add(port)
+    return core
+
+
+def test_ref_computed_when_used():
+    core = _core("c")
+    sig = core.ports["P"].signals["S"]
+    assert sig._ref is None
+    assert sig.ref == "c:P[port]:S[signal]"
+    assert sig._ref is sig.ref
+
+    md = Module(name="top")
+    md.add(core)
+    # Moving the core only invalidates the refs below it
+    assert sig._ref == "c:P[port]:S[signal]"
+    assert sig.ref == "top:c[block]:P[port]:S[signal]"
+    assert md.dict()["blocks"]["c"]["ports"]["P"]["signals"]["S"]["ref"] == sig.ref
+
+
+def test_refresh_keeps_cached_refs():
+    md = generate_design(n_cores=2).parse()
+    refs = {}
+    for block in md.blocks.values():
+        for port in block.ports.values():
+            for sig in port.signals.values():
+                refs[id(sig)] = sig.ref
+    md.refresh()
+    for block in md.blocks.values():
+        for port in block.ports.values():
+            for sig in port.signals.values():
+                assert sig._ref is refs[id(sig)]
+
+
+def test_ref_follows_ancestor_rename_and_move():
+    md = Module(name="top")
+    core = _core("c")
+    md.add(core)
+    sig = core.ports["P"].signals["S"]
+    assert sig.ref == "top:c[block]:P[port]:S[signal]"
+
+    core.rename("d")
+    assert sig.ref == "top:d[block]:P[port]:S[signal]"
+
+    other = _core("e")
+    core.ports["P"].set_parent(other)
+    assert sig.ref == "e:P[port]:S[signal]"
+    md.add(other)
+    assert sig.ref == "top:e[block]:P[port]:S[signal]"
+    assert md.lookup("e[block]:P[port]:S[signal]") is sig
@@ -0,0 +1,81 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+
+from pynqmetadata import Register, SubordinatePort
+from pynqmetadata.benchmarks import generate_design
+from pynqmetadata.frontends import HwhFrontend, JsonFrontend
+from pynqmetadata.models.register import BitFieldDescription, RegisterDescription
+from pynqmetadata.views.runtime import RuntimeMetadataParser
+
+TEST_DIR = os.path.dirname(__file__)
+
+
+def test_registers_built_on_first_access():
+    """Registers are only described after parsing and are built when they are used"""
+    md = HwhFrontend(_hwhfile=f"{TEST_DIR}/hwhs/resizer.hwh")
+    saxi = md.blocks["resize_accel_0"].ports["s_axi_AXILiteS"]
+    assert isinstance(saxi, SubordinatePort)
+    assert len(saxi._register_descriptions) > 0
+    assert saxi.baseaddr != 9999999
+
+    assert len(saxi.registers) > 0
+    assert len(saxi._register_descriptions) == 0
+    for reg in saxi.registers.values():
+        assert reg.parent() is saxi
+        assert reg.ref == f"{saxi.ref}:{reg.name}[register]"
+
+
+def test_lazy_registers_json_roundtrip():
+    """Registers that were never accessed survive an export and import"""
+    md = HwhFrontend(_hwhfile=f"{TEST_DIR}/hwhs/resizer.hwh")
+    md_json = JsonFrontend(input=md.json())
+    saxi = md_json.blocks["resize_accel_0"].ports["s_axi_AXILiteS"]
+    assert len(saxi._register_descriptions) > 0
+    orig = md.blocks["resize_accel_0"].ports["s_axi_AXILiteS"]
+    assert saxi._obj_dict(saxi.registers) == orig._obj_dict(orig.registers)
+
+
+def test_register_lookup_builds_registers():
+    port = SubordinatePort(name="s_axi")
+    port.add_register_descriptions(
+        (
+            RegisterDescription(
+                name="CTRL",
+                description="control",
+                offset=0,
+                width=32,
+                access="read-write",
+                enabled=True,
+                bitfields=(
+                    BitFieldDescription(
+                        name="AP_START",
+                        description="",
+                        LSB=0,
+                        MSB=0,
+                        access="read-write",
+                    ),
+                ),
+            ),
+        )
+    )
+    reg = port.lookup("CTRL[register]")
+    assert isinstance(reg, Register)
+    assert "AP_START" in reg.bitfields
+    assert list(port.registers.keys()) == ["CTRL"]
+
+
+def test_runtime_views_leave_registers_described():
+    """The runtime views read the register descriptions without building them"""
+    md = generate_design(n_cores=4).parse()
+    saxi = md.blocks["ip_1"].ports["s_axi_control"]
+    assert len(saxi._register_descriptions) > 0
+    rt = RuntimeMetadataParser(md)
+    assert len(saxi._register_descriptions) > 0
+
+    registers = rt.ip_dict["hier_0/ip_1"]["registers"]
+    assert list(registers) == list(saxi.registers)
+    for reg in saxi.registers.values():
+        assert registers[reg.name]["address_offset"] == reg.offset
+        assert list(registers[reg.name]["fields"]) == list(reg.bitfields)
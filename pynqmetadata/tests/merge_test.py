@@ -3,8 +3,11 @@
 
 import os
 
+import pytest
+
 from pynqmetadata import (BitField, Core, Module, Parameter, Port, Register,
                           Signal, SubordinatePort, Vlnv)
+from pynqmetadata.benchmarks import generate_design
 from pynqmetadata.errors import MergeConflict
 from pynqmetadata.frontends import HwhFrontend
 
@@ -110,3 +113,33 @@ def test_module_merge_conflict():
         pass
     except:
         raise RuntimeError("Test failed! unexpected error")
+
+
+def test_identical_subtrees_are_skipped():
+    """Only the block that differs is merged, the others are not walked"""
+    md = generate_design(n_cores=4).parse()
+    other = md.copy()
+    other.blocks["ip_2"].add(Parameter(name="EXTRA", value="1"))
+
+    md.merge(md.copy(), skip_identical=True)
+    assert md.blocks["ip_1"].ports["s_axi_control"]._register_descriptions
+
+    md.merge(other, skip_identical=True)
+    assert md == other
+    assert md.blocks["ip_1"].ports["s_axi_control"]._register_descriptions
+    assert md.blocks["ip_2"].parameters["EXTRA"].value == "1"
+
+    conflicting = md.copy()
+    conflicting.blocks["ip_2"].parameters["EXTRA"].value = "2"
+    with pytest.raises(MergeConflict):
+        md.merge(conflicting)
+
+
+def test_merge_sees_assigned_fields():
+    """Fields assigned after the models were hashed still conflict"""
+    a = generate_design(n_cores=4).parse()
+    b = a.copy()
+    assert a.fingerprint == b.fingerprint
+    b.blocks["ip_1"].hierarchy_name = "other"
+    with pytest.raises(MergeConflict):
+        a.merge(b)
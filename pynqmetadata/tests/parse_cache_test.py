@@ -0,0 +1,123 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import shutil
+import stat
+import tempfile
+
+import pytest
+
+from pynqmetadata import IPCore, Module, Port, Signal, Vlnv
+from pynqmetadata.frontends import HwhFrontend, Metadata, ParseCache
+
+TEST_DIR = os.path.dirname(__file__)
+
+
+def _export_module(path: str, name: str) -> None:
+    """Exports a small artificial module to a json file"""
+    md = Module(name=name)
+    core = IPCore(
+        name="core_1",
+        vlnv=Vlnv(vendor="xilinx.com", library="ip", name="core1", version=(1, 0)),
+    )
+    port = Port(name="p1")
+    port.add(Signal(name="s_out", width=1, driver=True))
+    core.add(port)
+    md.add(core)
+    md.export(path=path)
+
+
+def test_cache_hit_hwh():
+    """The model loaded from the cache matches the parsed one"""
+    tmpdir = tempfile.mkdtemp()
+    cache = ParseCache(path=tmpdir)
+    md1 = Metadata(f"{TEST_DIR}/hwhs/resizer.hwh", cache=cache)
+    md2 = Metadata(f"{TEST_DIR}/hwhs/resizer.hwh", cache=cache)
+    assert isinstance(md2, HwhFrontend)
+    assert md2 is not md1
+    assert md1.dict() == md2.dict()
+    shutil.rmtree(tmpdir)
+
+
+def test_cache_hit_json():
+    tmpdir = tempfile.mkdtemp()
+    cache = ParseCache(path=f"{tmpdir}/cache")
+    _export_module(f"{tmpdir}/m.json", "m")
+    md1 = Metadata(f"{tmpdir}/m.json", cache=cache)
+    assert cache.load(f"{tmpdir}/m.json") is not None
+    md2 = Metadata(f"{tmpdir}/m.json", cache=cache)
+    assert md1.dict() == md2.dict()
+
+    # Changing the contents of the file misses the cache
+    _export_module(f"{tmpdir}/m.json", "m2")
+    assert cache.load(f"{tmpdir}/m.json") is None
+    assert Metadata(f"{tmpdir}/m.json", cache=cache).name == "m2"
+    shutil.rmtree(tmpdir)
+
+
+def test_cache_lru_eviction():
+    """Only the most recently used entries are kept within the size bound"""
+    tmpdir = tempfile.mkdtemp()
+    cache = ParseCache(path=f"{tmpdir}/cache")
+    for name in ["a", "b", "c"]:
+        _export_module(f"{tmpdir}/{name}.json", name)
+        Metadata(f"{tmpdir}/{name}.json", cache=cache)
+    entry_size = cache.size() // 3
+
+    # Order the last use so that b is the least recently used
+    for i, name in enumerate(["b", "c", "a"]):
+        entry = os.path.join(cache.path, f"{cache.key(f'{tmpdir}/{name}.json')}.pmdcache")
+        os.utime(entry, (1000 + i, 1000 + i))
+
+    cache.max_size = 2 * entry_size + entry_size // 2
+    cache.evict()
+    assert cache.load(f"{tmpdir}/b.json") is None
+    assert cache.load(f"{tmpdir}/a.json") is not None
+    assert cache.load(f"{tmpdir}/c.json") is not None
+    shutil.rmtree(tmpdir)
+
+
+def test_cache_corrupt_entry():
+    """An unreadable entry is treated as a miss and removed"""
+    tmpdir = tempfile.mkdtemp()
+    cache = ParseCache(path=f"{tmpdir}/cache")
+    _export_module(f"{tmpdir}/m.json", "m")
+    Metadata(f"{tmpdir}/m.json", cache=cache)
+    entry = os.path.join(cache.path, f"{cache.key(f'{tmpdir}/m.json')}.pmdcache")
+    with open(entry, "wb") as f:
+        f.write(b"not a pickle")
+    assert cache.load(f"{tmpdir}/m.json") is None
+    assert not os.path.exists(entry)
+    shutil.rmtree(tmpdir)
+
+
+def test_cache_only_loads_private_entries():
+    """Entries another user could have written are never unpickled"""
+    tmpdir = tempfile.mkdtemp()
+    cache = ParseCache(path=f"{tmpdir}/cache")
+    _export_module(f"{tmpdir}/m.json", "m")
+    Metadata(f"{tmpdir}/m.json", cache=cache)
+    assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o700
+    entry = os.path.join(cache.path, f"{cache.key(f'{tmpdir}/m.json')}.pmdcache")
+    assert cache.load(f"{tmpdir}/m.json") is not None
+
+    os.chmod(entry, 0o666)
+    assert cache.load(f"{tmpdir}/m.json") is None
+    assert os.path.exists(entry)
+    os.chmod(entry, 0o600)
+    if os.getuid() == 0:
+        os.chown(entry, 12345, -1)
+        assert cache.load(f"{tmpdir}/m.json") is None
+    shutil.rmtree(tmpdir)
+
+
+def test_cache_is_not_stored_in_a_shared_directory():
+    tmpdir = tempfile.mkdtemp()
+    os.chmod(tmpdir, 0o777)
+    cache = ParseCache(path=tmpdir)
+    _export_module(f"{tmpdir}/m.json", "m")
+    with pytest.warns(UserWarning, match="private"):
+        cache.store(f"{tmpdir}/m.json", Metadata(f"{tmpdir}/m.json"))
+    assert cache.size() == 0
+    shutil.rmtree(tmpdir)
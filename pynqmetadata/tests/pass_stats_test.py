@@ -0,0 +1,92 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import shutil
+import tempfile
+
+from pynqmetadata import PassStats
+from pynqmetadata.frontends import HwhFrontend, JsonFrontend, Metadata, ParseCache
+from pynqmetadata.views.runtime import RuntimeMetadataParser
+
+TEST_DIR = os.path.dirname(__file__)
+
+PARSE_PASSES = ["populate_cores", "resolve_addressing", "connect_signals"]
+REFRESH_PASSES = [
+    "_update_parents",
+    "_relink_objects",
+    "_populate_connections",
+    "_allocate_hierarchies",
+]
+
+
+def test_stats_disabled_by_default():
+    md = HwhFrontend(_hwhfile=f"{TEST_DIR}/hwhs/resizer.hwh")
+    assert md.stats is None
+    RuntimeMetadataParser(md)
+    assert md.stats is None
+
+
+def test_parse_passes_recorded():
+    hwhfile = f"{TEST_DIR}/hwhs/resizer.hwh"
+    md = HwhFrontend(_hwhfile=hwhfile, _stats=PassStats())
+    passes = md.stats.passes
+    for name in ["parse", "refresh"] + PARSE_PASSES + REFRESH_PASSES:
+        assert passes[name].calls == 1
+        assert passes[name].seconds > 0
+    assert passes["populate_cores"].objects == len(md.blocks)
+    assert passes["_populate_connections"].objects == len(md.busses)
+    assert passes["parse"].seconds >= passes["populate_cores"].seconds
+    assert md.dict() == HwhFrontend(_hwhfile=hwhfile).dict()
+
+
+def test_streaming_parse_passes_recorded():
+    md = HwhFrontend(
+        _hwhfile=f"{TEST_DIR}/hwhs/resizer.hwh", _streaming=True, _stats=PassStats()
+    )
+    for name in ["stream_parse", "iterparse", "refresh"] + REFRESH_PASSES:
+        assert md.stats.passes[name].calls == 1
+
+
+def test_refresh_and_views_recorded():
+    md = HwhFrontend(_hwhfile=f"{TEST_DIR}/hwhs/resizer.hwh")
+    stats = md.enable_stats()
+    md.refresh(full=True)
+    md.refresh(full=True)
+    assert stats.passes["refresh"].calls == 2
+    assert stats.passes["_relink_objects"].calls == 2
+    assert "parse" not in stats.passes
+    md.refresh(full=False)
+    assert stats.passes["_refresh_changed"].calls == 1
+    assert stats.passes["_relink_objects"].calls == 2
+
+    RuntimeMetadataParser(md)
+    for view in ["interrupt_controllers", "ip_dict", "mem_dict", "hierarchy_dict"]:
+        assert stats.passes[f"{view}_view"].calls == 1
+    assert "ip_dict_view" in stats.report()
+
+    md.disable_stats()
+    md.refresh()
+    assert stats.passes["refresh"].calls == 3
+
+
+def test_json_frontend_stats():
+    js = HwhFrontend(_hwhfile=f"{TEST_DIR}/hwhs/resizer.hwh").json()
+    md = JsonFrontend(js, stats=PassStats())
+    assert md.stats.passes["populate_cores"].calls == 1
+    assert md.stats.passes["refresh"].calls == 1
+
+
+def test_metadata_stats_with_cache():
+    tmpdir = tempfile.mkdtemp()
+    cache = ParseCache(path=tmpdir)
+    hwhfile = f"{TEST_DIR}/hwhs/resizer.hwh"
+    md1 = Metadata(hwhfile, cache=cache, stats=True)
+    assert md1.stats.passes["parse"].calls == 1
+
+    # The stats of the parse are not stored with the cached model
+    md2 = Metadata(hwhfile, cache=cache)
+    assert md2.stats is None
+    md3 = Metadata(hwhfile, cache=cache, stats=True)
+    assert list(md3.stats.passes) == ["cache_load"]
+    shutil.rmtree(tmpdir)
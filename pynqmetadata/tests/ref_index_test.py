@@ -0,0 +1,89 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pytest
+
+from pynqmetadata import Core, Module, Port, Signal, Vlnv
+from pynqmetadata.benchmarks import generate_design
+from pynqmetadata.errors import MetadataObjectNotFound
+
+
+def _objects(obj):
+    for child in obj.children().values():
+        yield child
+        yield from _objects(child)
+
+
+def _design() -> Module:
+    md = Module(name="top")
+    for cname in ("a", "b"):
+        core = Core(
+            name=cname, vlnv=Vlnv(vendor="v", library="l", name="n", version=(1, 0))
+        )
+        port = Port(name="P")
+        port.add(Signal(name="CLK", driver=cname == "a"))
+        core.add(port)
+        md.add(core)
+    src = md.lookup("a[block]:P[port]:CLK[signal]")
+    dst = md.lookup("b[block]:P[port]:CLK[signal]")
+    src.connect(dst)
+    dst.connect(src)
+    md.refresh()
+    return md
+
+
+def test_index_finds_every_object():
+    md = generate_design(n_cores=4).parse()
+    objects = list(_objects(md))
+    for obj in objects:
+        assert md.lookup(obj.ref) is obj
+    assert len(md._get_ref_index()) >= len(objects)
+
+    core = md.blocks["ip_0"]
+    port = md.lookup("ip_0[block]:S_AXI_CONTROL[port]")
+    assert port is core.ports["s_axi_control"]
+    assert core.lookup("s_axi_control[port]:awaddr[signal]") is port.signals["AWADDR"]
+
+
+def test_index_follows_add_and_remove():
+    md = _design()
+    md.lookup("a[block]")
+    core = Core(
+        name="c", vlnv=Vlnv(vendor="v", library="l", name="n", version=(1, 0))
+    )
+    core.add(Port(name="Q"))
+    md.add(core)
+    assert "top:c[block]:Q[port]" in md._get_ref_index()
+    assert md.lookup("c[block]:Q[port]") is core.ports["Q"]
+
+    md.blocks["b"].remove()
+    assert "top:b[block]:P[port]" not in md._get_ref_index()
+    assert md.lookup("a[block]:P[port]:CLK[signal]").con_refs == []
+
+
+def test_index_follows_rename_and_reparent():
+    md = _design()
+    src = md.lookup("a[block]:P[port]:CLK[signal]")
+    port = md.blocks["b"].ports["P"]
+
+    port.rename("R")
+    assert list(md.blocks["b"].ports) == ["R"]
+    assert md.lookup("b[block]:R[port]:CLK[signal]") is port.signals["CLK"]
+    with pytest.raises(MetadataObjectNotFound):
+        md.lookup("b[block]:P[port]")
+    assert src.con_refs == ["top:b[block]:R[port]:CLK[signal]"]
+    md.refresh()
+    assert src.connections()["top:b[block]:R[port]:CLK[signal]"] is port.signals["CLK"]
+
+    other = Module(name="other")
+    core = Core(
+        name="d", vlnv=Vlnv(vendor="v", library="l", name="n", version=(1, 0))
+    )
+    other.add(core)
+    assert len(other._get_ref_index(build=True)) == 1
+    port.set_parent(core)
+    assert other.lookup("d[block]:R[port]:CLK[signal]") is port.signals["CLK"]
+    assert "top:b[block]:R[port]" not in md._get_ref_index()
+
+    md.rename("renamed")
+    assert md.lookup("renamed:a[block]:P[port]") is src.parent()
@@ -0,0 +1,46 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pynqmetadata.benchmarks import generate_design
+from pynqmetadata.models import signal_store
+
+
+def test_store_matches_the_signals():
+    md = generate_design(n_cores=4).parse()
+    store = md.signal_store()
+    assert md.signal_store() is store
+    fan_out = store.fan_out()
+    for i, sig in enumerate(store.signals):
+        assert store.id_of(sig) == i
+        assert store.ports[store.port[i]] is sig.parent()
+        assert store.width[i] == sig.width and bool(store.driver[i]) == sig.driver
+        assert all(a is b for a, b in zip(store.peers(sig), sig._connections.values()))
+        assert fan_out[i] == len(sig._connections)
+    assert sum(store.fan_in()) == len(store.indices)
+
+    assert md.copy()._signal_store is None
+
+
+def test_store_is_rebuilt_after_changes(monkeypatch):
+    md = generate_design(n_cores=4).parse()
+    store = md.signal_store()
+    sig = md.blocks["ip_2"].ports["s_axi_control"].signals["AWADDR"]
+    peer = store.peers(sig)[0]
+    mismatched = store.width_mismatches()
+
+    sig.width += 1
+    sig.driver = peer.driver
+    sig.touch()
+    rebuilt = md.signal_store()
+    assert rebuilt is not store
+    assert len(rebuilt.width_mismatches()) == len(mismatched) + 1
+    assert (peer, sig) in rebuilt.polarity_errors() or (
+        sig,
+        peer,
+    ) in rebuilt.polarity_errors()
+
+    # The analyses give the same answers with and without numpy
+    found = (rebuilt.width_mismatches(), rebuilt.polarity_errors())
+    monkeypatch.setattr(signal_store, "numpy", None)
+    assert (rebuilt.width_mismatches(), rebuilt.polarity_errors()) == found
+    assert list(rebuilt.fan_in()) == list(md.signal_store().fan_in())
@@ -0,0 +1,39 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+
+from pynqmetadata.frontends import HwhFrontend
+
+TEST_DIR = os.path.dirname(__file__)
+
+
+def _check_streaming_equivalent(hwhfile: str) -> None:
+    """Parses the hwh with and without streaming and checks the models match"""
+    md = HwhFrontend(_hwhfile=hwhfile)
+    md_streamed = HwhFrontend(_hwhfile=hwhfile, _streaming=True)
+
+    if md.dict() != md_streamed.dict():
+        from deepdiff import DeepDiff
+
+        diff = DeepDiff(md.dict(), md_streamed.dict(), ignore_order=True)
+        print(diff)
+        raise RuntimeError(
+            f"Streaming parse of {hwhfile} does not produce an equivalent metadata object"
+        )
+
+
+def test_streaming_parse_resizer():
+    _check_streaming_equivalent(f"{TEST_DIR}/hwhs/resizer.hwh")
+
+
+def test_streaming_parse_rfsoc_sam():
+    _check_streaming_equivalent(f"{TEST_DIR}/hwhs/rfsoc_sam.hwh")
+
+
+def test_streaming_parse_xml_string():
+    """Streaming also accepts the HWH contents as a string"""
+    with open(f"{TEST_DIR}/hwhs/resizer.hwh", "r") as f:
+        hwh_str = f.read()
+    md = HwhFrontend(_hwhfile=hwh_str, _streaming=True)
+    assert "axi_dma_0" in md.blocks
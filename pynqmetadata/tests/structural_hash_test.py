@@ -0,0 +1,106 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pynqmetadata import Module, Parameter, Register, Signal
+from pynqmetadata.benchmarks import generate_design
+
+
+def test_equal_designs_share_a_fingerprint():
+    md = generate_design(n_cores=4).parse()
+    copied = md.copy()
+    assert copied == md and copied.fingerprint == md.fingerprint
+    assert md.copy(copy_on_write=True) == md
+
+    # Containers are compared regardless of their order
+    blocks = md.blocks
+    md.blocks = dict(reversed(list(blocks.items())))
+    assert copied == md
+
+    # Parented objects compare without walking up through their parents
+    assert copied.blocks["ip_1"] == md.blocks["ip_1"]
+    assert copied.blocks["ip_1"] != md.blocks["ip_2"]
+
+
+def test_changes_invalidate_the_hash():
+    md = generate_design(n_cores=4).parse()
+    copied = md.copy()
+    before = md.fingerprint
+    assert md.__dict__["_structure_hash"][1] == md.structural_hash
+
+    md.blocks["ip_2"].add(Parameter(name="EXTRA", value="1"))
+    assert md.fingerprint != before and md != copied
+    # Only the path down to the change is hashed again
+    cached = md.blocks["ip_1"].__dict__["_structure_hash"][0]
+    assert cached < md.blocks["ip_2"].modified
+    assert md.blocks["ip_1"].__dict__["_structure_hash"][0] == cached
+    assert md.blocks["ip_1"] == copied.blocks["ip_1"]
+
+    copied.blocks["ip_2"].add(Parameter(name="EXTRA", value="1"))
+    assert md == copied
+
+
+def test_equality_sees_assigned_fields():
+    md = generate_design(n_cores=4).parse()
+    copied = md.copy()
+    assert md == copied and md.fingerprint == copied.fingerprint
+
+    # Assigning to a field touches the object, so the cached hashes are redone
+    before = copied.fingerprint
+    copied.blocks["ip_1"].hierarchy_name = "other"
+    assert copied.fingerprint != before
+    assert md != copied and md.blocks["ip_1"] != copied.blocks["ip_1"]
+    signal = copied.blocks["ip_1"].ports["s_axi_control"].signals["AWADDR"]
+    copied.blocks["ip_1"].hierarchy_name = md.blocks["ip_1"].hierarchy_name
+    generation = copied.generation
+    signal.width = signal.width + 1
+    assert copied.changed_since(generation) and signal.modified > generation
+    assert md != copied
+    signal.width = signal.width - 1
+    assert md == copied and copied.fingerprint == before
+
+
+def test_equality_is_decided_by_the_hashes(monkeypatch):
+    md = generate_design(n_cores=4).parse()
+    copied = md.copy()
+    copied.blocks["ip_1"].hierarchy_name = "other"
+    md.structural_hash, copied.structural_hash
+
+    # Objects whose hashes are cached compare without walking their fields
+    monkeypatch.setattr(Module, "_hashed_value", None)
+    assert md != copied and md == md.copy()
+    assert md.blocks["ip_2"] == copied.blocks["ip_2"]
+
+
+def test_construction_is_not_a_modification():
+    md = generate_design(n_cores=2).parse()
+    generation = md.generation
+    signal = Signal(name="EXTRA", width=4)
+    assert type(signal) is Signal and signal.modified == 0
+    assert md.generation == generation
+    before = signal.fingerprint
+    signal.width = 8
+    assert signal.fingerprint != before and md.generation == generation
+
+
+def test_described_registers_are_hashed_without_being_built():
+    md = generate_design(n_cores=2).parse()
+    copied = md.copy()
+    port = md.blocks["ip_0"].ports["s_axi_control"]
+    assert len(copied.blocks["ip_0"].ports["s_axi_control"].registers) > 0
+    assert md.blocks["ip_0"] == copied.blocks["ip_0"]
+    assert port._register_descriptions and not port.__dict__["registers"]
+
+
+def test_described_registers_hash_like_built_ones(monkeypatch):
+    md = generate_design(n_cores=2).parse()
+    port = md.blocks["ip_0"].ports["s_axi_control"]
+    for d in port._register_descriptions:
+        assert Register.description_hash(d) == Register.from_description(d).structural_hash
+
+    # Hashing the port does not create any registers
+    copied = md.copy()
+    built = copied.blocks["ip_0"].ports["s_axi_control"]
+    assert len(built.registers) > 0
+    monkeypatch.setattr(Register, "from_description", None)
+    assert port.structural_hash == built.structural_hash
+    assert port._register_descriptions and not port.__dict__["registers"]
@@ -0,0 +1,91 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import functools
+import json
+import os
+import re
+
+import pytest
+from deepdiff import DeepDiff
+
+from pynqmetadata.frontends import HwhFrontend
+from pynqmetadata.frontends.hwh_frontend import parse_throughput
+from pynqmetadata.frontends.xml_backend import available_backends
+from pynqmetadata.views.runtime import RuntimeMetadataParser
+
+TEST_DIR = os.path.dirname(__file__)
+
+# The differences from the golden dicts that are not checked, as in test_dicts
+_UNCHECKED = re.compile(r"\['(description|addr_range|size)'\]$")
+
+
+@functools.lru_cache(maxsize=None)
+def _runtime(backend: str) -> RuntimeMetadataParser:
+    if backend == "lxml":
+        pytest.importorskip("lxml")
+    md = HwhFrontend(_hwhfile=f"{TEST_DIR}/hwhs/resizer.hwh", _xml_backend=backend)
+    return RuntimeMetadataParser(md)
+
+
+@pytest.mark.parametrize("backend", ["etree", "lxml"])
+@pytest.mark.parametrize(
+    "view",
+    [
+        "ip_dict",
+        "gpio_dict",
+        "clock_dict",
+        "hierarchy_dict",
+        "interrupt_controllers",
+        "interrupt_pins",
+    ],
+)
+def test_backend_matches_golden_dicts(backend, view):
+    """Each backend on its own builds the runtime dicts in golden_dicts"""
+    with open(f"{TEST_DIR}/golden_dicts/resizer/{view}_golden.json", "r") as f:
+        golden = json.load(f)
+    dut = json.loads(
+        json.dumps(
+            getattr(_runtime(backend), view), default=lambda o: "<not serializable>"
+        )
+    )
+    diff = DeepDiff(golden, dut, ignore_order=True)
+    assert "dictionary_item_removed" not in diff
+    changed = [
+        path
+        for path in diff.get("values_changed", {})
+        if not _UNCHECKED.search(path)
+    ]
+    assert changed == []
+
+
+def test_backends_build_identical_models():
+    """Every available XML backend builds the same model and runtime views"""
+    hwhfile = f"{TEST_DIR}/hwhs/resizer.hwh"
+    md = HwhFrontend(_hwhfile=hwhfile, _xml_backend="etree")
+    md_dict = md.dict()
+    rt = RuntimeMetadataParser(md)
+    for backend in available_backends():
+        for streaming in [False, True]:
+            md_b = HwhFrontend(
+                _hwhfile=hwhfile, _xml_backend=backend, _streaming=streaming
+            )
+            assert md_b._xml_backend == backend
+            assert md_b.dict() == md_dict
+            rt_b = RuntimeMetadataParser(md_b)
+            assert rt_b.ip_dict.keys() == rt.ip_dict.keys()
+            assert rt_b.interrupt_pins == rt.interrupt_pins
+
+
+def test_backends_parse_xml_string():
+    with open(f"{TEST_DIR}/hwhs/resizer.hwh", "r") as f:
+        hwh_str = f.read()
+    for backend in available_backends():
+        md = HwhFrontend(_hwhfile=hwh_str, _xml_backend=backend)
+        assert "axi_dma_0" in md.blocks
+
+
+def test_parse_throughput_reported_per_backend():
+    throughput = parse_throughput(f"{TEST_DIR}/hwhs/resizer.hwh", repeat=1)
+    assert set(throughput.keys()) == set(available_backends())
+    assert all(t > 0 for t in throughput.values())
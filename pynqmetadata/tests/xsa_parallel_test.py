@@ -0,0 +1,35 @@
+# Copyright (C) 2022 Xilinx, Inc
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from pynqmetadata.frontends import HwhFrontend, JsonFrontend
+from pynqmetadata.frontends.xsa_frontend import (
+    _parse_bdc,
+    _parse_mergeable_pickled,
+    _unpickle_mergeable,
+)
+
+TEST_DIR = os.path.dirname(__file__)
+
+
+def test_pool_parsed_bdc_matches_serial():
+    """A BDC HWH parsed in a worker process gives the same JSON as a serial parse"""
+    hwhfile = f"{TEST_DIR}/hwhs/resizer.hwh"
+    md = HwhFrontend(_hwhfile=hwhfile)
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        name, md_json = pool.submit(_parse_bdc, hwhfile).result()
+    assert name == md.name
+    assert JsonFrontend(md_json).dict() == JsonFrontend(md.json()).dict()
+
+
+def test_pool_parsed_mergeable_matches_serial():
+    """A mergeable HWH parsed in a worker process comes back as an equivalent model"""
+    hwhfile = f"{TEST_DIR}/hwhs/resizer.hwh"
+    md = HwhFrontend(_hwhfile=hwhfile)
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        data = pool.submit(_parse_mergeable_pickled, hwhfile).result()
+    md_pool = _unpickle_mergeable(data)
+    assert md_pool.dict() == md.dict()
+    assert md_pool.lookup("resize_accel_0[block]").parent() is md_pool
@@ -140,7 +140,7 @@ class IpDictView(MetadataView):
                             ].device
 
                         if not isinstance(dst_port.parent(), ProcSysCore):
-                            for reg in dst_port.registers.values():
+                            for reg in dst_port.described_registers():
                                 repr_dict[dcore.hierarchy_name]["registers"][
                                     reg.name
                                 ] = {}
@@ -159,7 +159,7 @@ class IpDictView(MetadataView):
                                 repr_dict[dcore.hierarchy_name]["registers"][reg.name][
                                     "fields"
                                 ] = {}
-                                for f in reg.bitfields.values():
+                                for f in reg.bitfields:
                                     repr_dict[dcore.hierarchy_name]["registers"][
                                         reg.name
                                     ]["fields"][f.name] = {}
@@ -73,7 +73,7 @@ class MemDictView(MetadataView):
                                     param.name
                                 ] = param.value
                             repr_dict[dst_core.hierarchy_name]["registers"] = {}
-                            for reg in subord_port.registers.values():
+                            for reg in subord_port.described_registers():
                                 repr_dict[dst_core.hierarchy_name]["registers"][
                                     reg.name
                                 ] = {}
@@ -92,7 +92,7 @@ class MemDictView(MetadataView):
                                 repr_dict[dst_core.hierarchy_name]["registers"][
                                     reg.name
                                 ]["fields"] = {}
-                                for field in reg.bitfields.values():
+                                for field in reg.bitfields:
                                     repr_dict[dst_core.hierarchy_name]["registers"][
                                         reg.name
                                     ]["fields"][field.name] = {}
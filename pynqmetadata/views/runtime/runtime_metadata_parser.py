@@ -53,23 +53,34 @@ class RuntimeMetadataParser:
         self.ps_name = self.ps.hierarchy_name
         self.family_ps = self.ps.ps_name
 
-        self.interrupt_controllers_view = InterruptControllersView(self.md)
-        self.interrupt_controllers = copy.deepcopy(self.interrupt_controllers_view.view)
-
-        self.interrupt_pins_view = InterruptPinsView(self.md, self.interrupt_controllers)
-        self.interrupt_pins = copy.deepcopy(self.interrupt_pins_view.view)
-
-        self.ip_dict_view = IpDictView(self.md)
-        self.ip_dict = copy.deepcopy(self.ip_dict_view.view)
-
-        self.gpio_dict_view = GpioDictView(self.md)
-        self.gpio_dict = copy.deepcopy(self.gpio_dict_view.view)
-
-        self.clock_dict_view = ClockDictView(self.md)
-        self.clock_dict = copy.deepcopy(self.clock_dict_view.clock_dict)
-
-        self.mem_dict_view = MemDictView(self.md)
-        self.mem_dict = copy.deepcopy(self.mem_dict_view.view)
+        # Each view is recorded in the stats of the model when they are enabled
+        with self.md._measure("interrupt_controllers_view"):
+            self.interrupt_controllers_view = InterruptControllersView(self.md)
+            self.interrupt_controllers = copy.deepcopy(
+                self.interrupt_controllers_view.view
+            )
+
+        with self.md._measure("interrupt_pins_view"):
+            self.interrupt_pins_view = InterruptPinsView(
+                self.md, self.interrupt_controllers
+            )
+            self.interrupt_pins = copy.deepcopy(self.interrupt_pins_view.view)
+
+        with self.md._measure("ip_dict_view"):
+            self.ip_dict_view = IpDictView(self.md)
+            self.ip_dict = copy.deepcopy(self.ip_dict_view.view)
+
+        with self.md._measure("gpio_dict_view"):
+            self.gpio_dict_view = GpioDictView(self.md)
+            self.gpio_dict = copy.deepcopy(self.gpio_dict_view.view)
+
+        with self.md._measure("clock_dict_view"):
+            self.clock_dict_view = ClockDictView(self.md)
+            self.clock_dict = copy.deepcopy(self.clock_dict_view.clock_dict)
+
+        with self.md._measure("mem_dict_view"):
+            self.mem_dict_view = MemDictView(self.md)
+            self.mem_dict = copy.deepcopy(self.mem_dict_view.view)
 
         self.hierarchy_dict_view = HierarchyDictView(
             module=self.md,
@@ -88,7 +99,8 @@ class RuntimeMetadataParser:
                 del self.ip_dict[item]
 
     def refresh_hierarchy_dict(self) -> None:
-        self.hierarchy_dict = copy.deepcopy(self.hierarchy_dict_view.view)
+        with self.md._measure("hierarchy_dict_view"):
+            self.hierarchy_dict = copy.deepcopy(self.hierarchy_dict_view.view)
         self.assign_gpio_to_ip()
         self.assign_interrupts_to_ip()
 
@@ -73,6 +73,11 @@ required = [
         "ipython",
 ]
 
+# Optional packages, lxml parses HWHs faster than xml.etree
+extras = {
+        "lxml": ["lxml"],
+}
+
 
 setup(  name='pynqmetadata',
         version=ver_str,
@@ -84,6 +89,7 @@ setup(  name='pynqmetadata',
         author_email='pynq_support@xilinx.com',
         packages=find_packages(),
         install_requires=required,
+        extras_require=extras,
         python_requires='>=3.8',
         package_data = {
             'pynqmetadata': pynq_metadata_files,